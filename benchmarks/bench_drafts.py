@@ -0,0 +1,138 @@
+"""
+Load-test draft generation against a local stand-in LLM server.
+
+Drives N concurrent draft generations, for each concurrency level given, through
+the shared LLM client and reports throughput plus time-to-first-text and total
+latency percentiles. The draft cache is bypassed so every draft is generated.
+
+    python -m benchmarks.bench_drafts --drafts 32 --concurrency 1 4 16 --tokens-per-second 80
+    python -m benchmarks.bench_drafts --mode sections --llm-concurrency 16
+    python -m benchmarks.bench_drafts --base-url http://127.0.0.1:8001/v1 --backend openai   # external server
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.bench_publication_search import summarize
+from benchmarks.llm_standin import LLMStandin
+from modules.draft_generator import _stream_sections, _stream_single_pass
+
+TOPICS = (
+    "Machine learning for early detection of diabetic retinopathy",
+    "Effects of microplastics on freshwater invertebrates",
+    "Graph neural networks for molecular property prediction",
+    "Remote work and employee productivity after 2020",
+    "CRISPR off-target effects in human cell lines",
+    "Urban heat islands and public health outcomes"
+)
+
+
+def one_draft(generate: Callable, topic: str, max_tokens: int) -> Dict:
+    """Generate one draft, timing the first piece of text and the whole draft"""
+    started = time.perf_counter()
+    first_text, characters, complete, error = None, 0, False, None
+    pieces = generate(topic, max_tokens)
+    try:
+        while True:
+            piece = next(pieces)
+            if piece and first_text is None:
+                first_text = time.perf_counter() - started
+            characters += len(piece)
+    except StopIteration as finished:
+        complete = bool(finished.value)
+    except Exception as e:
+        error = str(e)
+    return {"ttft": first_text, "total": time.perf_counter() - started, "characters": characters,
+            "complete": complete, "error": error}
+
+
+def bench_level(generate: Callable, drafts: int, concurrency: int, max_tokens: int,
+                server: LLMStandin = None) -> Dict:
+    """Run `drafts` generations with `concurrency` at a time and summarize them"""
+    tokens_before = server.tokens_sent if server else 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = list(pool.map(lambda index: one_draft(generate, TOPICS[index % len(TOPICS)], max_tokens),
+                             range(drafts)))
+    elapsed = time.perf_counter() - started
+
+    completed = [run for run in runs if run["complete"]]
+    report = {
+        "concurrency": concurrency,
+        "drafts_per_s": len(completed) / elapsed,
+        "failed": len(runs) - len(completed),
+        "errors": sorted({run["error"] for run in runs if run["error"]})[:3],
+        "ttft": summarize([run["ttft"] for run in completed]) if completed else {},
+        "total": summarize([run["total"] for run in completed]) if completed else {}
+    }
+    if server:
+        report["tokens_per_s"] = (server.tokens_sent - tokens_before) / elapsed
+    return report
+
+
+def print_report(reports: List[Dict]):
+    """Print one fixed-width row per concurrency level"""
+    columns = ("concurrency", "drafts/s", "tokens/s", "failed", "ttft_p50_ms", "ttft_p95_ms",
+               "total_p50_ms", "total_p95_ms", "total_p99_ms")
+    print("".join(f"{column:>14}" for column in columns))
+    for report in reports:
+        ttft, total = report["ttft"], report["total"]
+        row = (report["concurrency"], report["drafts_per_s"], report.get("tokens_per_s", float("nan")),
+               report["failed"], ttft.get("p50_ms", float("nan")), ttft.get("p95_ms", float("nan")),
+               total.get("p50_ms", float("nan")), total.get("p95_ms", float("nan")),
+               total.get("p99_ms", float("nan")))
+        print("".join(f"{value:>14}" if isinstance(value, int) else f"{value:>14.1f}" for value in row))
+        for error in report["errors"]:
+            print(f"    error: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test draft generation against a stand-in LLM server")
+    parser.add_argument("--mode", choices=("single", "sections"), default="single",
+                        help="Single streamed completion, or outline plus parallel sections")
+    parser.add_argument("--drafts", type=int, default=24, help="Drafts per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrent draft generations (one level per value)")
+    parser.add_argument("--max-tokens", type=int, default=400, help="Draft token budget")
+    parser.add_argument("--llm-concurrency", type=int, default=8,
+                        help="Shared client's cap on in-flight LLM requests (LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Stand-in token rate per completion")
+    parser.add_argument("--first-token-latency", type=float, default=0.3, help="Stand-in first-token latency")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Stand-in first-token latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stand-in requests answered 429")
+    parser.add_argument("--backend", choices=("groq", "openai"), default="groq", help="SDK the client talks through")
+    parser.add_argument("--base-url", help="Use an already running server instead of an in-process stand-in")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.base_url is None:
+        server = LLMStandin(args.tokens_per_second, args.first_token_latency, args.jitter,
+                            error_rate=args.error_rate).start()
+    # Configure the shared client before its first use; the Groq SDK adds /openai/v1 itself
+    os.environ.update({
+        "LLM_BACKEND": args.backend,
+        "LLM_BASE_URL": args.base_url or (server.url("/v1") if args.backend == "openai" else server.url()),
+        "LLM_API_KEY": os.getenv("LLM_API_KEY", "standin") if args.base_url else "standin",
+        "LLM_MAX_CONCURRENCY": str(args.llm_concurrency)
+    })
+    generate = _stream_sections if args.mode == "sections" else _stream_single_pass
+
+    try:
+        reports = [bench_level(generate, args.drafts, concurrency, args.max_tokens, server)
+                   for concurrency in args.concurrency]
+    finally:
+        if server:
+            server.stop()
+
+    if args.json:
+        print(json.dumps({"config": vars(args), "levels": reports}, indent=2))
+    else:
+        print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
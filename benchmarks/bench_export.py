@@ -0,0 +1,147 @@
+"""
+Benchmark draft export time and memory against document length.
+
+Builds synthetic drafts of increasing length, with sections, paragraphs and
+bullets like generated drafts, and renders each with the export builders,
+bypassing the export cache:
+
+    python -m benchmarks.bench_export                              # 1, 10, 50 and 200 pages
+    python -m benchmarks.bench_export --pages 200 500 --formats PDF --iterations 3
+
+With --bulk, many drafts are exported into one ZIP archive through export_zip
+at each worker count instead, to show how bulk export scales with cores:
+
+    python -m benchmarks.bench_export --bulk 48 --pages 10 --workers 1 2 4 8
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+from modules.export_handler import BUILDERS, export_zip, pdf_fonts
+from benchmarks.bench_publication_search import measure
+
+WORDS = ("model", "results", "suggest", "analysis", "data", "method", "research", "approach", "significant",
+         "framework", "evidence", "study", "performance", "proposed", "findings", "baseline", "students",
+         "learning", "effect", "variance", "sample", "cohort", "measurement", "protocol", "outcomes")
+
+# Roughly one letter-size PDF page of body text at the export font size
+WORDS_PER_PAGE = 360
+
+
+def make_draft(pages: int, seed: int = 0) -> str:
+    """A synthetic markdown draft of about `pages` PDF pages"""
+    rng = random.Random(seed)
+    lines = ["# A Synthetic Study of Export Performance", ""]
+    words, section = 0, 0
+    while words < pages * WORDS_PER_PAGE:
+        section += 1
+        lines += [f"## {section}. Section {section}", ""]
+        for _ in range(4):
+            count = rng.randint(60, 140)
+            lines += [" ".join(rng.choice(WORDS) for _ in range(count)).capitalize() + ".", ""]
+            words += count
+        for _ in range(3):
+            lines.append("- " + " ".join(rng.choice(WORDS) for _ in range(12)))
+            words += 12
+        lines.append("")
+    return "\n".join(lines)
+
+
+def count_pdf_pages(data: bytes) -> int:
+    return len(re.findall(rb"/Type /Page[^s]", data))
+
+
+def bench_exports(pages: List[int], formats: List[str], iterations: int) -> List[Dict]:
+    """Time and measure every format at every document length"""
+    pdf_fonts()  # register fonts up front, as a running app would have already
+    rows = []
+    for page_count in pages:
+        draft = make_draft(page_count)
+        for format_choice in formats:
+            build = BUILDERS[format_choice]
+            data = build(draft)
+            summary = measure(lambda: build(draft), iterations)
+            summary.update({
+                "pages": page_count,
+                "format": format_choice,
+                "draft_kib": len(draft.encode("utf-8")) / 1024,
+                "output_kib": len(data) / 1024
+            })
+            if format_choice == "PDF":
+                summary["pdf_pages"] = count_pdf_pages(data)
+            rows.append(summary)
+    return rows
+
+
+def bench_bulk(drafts: int, pages: int, formats: List[str], worker_counts: List[int]) -> List[Dict]:
+    """Export `drafts` drafts of `pages` pages into an in-memory ZIP at each worker count"""
+    batch = [(f"Synthetic draft {index}", make_draft(pages, seed=index)) for index in range(drafts)]
+    rows = []
+    for workers in worker_counts:
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            export_zip(batch[:workers], io.BytesIO(), formats, pool=pool)  # start the workers
+            archive = io.BytesIO()
+            # Only this process is traced: the window of results waiting to be written plus the archive
+            tracemalloc.start()
+            started = time.perf_counter()
+            documents = export_zip(batch, archive, formats, pool=pool, max_in_flight=2 * workers)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        rows.append({"workers": workers, "documents": documents, "seconds": elapsed,
+                     "documents_per_s": documents / elapsed, "archive_kib": len(archive.getvalue()) / 1024,
+                     "alloc_peak_kib": peak / 1024})
+    return rows
+
+
+def print_bulk_report(rows: List[Dict]):
+    columns = ("documents", "seconds", "documents_per_s", "speedup", "archive_kib", "alloc_peak_kib")
+    print(f"{'workers':>8}" + "".join(f"{column:>16}" for column in columns))
+    for row in rows:
+        row["speedup"] = rows[0]["seconds"] / row["seconds"]
+        print(f"{row['workers']:>8}" + "".join(f"{row[column]:>16.2f}" for column in columns))
+
+
+def print_report(rows: List[Dict]):
+    columns = ("draft_kib", "output_kib", "mean_ms", "p95_ms", "ms_per_page", "alloc_peak_kib")
+    print(f"{'pages':>6}{'format':>8}{'pdf_pages':>10}" + "".join(f"{column:>16}" for column in columns))
+    for row in rows:
+        row["ms_per_page"] = row["mean_ms"] / row["pages"]
+        print(f"{row['pages']:>6}{row['format']:>8}{row.get('pdf_pages', ''):>10}"
+              + "".join(f"{row[column]:>16.2f}" for column in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark draft export against document length")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 50, 200], help="Draft lengths in pages")
+    parser.add_argument("--formats", nargs="+", choices=list(BUILDERS), default=["DOCX", "PDF"])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--bulk", type=int, help="Export this many drafts (of the first --pages length) as a ZIP")
+    parser.add_argument("--workers", type=int, nargs="+", help="Worker counts for --bulk (default: 1 up to CPUs)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.bulk:
+        cpus = os.cpu_count() or 1
+        workers = args.workers or sorted({1, max(1, cpus // 2), cpus})
+        rows = bench_bulk(args.bulk, args.pages[0], args.formats, workers)
+        report = print_bulk_report
+    else:
+        rows = bench_exports(args.pages, args.formats, args.iterations)
+        report = print_report
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        report(rows)
+
+
+if __name__ == "__main__":
+    main()
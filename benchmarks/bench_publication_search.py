@@ -0,0 +1,212 @@
+"""
+Benchmark the publication search pipeline against recorded responses.
+
+Runs each stage (query preprocessing, fetch, parse, ranking) in isolation and then
+the full search_publications path against a local fixture server, reporting
+latency percentiles, throughput and the allocation high-water mark per stage.
+
+    python -m benchmarks.bench_publication_search --iterations 50 --latency 0.2 --jitter 0.05
+    python -m benchmarks.bench_publication_search --record   # refresh fixtures from live services
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from benchmarks.fixture_server import FIXTURES_DIR, FixtureServer, point_searcher_at
+from modules.publication_search import (SOURCE_RATE_LIMITS, PublicationSearcher, parse_arxiv_feed,
+                                        parse_pubmed_efetch, similar_keywords, string_similarity)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds"""
+    return {
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000
+    }
+
+
+def measure(function: Callable, iterations: int, setup: Callable = None) -> Dict[str, float]:
+    """
+    Time a stage and record its allocation peak.
+
+    The stage runs once untimed under tracemalloc (allocation peak), then
+    `iterations` times without tracing (latency).
+    """
+    if setup:
+        setup()
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+
+    summary = summarize(samples)
+    summary["alloc_peak_kib"] = peak / 1024
+    summary["ops_per_s"] = iterations / sum(samples) if sum(samples) else float("inf")
+    return summary
+
+
+def bench_stages(searcher: PublicationSearcher, query: str, domain: str, limit: int,
+                 iterations: int) -> Dict[str, Dict[str, float]]:
+    """Benchmark each pipeline stage in isolation"""
+    processed = searcher._preprocess_query(query, domain)
+    arxiv_params = {"search_query": searcher._build_arxiv_query(processed, domain), "start": 0,
+                    "max_results": limit, "sortBy": "relevance", "sortOrder": "descending"}
+    esearch_params = searcher._eutils_params(db="pubmed", term=processed, retmax=limit, sort="relevance",
+                                             retmode="json")
+    pubmed_ids = searcher.http.get(searcher.pubmed_eutils_url + "esearch.fcgi",
+                                   params=esearch_params).json()["esearchresult"]["idlist"][:limit]
+    # name -> (method, url, request arguments)
+    requests_by_source = {
+        "arXiv": ("GET", searcher.arxiv_api, {"params": arxiv_params}),
+        "Google Scholar": ("GET", searcher.scholar_url, {"params": {"q": processed, "hl": "en", "as_sdt": "0,5"}}),
+        "PubMed esearch": ("GET", searcher.pubmed_eutils_url + "esearch.fcgi", {"params": esearch_params}),
+        "PubMed efetch": ("POST", searcher.pubmed_eutils_url + "efetch.fcgi",
+                          {"data": searcher._eutils_params(db="pubmed", id=",".join(pubmed_ids), retmode="xml")})
+    }
+
+    def clear_similarity_memo():
+        string_similarity.cache_clear()
+        similar_keywords.cache_clear()
+
+    results = {"preprocess": measure(lambda: searcher._preprocess_query(query, domain), iterations,
+                                     setup=clear_similarity_memo)}
+
+    payloads = {}
+    for name, (method, url, arguments) in requests_by_source.items():
+        payloads[name] = searcher.http.request(method, url, **arguments).content
+        results[f"fetch[{name}]"] = measure(lambda: searcher.http.request(method, url, **arguments).content,
+                                            iterations)
+
+    parsers = {
+        "arXiv": lambda payload: list(parse_arxiv_feed(io.BytesIO(payload))),
+        "Google Scholar": lambda payload: searcher._parse_google_scholar_html(payload.decode("utf-8")),
+        "PubMed efetch": lambda payload: list(parse_pubmed_efetch(io.BytesIO(payload)))
+    }
+    merged = []
+    for name, parse in parsers.items():
+        payload = payloads[name]
+        merged.extend(parse(payload))
+        results[f"parse[{name}]"] = measure(lambda: parse(payload), iterations)
+
+    results["rank"] = measure(lambda: searcher._filter_and_rank_results(merged, query, domain, limit), iterations)
+    results["rank"]["candidates"] = len(merged)
+    return results
+
+
+def bench_end_to_end(searcher: PublicationSearcher, query: str, domain: str, limit: int,
+                     iterations: int, concurrency: int) -> Dict[str, float]:
+    """Run full searches concurrently and report throughput and latency"""
+    def one_search(_):
+        start = time.perf_counter()
+        searcher.search_publications(query, domain, limit)
+        return time.perf_counter() - start
+
+    searcher.search_publications(query, domain, limit)  # warm up connections
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one_search, range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(samples)
+    summary["searches_per_s"] = iterations / elapsed
+    return summary
+
+
+def record_fixtures(query: str, domain: str, limit: int):
+    """Overwrite the fixtures with live responses from arXiv, Scholar and the PubMed E-utilities"""
+    searcher = PublicationSearcher(use_cache=False)
+    processed = searcher._preprocess_query(query, domain)
+    arxiv_params = {"search_query": searcher._build_arxiv_query(processed, domain), "start": 0,
+                    "max_results": limit, "sortBy": "relevance", "sortOrder": "descending"}
+    captures = {
+        "arxiv_atom.xml": (searcher.arxiv_api, arxiv_params),
+        "scholar.html": (searcher.scholar_url, {"q": processed, "hl": "en", "as_sdt": "0,5"}),
+        "pubmed_esearch.json": (searcher.pubmed_eutils_url + "esearch.fcgi", searcher._eutils_params(
+            db="pubmed", term=processed, retmax=50, sort="relevance", retmode="json"))
+    }
+    responses = {}
+    for name, (url, params) in captures.items():
+        responses[name] = searcher.http.get(url, params=params)
+    pubmed_ids = responses["pubmed_esearch.json"].json()["esearchresult"]["idlist"]
+    responses["pubmed_efetch.xml"] = searcher.http.post(
+        searcher.pubmed_eutils_url + "efetch.fcgi",
+        data=searcher._eutils_params(db="pubmed", id=",".join(pubmed_ids), retmode="xml"))
+    for name, response in responses.items():
+        response.raise_for_status()
+        with open(os.path.join(FIXTURES_DIR, name), "wb") as fixture:
+            fixture.write(response.content)
+        print(f"Recorded {name} ({len(response.content) // 1024} KiB)")
+
+
+def print_report(report: Dict):
+    """Print a fixed-width table of the stage and end-to-end results"""
+    columns = ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "alloc_peak_kib", "ops_per_s")
+    print(f"{'stage':<24}" + "".join(f"{column:>16}" for column in columns))
+    for stage, summary in report["stages"].items():
+        print(f"{stage:<24}" + "".join(f"{summary.get(column, float('nan')):>16.2f}" for column in columns))
+    end_to_end = report["end_to_end"]
+    print()
+    print(f"search_publications: {end_to_end['searches_per_s']:.1f} searches/s, "
+          f"p50 {end_to_end['p50_ms']:.1f} ms, p95 {end_to_end['p95_ms']:.1f} ms, p99 {end_to_end['p99_ms']:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the publication search pipeline on recorded fixtures")
+    parser.add_argument("--query", default="machine learning medical imaging")
+    parser.add_argument("--domain", default="Medicine")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent end-to-end searches")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean fixture server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--record", action="store_true", help="Record fresh fixtures from the live services")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.query, args.domain, args.limit)
+        return
+
+    with FixtureServer(latency=args.latency, jitter=args.jitter) as server:
+        # The fixture server has no request budget to protect
+        searcher = PublicationSearcher(use_cache=False, max_workers=max(6, args.concurrency * 3),
+                                       rate_limits={name: None for name in SOURCE_RATE_LIMITS})
+        point_searcher_at(searcher, server)
+        report = {
+            "config": vars(args),
+            "stages": bench_stages(searcher, args.query, args.domain, args.limit, args.iterations),
+            "end_to_end": bench_end_to_end(searcher, args.query, args.domain, args.limit,
+                                           args.iterations, args.concurrency)
+        }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
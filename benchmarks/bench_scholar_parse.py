@@ -0,0 +1,65 @@
+"""
+Micro-benchmark Google Scholar result page parsing.
+
+Compares the original whole-page BeautifulSoup parse against the parser used by
+PublicationSearcher, both its lxml.html path and its BeautifulSoup fallback that
+only builds result containers, on saved result pages:
+
+    python -m benchmarks.bench_scholar_parse                      # benchmarks/fixtures/scholar.html
+    python -m benchmarks.bench_scholar_parse saved/*.html --iterations 200
+"""
+import argparse
+import os
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from modules import publication_search
+from modules.publication_search import parse_google_scholar_html
+from benchmarks.bench_publication_search import measure
+from benchmarks.fixture_server import FIXTURES_DIR
+
+
+def parse_full_tree(html: str) -> List[Dict]:
+    """The original parser: full html.parser tree and repeated find() calls per field"""
+    soup = BeautifulSoup(html, 'html.parser')
+    results = []
+    for result in soup.find_all('div', class_='gs_r gs_or gs_scl'):
+        title = result.find('h3', class_='gs_rt')
+        link = title.find('a')['href'] if title else None
+        title_text = title.text.strip() if title else "No title"
+        authors = result.find('div', class_='gs_a').text.strip() if result.find('div', class_='gs_a') else "No authors"
+        published = result.find('span', class_='gs_age').text.strip() if result.find('span', class_='gs_age') else "No date"
+        results.append({"title": title_text, "authors": [authors], "link": link, "published": published})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Google Scholar result page parsing")
+    parser.add_argument("pages", nargs="*", default=[os.path.join(FIXTURES_DIR, "scholar.html")],
+                        help="Saved Scholar result pages")
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    variants = {
+        "full tree (original)": parse_full_tree,
+        "strained BeautifulSoup": lambda html: parse_google_scholar_html(html, use_lxml=False)
+    }
+    if publication_search.lxml is not None:
+        variants["lxml.html"] = parse_google_scholar_html
+
+    columns = ("mean_ms", "p50_ms", "p95_ms", "alloc_peak_kib")
+    for path in args.pages:
+        with open(path, encoding="utf-8") as page:
+            html = page.read()
+        print(f"{os.path.basename(path)} ({len(html) // 1024} KiB)")
+        print(f"  {'variant':<28}{'results':>8}" + "".join(f"{column:>16}" for column in columns))
+        for name, parse in variants.items():
+            count = len(parse(html))
+            summary = measure(lambda: parse(html), args.iterations)
+            print(f"  {name:<28}{count:>8}" + "".join(f"{summary[column]:>16.2f}" for column in columns))
+        print()
+
+
+if __name__ == "__main__":
+    main()
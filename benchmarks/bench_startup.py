@@ -0,0 +1,124 @@
+"""
+Benchmark cold start: module import times and the app's first render.
+
+Every sample runs in a fresh interpreter, so nothing is already imported; the
+operating system's file cache is warm after the first run, as on a server
+that restarts the app.
+
+    python -m benchmarks.bench_startup                        # app modules, then the first render
+    python -m benchmarks.bench_startup --runs 10 --modules modules.writing_style_analyzer
+    python -m benchmarks.bench_startup --importtime research_explore   # slowest imports of one module
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+from benchmarks.bench_publication_search import summarize
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules main.py imports before it renders anything
+APP_MODULES = (
+    "modules.writing_style_analyzer",
+    "modules.language_support",
+    "modules.publication_search",
+    "research_explore",
+    "modules.draft_generator",
+    "modules.export_handler",
+    "accessibility"
+)
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+# Runs main.py the way `streamlit run` does for a new session, without a browser
+RENDER_SNIPPET = """
+import time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("main.py", default_timeout=120).run()
+elapsed = time.perf_counter() - started
+if app.exception:
+    raise SystemExit(str(app.exception[0].message))
+print(elapsed)
+"""
+
+
+def run_sample(snippet: str) -> float:
+    """Run a snippet in a fresh interpreter and return the seconds it printed"""
+    completed = subprocess.run([sys.executable, "-c", snippet], cwd=REPO_DIR, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError((completed.stderr or completed.stdout).strip().splitlines()[-1])
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def bench_snippet(snippet: str, runs: int) -> Dict:
+    try:
+        samples = [run_sample(snippet) for _ in range(runs)]
+    except RuntimeError as e:
+        return {"error": str(e)}
+    return summarize(samples)
+
+
+def slowest_imports(module: str, count: int) -> List[Dict]:
+    """The `count` imports with the largest cumulative time under python -X importtime"""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=REPO_DIR,
+                               capture_output=True, text=True)
+    imports = []
+    for line in completed.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if match:
+            imports.append({"module": match.group(4), "depth": len(match.group(3)) // 2,
+                            "self_ms": int(match.group(1)) / 1000, "cumulative_ms": int(match.group(2)) / 1000})
+    return sorted(imports, key=lambda entry: entry["cumulative_ms"], reverse=True)[:count]
+
+
+def print_report(report: Dict):
+    columns = ("mean_ms", "p50_ms", "p95_ms")
+    print(f"{'import':<36}" + "".join(f"{column:>12}" for column in columns))
+    for name, summary in report.items():
+        if "error" in summary:
+            print(f"{name:<36}  failed: {summary['error']}")
+        else:
+            print(f"{name:<36}" + "".join(f"{summary[column]:>12.1f}" for column in columns))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark cold import and first render times")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--modules", nargs="+", default=list(APP_MODULES), help="Modules to import")
+    parser.add_argument("--no-render", action="store_true", help="Skip the first render of main.py")
+    parser.add_argument("--importtime", metavar="MODULE", help="List the slowest imports of one module instead")
+    parser.add_argument("--top", type=int, default=15, help="Imports listed by --importtime")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.importtime:
+        imports = slowest_imports(args.importtime, args.top)
+        if args.json:
+            print(json.dumps(imports, indent=2))
+            return
+        print(f"{'module':<48}{'self_ms':>12}{'cumulative_ms':>16}")
+        for entry in imports:
+            print(f"{'  ' * entry['depth'] + entry['module']:<48}{entry['self_ms']:>12.1f}{entry['cumulative_ms']:>16.1f}")
+        return
+
+    report = {module: bench_snippet(IMPORT_SNIPPET.format(module=module), args.runs) for module in args.modules}
+    if not args.no_render:
+        report["main.py first render"] = bench_snippet(RENDER_SNIPPET, args.runs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Local stand-in for the publication search backends.
+
+Serves recorded arXiv Atom, Google Scholar and PubMed E-utilities responses from
+benchmarks/fixtures with configurable latency and jitter, so the search pipeline
+can be exercised without touching live services.
+"""
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# URL path prefix -> (fixture file, content type)
+ROUTES = {
+    "/arxiv/api/query": ("arxiv_atom.xml", "application/atom+xml; charset=utf-8"),
+    "/scholar/scholar": ("scholar.html", "text/html; charset=utf-8"),
+    "/eutils/esearch.fcgi": ("pubmed_esearch.json", "application/json; charset=UTF-8"),
+    "/eutils/efetch.fcgi": ("pubmed_efetch.xml", "text/xml; charset=UTF-8")
+}
+
+
+def load_fixture(name: str) -> bytes:
+    """Read a fixture file as bytes"""
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as fixture:
+        return fixture.read()
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients dropping keep-alive connections"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+
+class FixtureServer:
+    """
+    Threaded HTTP server replaying fixtures, run in a background thread.
+
+    Usage:
+        with FixtureServer(latency=0.2, jitter=0.05) as server:
+            searcher.arxiv_api = server.url("/arxiv/api/query")
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, host: str = "127.0.0.1", port: int = 0,
+                 seed: int = 0):
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            latency (float): Mean delay in seconds before each response
+            jitter (float): Maximum deviation in seconds added to or removed from the delay
+            host (str): Interface to bind
+            port (int): Port to bind, 0 for an ephemeral port
+            seed (int): Seed for the jitter generator
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.routes = {path: (load_fixture(name), content_type) for path, (name, content_type) in ROUTES.items()}
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _QuietHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this, small
+            # responses stall on Nagle's algorithm meeting delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                server.handle(self)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.request_body = self.rfile.read(length)
+                server.handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def delay(self) -> float:
+        """Draw the delay for one response"""
+        with self._lock:
+            self.request_count += 1
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + offset)
+
+    def resolve(self, handler: BaseHTTPRequestHandler):
+        """Return (body, content type) for a request, or None for unknown paths"""
+        path = urlsplit(handler.path).path
+        for prefix, route in self.routes.items():
+            if path.startswith(prefix):
+                return route
+        return None
+
+    def handle(self, handler: BaseHTTPRequestHandler):
+        """Reply to one request after the configured delay"""
+        time.sleep(self.delay())
+        route = self.resolve(handler)
+        if route is None:
+            handler.send_response(404)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        body, content_type = route
+        handler.send_response(200)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def url(self, path: str = "") -> str:
+        """Absolute URL of a path on this server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def point_searcher_at(searcher, server: FixtureServer):
+    """Redirect every backend of a PublicationSearcher to the fixture server"""
+    searcher.arxiv_api = server.url("/arxiv/api/query")
+    searcher.scholar_url = server.url("/scholar/scholar")
+    searcher.pubmed_eutils_url = server.url("/eutils/")
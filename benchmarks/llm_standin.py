@@ -0,0 +1,231 @@
+"""
+Local stand-in for an OpenAI-compatible chat completion API.
+
+Answers POST .../chat/completions (so both the Groq SDK's /openai/v1 prefix and
+plain /v1 work) with synthetic text, streamed as server-sent events or returned
+whole, at a configurable token rate after a configurable first-token latency.
+A fraction of requests can be answered with 429 to exercise client retries.
+
+Run it standalone and point the app at it:
+
+    python -m benchmarks.llm_standin --port 8001 --tokens-per-second 80 --first-token-latency 0.4
+    LLM_BACKEND=openai LLM_BASE_URL=http://127.0.0.1:8001/v1 LLM_API_KEY=standin streamlit run main.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler
+
+from benchmarks.fixture_server import _QuietHTTPServer
+
+WORDS = ("the", "model", "results", "suggest", "that", "analysis", "of", "data", "method", "research",
+         "approach", "significant", "framework", "evidence", "study", "performance", "we", "propose",
+         "a", "novel", "and", "in", "learning", "effect", "proposed", "findings", "across", "baseline")
+
+# Requests that do not set max_tokens get this many tokens
+DEFAULT_COMPLETION_TOKENS = 256
+
+
+class LLMStandin:
+    """
+    Threaded OpenAI-compatible chat completion server, run in a background thread.
+
+    Usage:
+        with LLMStandin(tokens_per_second=100, first_token_latency=0.3) as server:
+            client = LLMClient(api_key="standin", base_url=server.url())
+    """
+
+    def __init__(self, tokens_per_second: float = 50.0, first_token_latency: float = 0.3, jitter: float = 0.0,
+                 max_completion_tokens: int = None, error_rate: float = 0.0, host: str = "127.0.0.1",
+                 port: int = 0, seed: int = 0):
+        """
+        Initialize the server (not started yet).
+
+        Args:
+            tokens_per_second (float): Rate at which each completion produces tokens
+            first_token_latency (float): Mean delay in seconds before the first token
+            jitter (float): Maximum deviation in seconds added to or removed from that delay
+            max_completion_tokens (int, optional): Cap on tokens per completion; by default
+                a completion uses its whole max_tokens budget
+            error_rate (float): Fraction of requests answered with 429 Too Many Requests
+            host (str): Interface to bind
+            port (int): Port to bind, 0 for an ephemeral port
+            seed (int): Seed for the jitter, error and text generators
+        """
+        self.tokens_per_second = tokens_per_second
+        self.first_token_latency = first_token_latency
+        self.jitter = jitter
+        self.max_completion_tokens = max_completion_tokens
+        self.error_rate = error_rate
+        self.request_count = 0
+        self.rejected_count = 0
+        self.tokens_sent = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _QuietHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if not self.path.split("?")[0].endswith("/chat/completions"):
+                    server.send_json(self, 404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                try:
+                    request = json.loads(body or b"{}")
+                except ValueError:
+                    server.send_json(self, 400, {"error": {"message": "Request body is not JSON"}})
+                    return
+                server.handle(self, request)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _draw(self, request: dict):
+        """(reject, first-token delay, completion tokens) for one request"""
+        with self._lock:
+            self.request_count += 1
+            reject = self.error_rate > 0 and self._random.random() < self.error_rate
+            if reject:
+                self.rejected_count += 1
+            offset = self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+            count = int(request.get("max_tokens") or DEFAULT_COMPLETION_TOKENS)
+            if self.max_completion_tokens:
+                count = min(count, self.max_completion_tokens)
+            tokens = [self._random.choice(WORDS) for _ in range(count)]
+        return reject, max(0.0, self.first_token_latency + offset), tokens
+
+    @staticmethod
+    def send_json(handler: BaseHTTPRequestHandler, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    @staticmethod
+    def _token_text(tokens, index: int) -> str:
+        """Token `index` as text: words separated by spaces, with a paragraph break every 60 tokens"""
+        separator = "" if index == 0 else ("\n\n" if index % 60 == 0 else " ")
+        return separator + tokens[index]
+
+    def handle(self, handler: BaseHTTPRequestHandler, request: dict):
+        """Reply to one chat completion request"""
+        reject, delay, tokens = self._draw(request)
+        if reject:
+            self.send_json(handler, 429, {"error": {"message": "Rate limit reached (stand-in)"}},
+                           headers={"Retry-After": "0.1"})
+            return
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        model = request.get("model") or "standin"
+        finish_reason = "length" if request.get("max_tokens") and len(tokens) >= request["max_tokens"] else "stop"
+        start = time.monotonic()
+
+        if not request.get("stream"):
+            time.sleep(delay + len(tokens) / self.tokens_per_second)
+            text = "".join(self._token_text(tokens, index) for index in range(len(tokens)))
+            self.send_json(handler, 200, {
+                "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": finish_reason}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)}
+            })
+            self._count_tokens(len(tokens))
+            return
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.send_header("Transfer-Encoding", "chunked")
+        handler.end_headers()
+
+        def send_event(data: str):
+            event = f"data: {data}\n\n".encode("utf-8")
+            handler.wfile.write(f"{len(event):x}\r\n".encode("ascii") + event + b"\r\n")
+            handler.wfile.flush()
+
+        def chunk(delta: dict, reason=None) -> str:
+            return json.dumps({
+                "id": completion_id, "object": "chat.completion.chunk", "created": int(start), "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": reason}]
+            })
+
+        time.sleep(delay)
+        send_event(chunk({"role": "assistant", "content": ""}))
+        for index in range(len(tokens)):
+            # Pace against the start time rather than sleeping a fixed interval, so the rate does not drift
+            wait = start + delay + index / self.tokens_per_second - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            send_event(chunk({"content": self._token_text(tokens, index)}))
+            self._count_tokens(1)
+        send_event(chunk({}, finish_reason))
+        send_event("[DONE]")
+        handler.wfile.write(b"0\r\n\r\n")
+
+    def _count_tokens(self, count: int):
+        with self._lock:
+            self.tokens_sent += count
+
+    def url(self, path: str = "") -> str:
+        """Absolute URL of a path on this server"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="llm-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve synthetic chat completions for load testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Token rate of each completion")
+    parser.add_argument("--first-token-latency", type=float, default=0.3, help="Seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.0, help="First-token latency jitter in seconds")
+    parser.add_argument("--max-completion-tokens", type=int, help="Cap on tokens per completion")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args(argv)
+
+    server = LLMStandin(args.tokens_per_second, args.first_token_latency, args.jitter, args.max_completion_tokens,
+                        args.error_rate, args.host, args.port)
+    print(f"Serving synthetic completions on {server.url()}")
+    print(f"  Groq backend:   LLM_BASE_URL={server.url()} LLM_API_KEY=standin")
+    print(f"  OpenAI backend: LLM_BACKEND=openai LLM_BASE_URL={server.url('/v1')} LLM_API_KEY=standin")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,18 @@
 import streamlit as st
 import sys
 import os
+import io
+import time
 from modules.writing_style_analyzer import AcademicWritingStyleAnalyzer
-from modules.draft_generator import generate_academic_draft
+from modules.grammar_service import GrammarServiceBusy, GrammarServiceTimeout
 from modules.language_support import MultiLanguageSupport
-from modules.publication_search import PublicationSearcher
+from modules.publication_search import get_publication_searcher
+from modules.ranking import relevance_label
 import re
 from research_explore import show_research_explore  # Remove the upload_file import
-import docx
-import pdfkit  # Ensure you have pdfkit and wkhtmltopdf installed
-from modules.draft_generator import generate_academic_draft, handle_download
+from modules.draft_generator import stream_academic_draft, stream_sectioned_academic_draft, handle_download
+from modules.export_handler import EXPORT_FORMATS, export_zip
 from accessibility import Accessibility
-import PyPDF2
 
 # Initialize the Accessibility class
 accessibility = Accessibility()
@@ -43,17 +44,10 @@ if 'current_page' not in st.session_state:
 if 'writing_analyzer' not in st.session_state:
     st.session_state.writing_analyzer = AcademicWritingStyleAnalyzer()
 if 'publication_searcher' not in st.session_state:
-    st.session_state.publication_searcher = PublicationSearcher()
+    # One searcher per process, so its worker pool and connection limits cover every session
+    st.session_state.publication_searcher = get_publication_searcher()
 
 
-@st.cache_resource
-def load_model():
-    # Load your heavy model here
-    # Replace with actual model loading code
-    model = None  # Replace with actual model loading code
-    return model  
-    
-
 def render_home():
     """
     Render a fully responsive home page for Academic Paper Generator & Validator with 3D effects and animations.
@@ -289,21 +283,99 @@ def render_home():
 
 
 
+def render_draft_stream(chunks, placeholder, refresh_interval: float = 0.1) -> str:
+    """
+    Render streamed draft text into a placeholder as it arrives.
+    
+    Redraws at most every refresh_interval seconds, since every redraw re-sends the
+    whole text to the browser.
+    
+    Returns:
+        str: The complete text
+    """
+    parts = []
+    last_refresh = 0.0
+    for chunk in chunks:
+        parts.append(chunk)
+        now = time.monotonic()
+        if now - last_refresh >= refresh_interval:
+            placeholder.markdown("".join(parts) + " ▌")
+            last_refresh = now
+    return "".join(parts).strip()
+
+
+def render_bulk_export():
+    """Export drafts from this session and uploaded text files as one ZIP archive"""
+    history = st.session_state.get('draft_history', [])
+    with st.expander("📦 Bulk export"):
+        choices = [f"{index + 1}. {topic}" for index, (topic, _) in enumerate(history)]
+        selected = st.multiselect("Drafts from this session:", choices, default=choices)
+        uploads = st.file_uploader("Add drafts from text files:", type=["txt", "md"], accept_multiple_files=True)
+        formats = st.multiselect("Formats:", list(EXPORT_FORMATS), default=["DOCX", "PDF"])
+
+        if st.button("Build ZIP"):
+            drafts = [history[choices.index(choice)] for choice in selected]
+            drafts += [(os.path.splitext(upload.name)[0], upload.getvalue().decode('utf-8', errors='replace'))
+                       for upload in uploads or []]
+            if not drafts or not formats:
+                st.error("Please choose at least one draft and one format.")
+            else:
+                archive = io.BytesIO()
+                with st.spinner(f"Exporting {len(drafts)} drafts..."):
+                    try:
+                        count = export_zip(drafts, archive, formats)
+                    except Exception as e:
+                        st.error(f"Error exporting drafts: {e}")
+                        count = 0
+                if count:
+                    st.session_state.bulk_export = archive.getvalue()
+                    st.success(f"Exported {count} documents.")
+
+        # Kept in session state so the archive survives the rerun the download click triggers
+        if 'bulk_export' in st.session_state:
+            st.download_button("Download ZIP", st.session_state.bulk_export, file_name="drafts.zip",
+                               mime="application/zip")
+
+
 def render_draft_generator():
     st.title("Academic Draft Generator")
     
     # Step 1: User input for the research topic
     research_topic = st.text_input("Enter your research topic:")
-
-    # Step 2: Button to generate the draft
-    if st.button("Generate Draft"):
+    parallel_sections = st.checkbox(
+        "Write sections in parallel (faster)",
+        help="Plans an outline first, then writes every section at the same time."
+    )
+    similar_topics = st.checkbox(
+        "Reuse drafts of similar topics",
+        help="Shows a draft generated earlier for a reworded topic instead of writing a new one."
+    )
+
+    # Step 2: Button to generate the draft; Regenerate skips the draft cache
+    col_generate, col_regenerate = st.columns([1, 1])
+    with col_generate:
+        generate_clicked = st.button("Generate Draft", use_container_width=True)
+    with col_regenerate:
+        regenerate_clicked = st.button("🔄 Regenerate", use_container_width=True,
+                                       help="Generate a fresh draft instead of reusing a cached one")
+    
+    if generate_clicked or regenerate_clicked:
         if research_topic:
-            # Display a spinner while generating the draft
+            # Show the draft as it is written instead of after the whole completion
+            draft_placeholder = st.empty()
             with st.spinner("Generating draft..."):
-                model = load_model()  # Load model on demand
-                generated_draft = generate_academic_draft(research_topic, model)
-                if generated_draft:
-                    st.session_state.generated_draft = generated_draft
+                stream_draft = stream_sectioned_academic_draft if parallel_sections else stream_academic_draft
+                generated_draft = render_draft_stream(stream_draft(research_topic, use_cache=not regenerate_clicked,
+                                                                   similar_topics=similar_topics),
+                                                      draft_placeholder)
+            # The finished draft is rendered below from session state
+            draft_placeholder.empty()
+            if generated_draft:
+                st.session_state.generated_draft = generated_draft
+                # Keep every draft of the session for bulk export
+                history = st.session_state.setdefault('draft_history', [])
+                if not history or history[-1] != (research_topic, generated_draft):
+                    history.append((research_topic, generated_draft))
         else:
             st.error("Please enter a research topic.")
     
@@ -312,11 +384,13 @@ def render_draft_generator():
         st.write(st.session_state.generated_draft)
         
         # Step 3: Choose download format
-        download_format = st.selectbox("Choose download format:", ["TXT", "DOCX"])
+        download_format = st.selectbox("Choose download format:", list(EXPORT_FORMATS))
 
         # Handle download functionality
         handle_download(st.session_state.generated_draft, download_format)
 
+    render_bulk_export()
+
     # Additional UI elements (if necessary)
     st.write("Use the form to input a research topic and generate an academic draft.")
 
@@ -374,6 +448,10 @@ def render_writing_style():
                                 st.markdown("---")  # Add a separator between issues
                         else:
                             st.success("✨ Excellent! No significant grammar issues found.")
+                except GrammarServiceBusy as e:
+                    st.warning(str(e))
+                except GrammarServiceTimeout as e:
+                    st.error(f"Grammar check timed out: {e}")
                 except Exception as e:
                     st.error(f"An error occurred during analysis: {e}")
         else:
@@ -426,6 +504,82 @@ def render_language_support():
             st.warning("Please enter text to translate.")
 
 
+def render_publication_results(results):
+    """Render one (possibly partial) ranked result set from the publication searcher"""
+    if not results.is_final and results.pending_sources:
+        st.caption(f"⏳ Still searching: {', '.join(results.pending_sources)}")
+    
+    if results.is_final and results.timed_out_sources:
+        st.info(f"⏱️ Skipped slow sources: {', '.join(results.timed_out_sources)}")
+    
+    if results.is_final and results.failed_sources:
+        st.info(f"⚠️ Unavailable sources: {', '.join(results.failed_sources)}")
+    
+    if results:
+        st.markdown(f"### Found {len(results)} Publications")
+        
+        # Relevance is labelled against the best query match in this result set
+        best_relevance = max(pub.get('score_components', {}).get('relevance', 0.0) for pub in results)
+        for i, pub in enumerate(results, 1):
+            label = relevance_label(pub.get('score_components', {}).get('relevance', 0.0), best_relevance)
+            relevance = {"High": "🟢 High", "Medium": "🟡 Medium"}.get(label, "🔴 Low")
+            
+            with st.expander(f"{i}. {pub['title']}", expanded=i==1):
+                # Two columns: main content and metadata
+                col_main, col_meta = st.columns([3, 1])
+                
+                with col_main:
+                    # Authors
+                    st.markdown(f"**Authors:** {', '.join(pub['authors'])}")
+                    
+                    # Abstract
+                    st.markdown("**Abstract:**")
+                    st.markdown(pub['summary'])
+                    
+                    # Link to paper, one per source when the paper was found more than once
+                    links = pub.get('links') or [pub['link']]
+                    sources = pub.get('sources') or [pub['source']]
+                    if len(links) > 1 and len(links) == len(sources):
+                        st.markdown(" · ".join(f"[📄 {source}]({link})" for source, link in zip(sources, links)))
+                    else:
+                        st.markdown(f"[📄 View Full Paper]({links[0]})")
+                
+                with col_meta:
+                    st.markdown(f"""
+                    **Relevance:** {relevance}
+                    
+                    **Domain:** {pub['domain']}
+                    
+                    **Published:** {pub['published'][:10]}
+                    
+                    **Source:** {pub['source']}
+                    """)
+    elif results.is_final:
+        st.warning("No publications found. Try modifying your search terms or selecting a different domain.")
+        st.markdown("""
+        **Search Tips:**
+        - Use more specific keywords
+        - Try different combinations of terms
+        - Check if the domain matches your topic
+        - Include relevant technical terms
+        """)
+
+
+def render_source_health(searcher):
+    """Show the circuit breaker state and request budget of each publication source"""
+    state_icons = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}
+    with st.expander("🩺 Source health"):
+        for name, health in searcher.get_source_health().items():
+            line = f"{state_icons.get(health['state'], '⚪')} **{name}**: {health['state']}"
+            if health['state'] == "open":
+                line += f", retrying in {health['retry_in']:.0f}s"
+            if health['tokens'] is not None:
+                line += f" · {health['tokens']:.1f} requests available"
+            if health['consecutive_failures'] and health['last_error']:
+                line += f" · last error: {health['last_error']}"
+            st.markdown(line)
+
+
 def render_publication_search():
     st.title("📚 Academic Publication Search")
     
@@ -453,53 +607,19 @@ def render_publication_search():
     
     # Perform search when button is clicked
     if search_button and search_query:
+        # Results are re-rendered in place as each source returns
+        results_placeholder = st.empty()
         with st.spinner("🔄 Searching academic publications..."):
-            results = st.session_state.publication_searcher.search_publications(
-                search_query, selected_domain, limit
-            )
-            
-            if results:
-                st.markdown(f"### Found {len(results)} Publications")
-                
-                for i, pub in enumerate(results, 1):
-                    # Calculate relevance indicator
-                    score = pub.get('score', 0)
-                    relevance = "🟢 High" if score > 4 else "🟡 Medium" if score > 2 else "🔴 Low"
-                    
-                    with st.expander(f"{i}. {pub['title']}", expanded=i==1):
-                        # Two columns: main content and metadata
-                        col_main, col_meta = st.columns([3, 1])
-                        
-                        with col_main:
-                            # Authors
-                            st.markdown(f"**Authors:** {', '.join(pub['authors'])}")
-                            
-                            # Abstract
-                            st.markdown("**Abstract:**")
-                            st.markdown(pub['summary'])
-                            
-                            # Link to paper
-                            st.markdown(f"[📄 View Full Paper]({pub['link']})")
-                        
-                        with col_meta:
-                            st.markdown(f"""
-                            **Relevance:** {relevance}
-                            
-                            **Domain:** {pub['domain']}
-                            
-                            **Published:** {pub['published'][:10]}
-                            
-                            **Source:** {pub['source']}
-                            """)
-            else:
-                st.warning("No publications found. Try modifying your search terms or selecting a different domain.")
-                st.markdown("""
-                **Search Tips:**
-                - Use more specific keywords
-                - Try different combinations of terms
-                - Check if the domain matches your topic
-                - Include relevant technical terms
-                """)
+            try:
+                for results in st.session_state.publication_searcher.iter_search_publications(
+                    search_query, selected_domain, limit
+                ):
+                    with results_placeholder.container():
+                        render_publication_results(results)
+            except Exception as e:
+                st.error(f"Error searching publications: {e}")
+    
+    render_source_health(st.session_state.publication_searcher)
     
     # Show tips when no search is performed
     if not search_button:
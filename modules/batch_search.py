@@ -0,0 +1,110 @@
+"""
+Run publication searches in bulk from a JSON-lines file.
+
+Each input line is an object with a "query" and optionally a "domain" and a
+"limit"; any other fields (an "id", say) are copied to the output untouched:
+
+    {"id": "t1", "query": "graph neural networks", "domain": "Computer Science"}
+    {"id": "t2", "query": "CRISPR off-target effects", "domain": "Biology", "limit": 20}
+
+    python -m modules.batch_search queries.jsonl -o results.jsonl --concurrency 8
+
+One output line is written per input line as soon as its search finishes, so the
+output is in completion order; "line" gives the 1-based input line number.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Dict, Iterator, List, Optional
+
+from modules.publication_search import DEFAULT_SOURCE_TIMEOUTS, PublicationSearcher
+
+
+def read_queries(path: str) -> Iterator[Dict]:
+    """
+    Read search requests from a JSON-lines file ("-" for stdin).
+
+    Blank lines are skipped. Each request gets a "line" field with its line number.
+
+    Raises:
+        ValueError: If a line is not a JSON object with a non-empty "query"
+    """
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})")
+            if not isinstance(request, dict) or not str(request.get("query") or "").strip():
+                raise ValueError(f"{path}:{number}: expected an object with a \"query\"")
+            request["line"] = number
+            yield request
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def result_record(request: Dict, results) -> Dict:
+    """Output line for one request: the request fields plus its ranked results and source status"""
+    record = dict(request)
+    record.update({
+        "results": list(results),
+        "completed_sources": results.completed_sources,
+        "timed_out_sources": results.timed_out_sources,
+        "failed_sources": results.failed_sources
+    })
+    return record
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point: search every query in a JSON-lines file"""
+    parser = argparse.ArgumentParser(description="Search publications for every query in a JSON-lines file")
+    parser.add_argument("queries", help="Input JSON-lines file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output JSON-lines file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Distinct searches in flight at once")
+    parser.add_argument("--domain", default="", help="Domain for queries that do not name one")
+    parser.add_argument("--limit", type=int, default=10, help="Result limit for queries that do not give one")
+    parser.add_argument("--source-timeout", type=float,
+                        help="Deadline in seconds for every source (default: the per-source defaults)")
+    parser.add_argument("--local-index", help="Offline arXiv index directory (default: $LOCAL_INDEX_PATH)")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the search result cache")
+    args = parser.parse_args(argv)
+
+    try:
+        requests = list(read_queries(args.queries))
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    source_timeouts = None
+    if args.source_timeout:
+        source_timeouts = {name: args.source_timeout for name in DEFAULT_SOURCE_TIMEOUTS}
+    searcher = PublicationSearcher(
+        source_timeouts=source_timeouts,
+        max_workers=args.concurrency * len(DEFAULT_SOURCE_TIMEOUTS),
+        use_cache=not args.no_cache,
+        local_index_path=args.local_index
+    )
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    count = 0
+    try:
+        batch = searcher.search_batch(requests, concurrency=args.concurrency,
+                                      default_domain=args.domain, default_limit=args.limit)
+        for _, request, results in batch:
+            output.write(json.dumps(result_record(request, results), ensure_ascii=False) + "\n")
+            output.flush()
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        searcher.close()
+    print(f"Searched {count} queries in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
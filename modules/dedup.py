@@ -0,0 +1,195 @@
+import re
+import unicodedata
+import zlib
+from typing import Dict, List, Optional, Set
+
+from modules.ranking import split_words
+
+# Placeholder titles emitted by scrapers when a title could not be extracted
+_UNKNOWN_TITLES = frozenset({"", "no title"})
+
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace"""
+    title = title or ""
+    if not title.isascii():
+        decomposed = unicodedata.normalize("NFKD", title)
+        title = "".join(character for character in decomposed if not unicodedata.combining(character))
+    return " ".join(split_words(title))
+
+
+def title_shingles(normalized_title: str) -> Set[str]:
+    """Word unigrams and bigrams of a normalized title"""
+    words = normalized_title.split()
+    shingles = set(words)
+    shingles.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    return shingles
+
+
+class MinHashLSH:
+    """
+    MinHash signatures bucketed by band for near-duplicate candidate lookup.
+
+    With num_perm = bands * rows, two sets with Jaccard similarity s share at least
+    one bucket with probability 1 - (1 - s**rows)**bands; the defaults make pairs
+    above ~0.6 very likely to collide while keeping buckets small.
+    """
+
+    def __init__(self, bands: int = 6, rows: int = 3, seed: int = 1):
+        """
+        Initialize the hash family.
+
+        Args:
+            bands (int): Number of LSH bands
+            rows (int): Signature rows per band
+            seed (int): Seed for the permutation coefficients
+        """
+        self.bands = bands
+        self.rows = rows
+        num_perm = bands * rows
+        # Each permutation XORs the 32-bit shingle hash with a fixed mask; masks are
+        # derived deterministically so signatures are stable across processes
+        self._masks = [zlib.crc32(f"minhash{seed}:{i}".encode()) for i in range(num_perm)]
+        self._buckets = {}
+
+    def signature(self, shingles: Set[str]) -> List[int]:
+        """MinHash signature of a shingle set"""
+        hashes = [zlib.crc32(shingle.encode()) for shingle in shingles]
+        # map() over the bound int method keeps the inner loop in C
+        return [min(map(mask.__xor__, hashes)) for mask in self._masks]
+
+    def band_keys(self, signature: List[int]):
+        """Bucket keys of a signature, one per band"""
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+
+    def query(self, signature: List[int]) -> Set[int]:
+        """Keys of indexed sets that share at least one band with the signature"""
+        candidates = set()
+        for band_key in self.band_keys(signature):
+            candidates.update(self._buckets.get(band_key, ()))
+        return candidates
+
+    def insert(self, key: int, signature: List[int]):
+        """Add a signature to the index under the given key"""
+        for band_key in self.band_keys(signature):
+            self._buckets.setdefault(band_key, []).append(key)
+
+
+def publication_year(result: Dict) -> Optional[str]:
+    """Four-digit year of a result's publication date, if it has one"""
+    match = _YEAR_PATTERN.search(str(result.get("published") or ""))
+    return match.group() if match else None
+
+
+def author_surnames(result: Dict) -> Set[str]:
+    """Normalized last names of a result's authors ("A Smith" and "Alice Smith" both give "smith")"""
+    authors = result.get("authors") or []
+    if isinstance(authors, str):
+        authors = authors.split(",")
+    surnames = set()
+    for author in authors:
+        words = normalize_title(author).split()
+        if words and words != ["no", "authors"]:
+            surnames.add(words[-1])
+    return surnames
+
+
+def collapse_duplicates(results: List[Dict], threshold: float = 0.7,
+                        unconfirmed_threshold: float = 0.9) -> List[Dict]:
+    """
+    Merge copies of the same paper returned by different sources.
+
+    Exact duplicates are found by normalized-title hash; near-duplicates are found
+    with MinHash/LSH over title shingles and confirmed by their exact Jaccard
+    similarity plus a second signal: the same publication year or a shared author
+    surname. Similar titles with different years and no common author are kept
+    apart (a paper and its follow-up often differ by a word). When a record has
+    neither year nor authors to compare, only titles at unconfirmed_threshold merge.
+    Each group collapses into its first record (source order is kept), which gains
+    "sources" and "links" lists and borrows missing fields from the rest.
+
+    Args:
+        results (List[Dict]): Raw results from all sources
+        threshold (float): Minimum title-shingle Jaccard similarity for a near-duplicate
+            with a matching year or author
+        unconfirmed_threshold (float): Minimum similarity when years and authors cannot
+            be compared
+
+    Returns:
+        List[Dict]: One record per distinct paper, in first-seen order
+    """
+    lsh = MinHashLSH()
+    by_title = {}
+    shingles_by_group = {}
+    # Years and author surnames seen in each group, for confirming near-duplicates
+    years_by_group = {}
+    surnames_by_group = {}
+    groups = []
+
+    for result in results:
+        normalized = normalize_title(result.get("title", ""))
+        group_index = by_title.get(normalized) if normalized not in _UNKNOWN_TITLES else None
+
+        year = publication_year(result)
+        surnames = author_surnames(result)
+        if group_index is None and normalized not in _UNKNOWN_TITLES:
+            shingles = title_shingles(normalized)
+            signature = lsh.signature(shingles)
+            for candidate in sorted(lsh.query(signature)):
+                candidate_shingles = shingles_by_group[candidate]
+                similarity = len(shingles & candidate_shingles) / len(shingles | candidate_shingles)
+                if similarity < threshold:
+                    continue
+                candidate_years, candidate_surnames = years_by_group[candidate], surnames_by_group[candidate]
+                if year in candidate_years or surnames & candidate_surnames:
+                    group_index = candidate
+                    break
+                comparable = (year and candidate_years) or (surnames and candidate_surnames)
+                if not comparable and similarity >= unconfirmed_threshold:
+                    group_index = candidate
+                    break
+            if group_index is None:
+                # First copy of this paper: index it for later near-duplicate lookups
+                lsh.insert(len(groups), signature)
+                shingles_by_group[len(groups)] = shingles
+                by_title[normalized] = len(groups)
+            else:
+                by_title[normalized] = group_index
+
+        if group_index is None:
+            group_index = len(groups)
+            groups.append([])
+            years_by_group[group_index], surnames_by_group[group_index] = set(), set()
+        groups[group_index].append(result)
+        if year:
+            years_by_group[group_index].add(year)
+        surnames_by_group[group_index] |= surnames
+
+    return [_merge_group(group) for group in groups]
+
+
+def _merge_group(group: List[Dict]) -> Dict:
+    """Merge a group of duplicate records into one"""
+    merged = dict(group[0])
+    sources = []
+    links = []
+    for record in group:
+        source = record.get("source")
+        if source and source not in sources:
+            sources.append(source)
+        link = record.get("link")
+        if link and link not in links:
+            links.append(link)
+        # Prefer the most informative value for fields the first copy lacks
+        if len(record.get("summary") or "") > len(merged.get("summary") or ""):
+            merged["summary"] = record["summary"]
+        for field in ("authors", "published", "link"):
+            if not merged.get(field) and record.get(field):
+                merged[field] = record[field]
+
+    merged["sources"] = sources
+    merged["links"] = links
+    merged["source"] = ", ".join(sources)
+    return merged
@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+
+from modules.dedup import MinHashLSH, normalize_title, title_shingles
+from modules.ranking import tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DRAFT_CACHE_PATH = os.path.join(os.getcwd(), '.cache', 'drafts.sqlite3')
+
+
+class CachedDraft(NamedTuple):
+    """A cache hit: the draft, the topic it was generated for, and whether that topic matched exactly"""
+    draft: str
+    topic: str
+    exact: bool
+
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase and collapse whitespace; punctuation is kept so "C++" and "C#" stay apart"""
+    return " ".join(topic.lower().split())
+
+
+def topic_shingles(topic: str) -> frozenset:
+    """Content-word unigrams and bigrams of a topic; the bigrams make word order count"""
+    return frozenset(title_shingles(" ".join(tokenize(normalize_title(topic)))))
+
+
+class DraftCache:
+    """
+    On-disk cache of generated drafts with exact and near-duplicate topic lookup.
+
+    Entries are keyed on the topic (lowercased, whitespace collapsed) together with
+    everything else that shapes the output: prompt version, model, max_tokens and
+    temperature. On an exact miss, callers may opt into reworded topics, found
+    through MinHash band keys stored next to each entry and confirmed by the
+    Jaccard similarity of their content-word unigrams and bigrams.
+    The least recently used drafts are evicted once the stored text exceeds max_bytes.
+    """
+
+    def __init__(self, path: str = DEFAULT_DRAFT_CACHE_PATH, max_bytes: int = 64 * 1024 * 1024,
+                 near_duplicate_threshold: Optional[float] = 0.75):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str): SQLite file, or ":memory:"
+            max_bytes (int): Total size of stored drafts (UTF-8) before eviction
+            near_duplicate_threshold (float, optional): Minimum shingle Jaccard
+                similarity for a reworded topic to count as a hit; None disables it
+        """
+        self.max_bytes = max_bytes
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self._lsh = MinHashLSH()
+        self._lock = threading.Lock()
+        self._stats = {"exact_hits": 0, "near_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        try:
+            self._db = self._connect(path)
+        except (sqlite3.Error, OSError) as e:
+            # Drafts are still cached for the life of the process, just not on disk
+            logger.error(f"Draft cache unavailable on disk, keeping it in memory: {e}")
+            self._db = self._connect(":memory:")
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        """Open the SQLite file and create the tables if missing"""
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS drafts ("
+            "key TEXT PRIMARY KEY, params TEXT, topic TEXT, normalized_topic TEXT, draft TEXT, "
+            "size INTEGER, created_at REAL, last_used_at REAL)"
+        )
+        db.execute("CREATE TABLE IF NOT EXISTS draft_bands (band TEXT, key TEXT)")
+        db.execute("CREATE INDEX IF NOT EXISTS draft_bands_band ON draft_bands (band)")
+        db.execute("CREATE INDEX IF NOT EXISTS drafts_last_used ON drafts (last_used_at)")
+        db.commit()
+        return db
+
+    @staticmethod
+    def make_params(prompt_version: str, model: str, max_tokens: int, temperature: float) -> str:
+        """Serialized generation settings an entry must match"""
+        return json.dumps([prompt_version, model, max_tokens, temperature])
+
+    @staticmethod
+    def make_key(normalized_topic: str, params: str) -> str:
+        return hashlib.sha256(f"{params}\n{normalized_topic}".encode()).hexdigest()
+
+    def _bands(self, shingles: frozenset, params: str):
+        """Band keys of a topic's shingles, scoped to the generation settings"""
+        if not shingles:
+            return []
+        signature = self._lsh.signature(shingles)
+        return [f"{params}|{band}|{','.join(map(str, rows))}" for band, rows in self._lsh.band_keys(signature)]
+
+    def get(self, topic: str, prompt_version: str, model: str, max_tokens: int,
+            temperature: float, near_duplicates: bool = False) -> Optional[CachedDraft]:
+        """
+        Look up a draft for a topic.
+
+        Args:
+            near_duplicates (bool): Also accept a draft cached for a reworded topic
+
+        Returns:
+            Optional[CachedDraft]: The exact match, else (with near_duplicates) the
+            most similar reworded topic above the threshold, else None (also when
+            the database cannot be read)
+        """
+        normalized_topic = normalize_topic(topic)
+        params = self.make_params(prompt_version, model, max_tokens, temperature)
+        key = self.make_key(normalized_topic, params)
+        with self._lock:
+            try:
+                row = self._db.execute("SELECT draft, topic FROM drafts WHERE key = ?", (key,)).fetchone()
+                if row:
+                    self._touch(key)
+                    self._stats["exact_hits"] += 1
+                    return CachedDraft(row[0], row[1], True)
+
+                if near_duplicates and self.near_duplicate_threshold is not None:
+                    match = self._near_duplicate(topic, params)
+                    if match:
+                        self._touch(match[0])
+                        self._stats["near_hits"] += 1
+                        return CachedDraft(match[1], match[2], False)
+            except sqlite3.Error as e:
+                logger.error(f"Error reading draft cache: {e}")
+
+            self._stats["misses"] += 1
+            return None
+
+    def _near_duplicate(self, topic: str, params: str):
+        """(key, draft, topic) of the most similar cached topic above the threshold (lock held)"""
+        shingles = topic_shingles(topic)
+        bands = self._bands(shingles, params)
+        if not bands:
+            return None
+        placeholders = ",".join("?" * len(bands))
+        candidates = self._db.execute(
+            f"SELECT DISTINCT d.key, d.draft, d.topic FROM draft_bands b "
+            f"JOIN drafts d ON d.key = b.key WHERE b.band IN ({placeholders})", bands
+        ).fetchall()
+        best, best_similarity = None, self.near_duplicate_threshold
+        for key, draft, cached_topic in candidates:
+            cached_shingles = topic_shingles(cached_topic)
+            similarity = len(shingles & cached_shingles) / len(shingles | cached_shingles)
+            if similarity >= best_similarity:
+                best, best_similarity = (key, draft, cached_topic), similarity
+        return best
+
+    def _touch(self, key: str):
+        self._db.execute("UPDATE drafts SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        self._db.commit()
+
+    def put(self, topic: str, prompt_version: str, model: str, max_tokens: int, temperature: float, draft: str):
+        """Store a draft, replacing any entry for the same topic and settings, then evict if over size"""
+        normalized_topic = normalize_topic(topic)
+        params = self.make_params(prompt_version, model, max_tokens, temperature)
+        key = self.make_key(normalized_topic, params)
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO drafts (key, params, topic, normalized_topic, draft, size, created_at, "
+                    "last_used_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, params, topic, normalized_topic, draft, len(draft.encode("utf-8")), now, now)
+                )
+                self._db.execute("DELETE FROM draft_bands WHERE key = ?", (key,))
+                self._db.executemany("INSERT INTO draft_bands (band, key) VALUES (?, ?)",
+                                     [(band, key) for band in self._bands(topic_shingles(topic), params)])
+                self._stats["stores"] += 1
+                self._evict()
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing draft cache: {e}")
+
+    def _evict(self):
+        """Delete least recently used drafts until the total size fits (lock held)"""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM drafts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._db.execute("SELECT key, size FROM drafts ORDER BY last_used_at").fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM drafts WHERE key = ?", evicted)
+        self._db.executemany("DELETE FROM draft_bands WHERE key = ?", evicted)
+        self._stats["evictions"] += len(evicted)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._db.execute("DELETE FROM drafts")
+            self._db.execute("DELETE FROM draft_bands")
+            self._db.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters, the hit rate and the stored size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"], stats["bytes"] = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM drafts").fetchone()
+        lookups = stats["exact_hits"] + stats["near_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["exact_hits"] + stats["near_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_draft_cache() -> DraftCache:
+    """Return the process-wide draft cache, creating it on first use (DRAFT_CACHE_PATH overrides the file)"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = DraftCache(os.getenv('DRAFT_CACHE_PATH', DEFAULT_DRAFT_CACHE_PATH))
+        return _default_cache
@@ -1,38 +1,24 @@
-import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator
 import streamlit as st
 from dotenv import load_dotenv
-from groq import Groq
-import docx
-import pdfkit  # Ensure you have pdfkit and wkhtmltopdf installed
+from modules.draft_cache import get_draft_cache
+from modules.export_handler import EXPORT_FORMATS, export_bytes
+from modules.llm_client import MISSING_API_KEY_MESSAGE, LLMClient, get_llm_client
 
 # Load environment variables
 load_dotenv()
 
-def generate_academic_draft(research_topic: str, max_tokens: int = 2000) -> str:
-    """
-    Generate an academic draft using Groq API
-    
-    Args:
-        research_topic (str): The main research topic for the draft
-        max_tokens (int, optional): Maximum number of tokens for the generated draft
-    
-    Returns:
-        Optional[str]: Generated academic draft or None if generation fails
-    """
-    try:
-        # Retrieve API key from environment variable
-        api_key = os.getenv('GROQ_API_KEY')
-        
-        # Validate API key
-        if not api_key:
-            st.error("Groq API key is missing. Please set GROQ_API_KEY in .env file.")
-            return None
-        
-        # Initialize Groq client without proxy settings
-        client = Groq(api_key=api_key)
-        
-        # Construct a comprehensive prompt for academic draft generation
-        prompt = f"""
+DRAFT_TEMPERATURE = 0.7
+# Bump when a prompt changes so cached drafts from the old prompt are not served
+DRAFT_PROMPT_VERSION = "draft-1"
+SECTIONED_PROMPT_VERSION = "sections-1"
+DRAFT_SYSTEM_PROMPT = "You are an expert academic writing assistant helping to generate a structured research paper draft."
+
+
+def build_draft_prompt(research_topic: str) -> str:
+    """Construct a comprehensive prompt for academic draft generation"""
+    return f"""
         Generate a structured academic draft on the following research topic: "{research_topic}"
         
         Requirements:
@@ -52,49 +38,259 @@ def generate_academic_draft(research_topic: str, max_tokens: int = 2000) -> str:
         7. Conclusion
         8. Potential Future Research Directions
         """
-        
-        # Generate draft using Groq API
-        chat_completion = client.chat.completions.create(
-            messages=[{"role": "system", "content": "You are an expert academic writing assistant helping to generate a structured research paper draft."},
-                      {"role": "user", "content": prompt}],
-            model="llama-3.3-70b-versatile",
-            max_tokens=max_tokens,
-            temperature=0.7,
-            top_p=1,
-            stream=False
-        )
-        
-        # Extract and return the generated draft
-        generated_draft = chat_completion.choices[0].message.content.strip()
-        return generated_draft
+
+
+def _stream_single_pass(research_topic: str, max_tokens: int) -> Iterator[str]:
+    """Stream the whole draft from one completion; returns True once it is complete"""
+    client = get_llm_client()
+    
+    # Validate API key
+    if not client.is_configured:
+        raise RuntimeError(MISSING_API_KEY_MESSAGE)
+    
+    # Generate draft through the configured LLM backend, receiving tokens as server-sent events
+    yield from client.stream_chat(
+        messages=[{"role": "system", "content": DRAFT_SYSTEM_PROMPT},
+                  {"role": "user", "content": build_draft_prompt(research_topic)}],
+        max_tokens=max_tokens,
+        temperature=DRAFT_TEMPERATURE,
+        top_p=1
+    )
+    return True
+
+
+def _cached_stream(generate, prompt_version: str, research_topic: str, max_tokens: int,
+                   use_cache: bool, similar_topics: bool = False) -> Iterator[str]:
+    """
+    Serve a draft from the draft cache, or stream it from `generate` and cache it.
     
+    `generate(research_topic, max_tokens)` yields pieces of the draft and returns
+    True if the draft came out complete; incomplete drafts are not cached. With
+    use_cache False the lookup is skipped but the fresh draft still replaces the
+    cached one. A draft cached for a reworded topic is only served with similar_topics.
+    """
+    cache = get_draft_cache()
+    # The configured model is part of the key, so switching backends never serves stale drafts
+    model = get_llm_client().model
+    if use_cache:
+        cached = cache.get(research_topic, prompt_version, model, max_tokens, DRAFT_TEMPERATURE,
+                           near_duplicates=similar_topics)
+        if cached:
+            if not cached.exact:
+                st.info(f'Showing the cached draft for the similar topic "{cached.topic}". '
+                        f'Use Regenerate for a fresh draft.')
+            yield cached.draft
+            return
+    
+    parts = []
+    pieces = generate(research_topic, max_tokens)
+    try:
+        while True:
+            parts.append(next(pieces))
+            yield parts[-1]
+    except StopIteration as finished:
+        complete = bool(finished.value)
     except Exception as e:
         st.error(f"Error generating academic draft: {e}")
-        return None
+        return
+    
+    draft = "".join(parts).strip()
+    if complete and draft:
+        cache.put(research_topic, prompt_version, model, max_tokens, DRAFT_TEMPERATURE, draft)
+
+
+def stream_academic_draft(research_topic: str, max_tokens: int = 2000, use_cache: bool = True,
+                          similar_topics: bool = False) -> Iterator[str]:
+    """
+    Generate an academic draft using the configured LLM backend, yielding text as it is produced
+    
+    Args:
+        research_topic (str): The main research topic for the draft
+        max_tokens (int, optional): Maximum number of tokens for the generated draft
+        use_cache (bool, optional): Serve a cached draft for the same topic
+        similar_topics (bool, optional): Also serve a draft cached for a reworded topic
+    
+    Yields:
+        str: Successive pieces of the draft (a cached draft in one piece); nothing if
+        generation fails
+    """
+    return _cached_stream(_stream_single_pass, DRAFT_PROMPT_VERSION, research_topic, max_tokens, use_cache,
+                          similar_topics)
+
+
+def generate_academic_draft(research_topic: str, max_tokens: int = 2000, use_cache: bool = True,
+                            similar_topics: bool = False) -> str:
+    """
+    Generate an academic draft using the configured LLM backend
+    
+    Args:
+        research_topic (str): The main research topic for the draft
+        max_tokens (int, optional): Maximum number of tokens for the generated draft
+        use_cache (bool, optional): Serve a cached draft for the same topic
+        similar_topics (bool, optional): Also serve a draft cached for a reworded topic
+    
+    Returns:
+        Optional[str]: Generated academic draft or None if generation fails
+    """
+    generated_draft = "".join(stream_academic_draft(research_topic, max_tokens, use_cache, similar_topics)).strip()
+    return generated_draft or None
+
+
+# Body sections written concurrently in section-parallel mode, with their share of
+# the draft's token budget
+DRAFT_SECTIONS = {
+    "Abstract": 0.08,
+    "Introduction": 0.15,
+    "Literature Review": 0.18,
+    "Methodology": 0.15,
+    "Results and Discussion": 0.18,
+    "Conclusion": 0.1,
+    "Potential Future Research Directions": 0.08
+}
+OUTLINE_MAX_TOKENS = 400
+MIN_SECTION_TOKENS = 150
+
+
+def build_outline_prompt(research_topic: str) -> str:
+    """Prompt for the title and outline shared by every section"""
+    sections = "\n".join(f"## {section}" for section in DRAFT_SECTIONS)
+    return f"""
+        Plan a structured academic paper on the following research topic: "{research_topic}"
+        
+        Reply with a first line of the form "Title: <paper title>", followed by each of
+        these headings with two or three bullet points on what that section will argue:
+        {sections}
+        
+        Keep the plan concise; the sections will be written separately from it.
+        """
+
+
+def build_section_prompt(research_topic: str, outline: str, section: str, max_tokens: int) -> str:
+    """Prompt for one section, written against the shared outline"""
+    return f"""
+        You are writing one section of an academic paper on: "{research_topic}"
+        
+        The full paper follows this outline:
+        {outline}
+        
+        Write only the "{section}" section, following its bullet points in the outline
+        and staying consistent with the rest of the plan. Use a formal academic style.
+        Do not repeat the section heading and do not write any other section.
+        Keep it under {int(max_tokens * 0.75)} words.
+        """
+
+
+def section_token_budgets(max_tokens: int) -> Dict[str, int]:
+    """Split a draft's token budget across its sections"""
+    return {section: max(MIN_SECTION_TOKENS, int(max_tokens * share)) for section, share in DRAFT_SECTIONS.items()}
+
+
+def _complete(client: LLMClient, prompt: str, max_tokens: int) -> str:
+    """One non-streaming completion with the draft system prompt"""
+    return client.chat(
+        messages=[{"role": "system", "content": DRAFT_SYSTEM_PROMPT},
+                  {"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        temperature=DRAFT_TEMPERATURE,
+        top_p=1
+    )
+
+
+def _strip_heading(text: str, section: str) -> str:
+    """Drop a leading heading line if the model repeated the section name anyway"""
+    first_line, _, rest = text.partition("\n")
+    if first_line.strip(" #*:").lower() == section.lower():
+        return rest.strip()
+    return text
+
+
+def _stream_sections(research_topic: str, max_tokens: int) -> Iterator[str]:
+    """Stream the outline-then-parallel-sections draft; returns True if every section succeeded"""
+    client = get_llm_client()
+    if not client.is_configured:
+        raise RuntimeError(MISSING_API_KEY_MESSAGE)
+    outline = _complete(client, build_outline_prompt(research_topic), OUTLINE_MAX_TOKENS)
+    
+    title_line = outline.splitlines()[0] if outline else ""
+    title = title_line.split(":", 1)[1].strip() if title_line.lower().startswith("title:") else research_topic
+    yield f"# {title}\n\n"
+    
+    complete = True
+    budgets = section_token_budgets(max_tokens)
+    with ThreadPoolExecutor(max_workers=len(DRAFT_SECTIONS), thread_name_prefix="draft-section") as pool:
+        futures = {
+            section: pool.submit(_complete, client, build_section_prompt(research_topic, outline, section, budget),
+                                 budget)
+            for section, budget in budgets.items()
+        }
+        for section, future in futures.items():
+            try:
+                text = _strip_heading(future.result(), section)
+            except Exception as e:
+                text = f"*This section could not be generated: {e}*"
+                complete = False
+            yield f"## {section}\n\n{text}\n\n"
+    return complete
+
+
+def stream_sectioned_academic_draft(research_topic: str, max_tokens: int = 2000,
+                                    use_cache: bool = True, similar_topics: bool = False) -> Iterator[str]:
+    """
+    Generate an academic draft section by section in parallel, yielding it in order
+    
+    The title and outline are planned in one completion; every section is then
+    requested concurrently with the outline as shared context and its own share of
+    max_tokens as a hard limit. Sections are yielded in document order as soon as
+    they and all sections before them are done, so the draft takes about as long as
+    the outline plus the slowest section.
+    
+    Args:
+        research_topic (str): The main research topic for the draft
+        max_tokens (int, optional): Token budget for the whole draft, split across sections
+        use_cache (bool, optional): Serve a cached draft for the same topic
+        similar_topics (bool, optional): Also serve a draft cached for a reworded topic
+    
+    Yields:
+        str: The title, then each section with its heading; nothing if planning fails
+    """
+    return _cached_stream(_stream_sections, SECTIONED_PROMPT_VERSION, research_topic, max_tokens, use_cache,
+                          similar_topics)
+
+
+def generate_sectioned_academic_draft(research_topic: str, max_tokens: int = 2000, use_cache: bool = True,
+                                      similar_topics: bool = False) -> str:
+    """
+    Generate an academic draft with its sections written in parallel
+    
+    Args:
+        research_topic (str): The main research topic for the draft
+        max_tokens (int, optional): Token budget for the whole draft, split across sections
+        use_cache (bool, optional): Serve a cached draft for the same topic
+        similar_topics (bool, optional): Also serve a draft cached for a reworded topic
+    
+    Returns:
+        Optional[str]: Stitched academic draft or None if generation fails
+    """
+    generated_draft = "".join(stream_sectioned_academic_draft(research_topic, max_tokens, use_cache,
+                                                              similar_topics)).strip()
+    return generated_draft or None
+
 
 def handle_download(generated_draft: str, format_choice: str):
-    """Handle file download for the selected format"""
-    if generated_draft:
-        if format_choice == "TXT":
-            file_path = "draft.txt"
-            with open(file_path, "w") as f:
-                f.write(generated_draft)
-            with open(file_path, "rb") as f:
-                st.download_button("Download as TXT", f, file_name="draft.txt", mime="text/plain")
-
-        elif format_choice == "DOCX":
-            file_path = "draft.docx"
-            doc = docx.Document()
-            doc.add_paragraph(generated_draft)
-            doc.save(file_path)
-            with open(file_path, "rb") as f:
-                st.download_button("Download as DOCX", f, file_name="draft.docx", mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-
-        elif format_choice == "PDF":
-            file_path = "draft.pdf"
-            pdfkit.from_string(generated_draft, file_path)
-            with open(file_path, "rb") as f:
-                st.download_button("Download as PDF", f, file_name="draft.pdf", mime="application/pdf")
-
-    else:
+    """
+    Offer the draft for download in the selected format.
+    
+    Documents are built in memory and memoized by content hash and format, so
+    Streamlit reruns with an unchanged draft rebuild nothing and write no files.
+    """
+    if not generated_draft:
         st.error("Please generate a draft first by entering a research topic.")
+        return
+
+    try:
+        data = export_bytes(generated_draft, format_choice)
+    except Exception as e:
+        st.error(f"Error exporting draft as {format_choice}: {e}")
+        return
+    extension, mime = EXPORT_FORMATS[format_choice]
+    st.download_button(f"Download as {format_choice}", data, file_name=f"draft.{extension}", mime=mime)
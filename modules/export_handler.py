@@ -3,75 +3,466 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.utils import simpleSplit
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Tuple, Union
+import hashlib
+import multiprocessing
 import os
 import io
+import re
+import threading
+import zipfile
 
-def export_document(draft_content, research_topic):
+# Download format -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "TXT": ("txt", "text/plain"),
+    "DOCX": ("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "PDF": ("pdf", "application/pdf")
+}
+
+
+def clean_text(draft_content) -> str:
+    """Coerce a draft to a string, replacing characters that cannot be encoded"""
+    return str(draft_content).encode('utf-8', errors='replace').decode('utf-8')
+
+
+def build_txt(draft_content: str) -> bytes:
+    """Render a draft as UTF-8 text"""
+    return clean_text(draft_content).encode('utf-8')
+
+
+# Draft structure: markdown headings, lines that are entirely bold, numbered
+# lines ("1. Introduction", "2. Participants were recruited"), and bullets
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*)$")
+BOLD_LINE_PATTERN = re.compile(r"^\*\*(.+?)\*\*:?$")
+NUMBERED_PATTERN = re.compile(r"^(\d+(?:\.\d+)*\.?)\s+(.+)$")
+BULLET_PATTERN = re.compile(r"^[-*\u2022]\s+(.*)$")
+
+# Sections the draft prompts ask for (DRAFT_SECTIONS in modules.draft_generator,
+# which imports this module, plus the title). A numbered line is a heading only
+# when it names one of them; any other numbered line is a list item.
+SECTION_NAMES = frozenset(name.lower() for name in (
+    "Title", "Abstract", "Introduction", "Literature Review", "Methodology",
+    "Results and Discussion", "Conclusion", "Potential Future Research Directions"
+))
+
+
+def iter_lines(text: str) -> Iterator[str]:
+    """Lines of a string as slices, without building a list or another copy of the text"""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+        yield text[start:end]
+        start = end + 1
+
+
+def iter_blocks(draft_content: str) -> Iterator[Tuple[str, int, str]]:
     """
-    Export the academic draft to DOCX and PDF formats
-    
-    Args:
-        draft_content (str): Content of the academic draft
-        research_topic (str): Research topic for file naming
-    
-    Returns:
-        dict: Paths to exported files
+    Split a draft into blocks, one per non-blank line, cleaning each line as it goes.
+
+    Yields:
+        Tuple[str, int, str]: ("heading", level, text), ("bullet", 0, text),
+        ("numbered", 0, text) with the number kept in the text, or ("paragraph", 0, text)
     """
-    # Ensure export directory exists
-    export_dir = os.path.join(os.getcwd(), 'exports')
-    os.makedirs(export_dir, exist_ok=True)
+    for line in iter_lines(str(draft_content)):
+        line = clean_text(line).strip()
+        if not line:
+            continue
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            yield "heading", len(heading.group(1)), heading.group(2).strip(" *:")
+            continue
+        bold = BOLD_LINE_PATTERN.match(line)
+        if bold:
+            yield "heading", 2, bold.group(1).strip(" :")
+            continue
+        numbered = NUMBERED_PATTERN.match(line)
+        if numbered:
+            # "1. Title: A Study of ..." names its section before the colon
+            name = numbered.group(2).split(":", 1)[0].strip(" *")
+            if name.lower() in SECTION_NAMES:
+                yield "heading", numbered.group(1).rstrip(".").count(".") + 2, line.replace("**", "").rstrip(":")
+            else:
+                yield "numbered", 0, line
+            continue
+        bullet = BULLET_PATTERN.match(line)
+        if bullet:
+            yield "bullet", 0, bullet.group(1)
+        else:
+            yield "paragraph", 0, line
 
-    # Sanitize filename
-    safe_filename = "".join(
-        c for c in research_topic 
-        if c.isalnum() or c in (' ', '_')
-    ).rstrip()
 
-    # Export to DOCX
-    docx_path = os.path.join(export_dir, f"{safe_filename}_draft.docx")
+DOCX_LIST_STYLES = {"bullet": "List Bullet", "numbered": "List Paragraph"}
+
+
+def build_docx(draft_content: str) -> bytes:
+    """Render a draft as a DOCX document in memory, with headings from its section structure"""
     doc = docx.Document()
-    
+
     # Handle potential encoding issues
     try:
-        # Ensure draft_content is a string and clean any problematic characters
-        draft_content = str(draft_content).encode('utf-8', errors='replace').decode('utf-8')
-        doc.add_paragraph(draft_content)
+        for kind, level, text in iter_blocks(draft_content):
+            if kind == "heading":
+                doc.add_heading(text, level=min(level, 4))
+                continue
+            # Numbered items keep their own numbers rather than Word's list numbering,
+            # which would carry on from one list to the next
+            paragraph = doc.add_paragraph(style=DOCX_LIST_STYLES.get(kind))
+            # Inline **bold** spans alternate with plain text
+            for index, span in enumerate(text.split("**")):
+                if span:
+                    paragraph.add_run(span).bold = index % 2 == 1
     except Exception as e:
         print(f"Error adding paragraph to DOCX: {e}")
         doc.add_paragraph("Error generating draft content")
-    
-    doc.save(docx_path)
-
-    # Export to PDF
-    pdf_path = os.path.join(export_dir, f"{safe_filename}_draft.pdf")
-    
-    # Register a font to handle potential encoding issues
-    pdfmetrics.registerFont(TTFont('Arial', 'Arial.ttf'))
-    
-    c = canvas.Canvas(pdf_path, pagesize=letter)
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+# (regular, bold) TrueType fonts tried in order; PDF_FONT_PATH and PDF_BOLD_FONT_PATH take precedence
+PDF_FONT_CANDIDATES = (
+    ("Arial.ttf", "Arial Bold.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    ("/Library/Fonts/Arial Unicode.ttf", None),
+    ("C:\\Windows\\Fonts\\arial.ttf", "C:\\Windows\\Fonts\\arialbd.ttf")
+)
+PDF_MARGIN = 54
+PDF_BODY_SIZE = 11
+PDF_HEADING_SIZES = {1: 16, 2: 13}
+PDF_LEADING = 1.4
+
+
+@lru_cache(maxsize=None)
+def pdf_fonts() -> Tuple[str, str]:
+    """
+    Register the PDF fonts once per process and return their (regular, bold) names.
+
+    A TrueType font covers non-Latin characters; without one, the built-in
+    Helvetica is used.
+    """
+    candidates = PDF_FONT_CANDIDATES
+    if os.getenv('PDF_FONT_PATH'):
+        candidates = ((os.getenv('PDF_FONT_PATH'), os.getenv('PDF_BOLD_FONT_PATH')),) + candidates
+    for regular, bold in candidates:
+        try:
+            pdfmetrics.registerFont(TTFont('DraftSans', regular))
+        except Exception:
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont('DraftSans-Bold', bold))
+            return 'DraftSans', 'DraftSans-Bold'
+        except Exception:
+            return 'DraftSans', 'DraftSans'
+    return 'Helvetica', 'Helvetica-Bold'
+
+
+def build_pdf(draft_content: str) -> bytes:
+    """
+    Render a draft as a paginated PDF document in memory.
+
+    Blocks are wrapped to the page width and laid out line by line; each page is
+    finished (and compressed) as soon as it is full, so only the current page is
+    held uncompressed whatever the length of the draft.
+    """
+    regular, bold = pdf_fonts()
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=letter, pageCompression=1)
     width, height = letter
-    
-    # Set font and prepare text
-    c.setFont('Arial', 12)
-    text_object = c.beginText(50, height - 50)
-    
+    text_width = width - 2 * PDF_MARGIN
+    y = height - PDF_MARGIN
+
+    def write_lines(lines, font, size, indent=0.0, space_before=0.0):
+        nonlocal y
+        leading = size * PDF_LEADING
+        y -= space_before
+        for line in lines:
+            if y - leading < PDF_MARGIN:
+                c.showPage()
+                y = height - PDF_MARGIN
+            y -= leading
+            c.setFont(font, size)
+            c.drawString(PDF_MARGIN + indent, y, line)
+
     # Handle potential encoding issues when writing to PDF
     try:
-        # Split content into lines, handling potential encoding problems
-        lines = draft_content.split('\n')
-        for line in lines:
-            # Encode and decode to handle potential problematic characters
-            clean_line = line.encode('utf-8', errors='replace').decode('utf-8')
-            text_object.textLine(clean_line)
+        for kind, level, text in iter_blocks(draft_content):
+            text = text.replace("**", "")
+            if kind == "heading":
+                size = PDF_HEADING_SIZES.get(level, PDF_BODY_SIZE + 1)
+                # Keep a heading with at least two lines of the text below it
+                if y - size * PDF_LEADING - 2 * PDF_BODY_SIZE * PDF_LEADING < PDF_MARGIN:
+                    c.showPage()
+                    y = height - PDF_MARGIN
+                write_lines(simpleSplit(text, bold, size, text_width), bold, size, space_before=size * 0.6)
+            elif kind == "bullet":
+                lines = simpleSplit(text, regular, PDF_BODY_SIZE, text_width - 14) or [""]
+                write_lines(lines[:1], regular, PDF_BODY_SIZE, indent=14, space_before=2)
+                c.drawString(PDF_MARGIN + 4, y, "\u2022")
+                write_lines(lines[1:], regular, PDF_BODY_SIZE, indent=14)
+            elif kind == "numbered":
+                # Stripping bold markers can leave a number with nothing after it ("2. **")
+                number, item = (text.split(None, 1) + [""])[:2]
+                indent = max(14.0, pdfmetrics.stringWidth(number + " ", regular, PDF_BODY_SIZE) + 4)
+                lines = simpleSplit(item, regular, PDF_BODY_SIZE, text_width - indent) or [""]
+                write_lines(lines[:1], regular, PDF_BODY_SIZE, indent=indent, space_before=2)
+                c.drawString(PDF_MARGIN + 4, y, number)
+                write_lines(lines[1:], regular, PDF_BODY_SIZE, indent=indent)
+            else:
+                write_lines(simpleSplit(text, regular, PDF_BODY_SIZE, text_width), regular, PDF_BODY_SIZE,
+                            space_before=PDF_BODY_SIZE * 0.5)
     except Exception as e:
         print(f"Error writing PDF content: {e}")
-        text_object.textLine("Error generating draft content")
-    
-    c.drawText(text_object)
+        write_lines(["Error generating draft content"], regular, PDF_BODY_SIZE)
+
     c.showPage()
     c.save()
+    return buffer.getvalue()
+
+
+BUILDERS = {
+    "TXT": build_txt,
+    "DOCX": build_docx,
+    "PDF": build_pdf
+}
+
+
+class ExportCache:
+    """
+    In-memory LRU cache of rendered documents, keyed by content hash and format.
+
+    Streamlit reruns the whole script on every interaction, so the download button
+    asks for the same document over and over; only the first request for a given
+    draft and format builds it. Entries are evicted least recently used first once
+    the cached documents exceed max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Total size of cached documents before eviction
+        """
+        self.max_bytes = max_bytes
+        self._documents = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "builds": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(draft_content: str, format_choice: str):
+        return hashlib.sha256(draft_content.encode('utf-8', errors='replace')).hexdigest(), format_choice
+
+    def get_or_build(self, draft_content: str, format_choice: str) -> bytes:
+        """
+        Return the rendered document, building it on a miss.
+
+        Raises:
+            ValueError: If the format is not one of EXPORT_FORMATS
+        """
+        if format_choice not in BUILDERS:
+            raise ValueError(f"Unsupported export format: {format_choice}")
+        key = self.make_key(draft_content, format_choice)
+        with self._lock:
+            data = self._documents.get(key)
+            if data is not None:
+                self._documents.move_to_end(key)
+                self._stats["hits"] += 1
+                return data
+
+        # Build outside the lock so one slow document does not block other sessions
+        data = BUILDERS[format_choice](draft_content)
+        with self._lock:
+            self._stats["builds"] += 1
+            if key not in self._documents:
+                self._documents[key] = data
+                self._size += len(data)
+                self._evict()
+        return data
+
+    def _evict(self):
+        """Drop least recently used documents until the total size fits (lock held)"""
+        while self._size > self.max_bytes and len(self._documents) > 1:
+            _, data = self._documents.popitem(last=False)
+            self._size -= len(data)
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._size = 0
+
+    def stats(self):
+        """Return hit/build counters and the cached size"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._documents)
+            stats["bytes"] = self._size
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_export_cache() -> ExportCache:
+    """Return the process-wide export cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ExportCache()
+        return _default_cache
+
+
+def export_bytes(draft_content: str, format_choice: str) -> bytes:
+    """
+    Render a draft in a download format, memoized by content hash and format
+
+    Args:
+        draft_content (str): Content of the academic draft
+        format_choice (str): One of EXPORT_FORMATS ("TXT", "DOCX", "PDF")
+
+    Returns:
+        bytes: The document
+    """
+    return get_export_cache().get_or_build(draft_content, format_choice)
+
+
+def safe_filename(research_topic: str) -> str:
+    """Reduce a topic to letters, digits, spaces and underscores for use in a file name"""
+    return "".join(
+        c for c in research_topic
+        if c.isalnum() or c in (' ', '_')
+    ).rstrip()
+
+
+def export_document(draft_content, research_topic):
+    """
+    Export the academic draft to DOCX and PDF formats
+
+    Args:
+        draft_content (str): Content of the academic draft
+        research_topic (str): Research topic for file naming
+
+    Returns:
+        dict: Paths to exported files
+    """
+    # Ensure export directory exists
+    export_dir = os.path.join(os.getcwd(), 'exports')
+    os.makedirs(export_dir, exist_ok=True)
+
+    draft_content = clean_text(draft_content)
+    paths = {}
+    for format_choice in ("DOCX", "PDF"):
+        extension, _ = EXPORT_FORMATS[format_choice]
+        path = os.path.join(export_dir, f"{safe_filename(research_topic)}_draft.{extension}")
+        with open(path, "wb") as f:
+            f.write(export_bytes(draft_content, format_choice))
+        paths[f"{extension}_path"] = path
+
+    return paths
+
+
+def _render_export(job: Tuple[str, str, Sequence[str]]) -> List[Tuple[str, bytes]]:
+    """Worker: render one draft in each format, returning (archive name, document) pairs"""
+    base_name, draft_content, formats = job
+    return [(f"{base_name}.{EXPORT_FORMATS[format_choice][0]}", BUILDERS[format_choice](draft_content))
+            for format_choice in formats]
+
+
+def _archive_jobs(drafts: Iterable[Tuple[str, str]], formats: Sequence[str]) -> Iterator[Tuple[str, str, Sequence[str]]]:
+    """One render job per draft, with file names made unique within the archive"""
+    seen = {}
+    for research_topic, draft_content in drafts:
+        base_name = f"{safe_filename(research_topic)}_draft" if safe_filename(research_topic) else "draft"
+        seen[base_name] = seen.get(base_name, 0) + 1
+        if seen[base_name] > 1:
+            base_name = f"{base_name}_{seen[base_name]}"
+        yield base_name, draft_content, formats
+
+
+_export_pool = None
+_export_pool_lock = threading.Lock()
+
+
+def get_export_pool(max_workers: int = None) -> ProcessPoolExecutor:
+    """
+    Return the process-wide export worker pool, creating it on first use.
+
+    Workers are spawned rather than forked, since the app server is multithreaded,
+    and are kept for later exports so their imports and font registration are paid once.
+    EXPORT_WORKERS overrides the worker count (default: one per CPU).
+    """
+    global _export_pool
+    with _export_pool_lock:
+        if _export_pool is None:
+            workers = max_workers or int(os.getenv('EXPORT_WORKERS', 0)) or os.cpu_count() or 1
+            _export_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _export_pool
+
+
+def _pool_workers(pool: ProcessPoolExecutor) -> int:
+    """Worker count of a pool, whether it came from get_export_pool or the caller"""
+    # ProcessPoolExecutor has no public accessor for its size
+    return getattr(pool, "_max_workers", None) or os.cpu_count() or 1
+
+
+def export_zip(drafts: Iterable[Tuple[str, str]], output: Union[str, BinaryIO], formats: Sequence[str] = ("DOCX", "PDF"),
+               pool: ProcessPoolExecutor = None, max_in_flight: int = None) -> int:
+    """
+    Export many drafts into one ZIP archive, rendering them in a process pool
+
+    Documents are written into the archive as they finish, with no temporary
+    files, and at most max_in_flight drafts are being rendered or waiting to be
+    written at once, so memory is bounded by that window rather than the batch.
+
+    Args:
+        drafts (Iterable[Tuple[str, str]]): (research topic, draft content) pairs
+        output (str or file object): Path or writable binary stream for the archive
+        formats (Sequence[str]): Formats to render each draft in, from EXPORT_FORMATS
+        pool (ProcessPoolExecutor, optional): Worker pool (default: get_export_pool());
+            None with a single draft renders it in this process
+        max_in_flight (int, optional): Drafts submitted at once (default: twice the workers)
+
+    Returns:
+        int: Number of documents written
+    """
+    unsupported = [format_choice for format_choice in formats if format_choice not in BUILDERS]
+    if unsupported:
+        raise ValueError(f"Unsupported export format: {', '.join(unsupported)}")
+
+    jobs = _archive_jobs(drafts, tuple(formats))
+    written = 0
+    with zipfile.ZipFile(output, "w") as archive:
+        def add(documents):
+            nonlocal written
+            for name, data in documents:
+                # DOCX and PDF are compressed already; deflating them again only costs time
+                compression = zipfile.ZIP_DEFLATED if name.endswith(".txt") else zipfile.ZIP_STORED
+                archive.writestr(name, data, compress_type=compression)
+                written += 1
+
+        first_jobs = list(islice(jobs, 2))
+        if pool is None and len(first_jobs) < 2:
+            for job in first_jobs:
+                add(_render_export(job))
+            return written
 
-    return {
-        'docx_path': docx_path,
-        'pdf_path': pdf_path
-    }
+        pool = pool or get_export_pool()
+        window = max_in_flight or 2 * _pool_workers(pool)
+        pending = {pool.submit(_render_export, job) for job in first_jobs}
+        pending |= {pool.submit(_render_export, job) for job in islice(jobs, max(0, window - len(pending)))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                add(future.result())
+            pending |= {pool.submit(_render_export, job) for job in islice(jobs, len(done))}
+    return written
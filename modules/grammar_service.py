@@ -0,0 +1,330 @@
+"""
+Process-wide grammar checking backed by a bounded pool of LanguageTool workers.
+
+Every LanguageTool instance runs its own Java server using hundreds of MB, so
+instead of one per Streamlit session, all sessions share a fixed number of
+workers that take checks from a bounded request queue. Several app replicas
+on one host can share a single pool by running it out of process:
+
+    python -m modules.grammar_service --port 8082 --workers 2
+
+and setting GRAMMAR_SERVER_URL=http://127.0.0.1:8082 for each replica.
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds the remote client waits beyond the service's own queue and check timeouts
+REMOTE_TIMEOUT_MARGIN = 5.0
+
+
+class GrammarServiceBusy(Exception):
+    """Raised when the request queue is full"""
+
+
+class GrammarServiceTimeout(Exception):
+    """Raised when a check does not finish within the service's timeout"""
+
+
+def match_to_issue(match, text: str) -> Dict[str, Any]:
+    """Convert a LanguageTool match into a plain, JSON-serializable issue"""
+    return {
+        'message': match.message,
+        'context': match.context,
+        'offset': match.offset,
+        'length': match.errorLength,
+        'category': match.category,
+        'incorrect': text[match.offset:match.offset + match.errorLength],
+        'suggestions': match.replacements[:3] if match.replacements else []
+    }
+
+
+class GrammarService:
+    """
+    Thread-safe grammar checker shared by every session in a process.
+
+    Locally, up to `workers` threads each own one LanguageTool instance, started on
+    the first check, and serve checks from a queue of at most `max_queue` waiting
+    requests; a check that finds the queue full waits up to queue_timeout seconds
+    for room, then raises GrammarServiceBusy rather than piling up work.
+    With a server_url, checks are sent to a grammar service running out of process.
+    """
+
+    def __init__(self, language: str = 'en-US', workers: int = 1, max_queue: int = 32,
+                 server_url: Optional[str] = None, timeout: float = 60.0, queue_timeout: float = 5.0,
+                 restart_after: float = 60.0):
+        """
+        Initialize the service; no worker is started until the first check.
+
+        Args:
+            language (str): LanguageTool language code
+            workers (int): LanguageTool instances (and so Java servers) to run at most
+            max_queue (int): Checks allowed to wait for a free worker
+            server_url (str, optional): Base URL of an out-of-process grammar service; its
+                timeout and queue_timeout are assumed to match this service's
+            timeout (float): Seconds a check may wait and run before giving up
+            queue_timeout (float): Seconds to wait for room in a full queue
+            restart_after (float): Seconds before retrying workers that failed to start
+        """
+        self.language = language
+        self.workers = max(1, workers)
+        self.server_url = server_url.rstrip('/') if server_url else None
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.restart_after = restart_after
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._start_error = None
+        self._failed_at = 0.0
+        self._stats = {"checks": 0, "rejected": 0, "errors": 0, "timeouts": 0}
+        self._http = None
+        if self.server_url:
+            # Imported here so in-process use and the analyzer import skip requests entirely
+            from modules.http_client import HostSessionPool
+
+            # No retries: a busy or timed-out service answers 503/504, which is reported once
+            # instead of sending more copies of the check to an overloaded server. The read
+            # timeout leaves the server time to give up first (queue wait plus check timeout)
+            self._http = HostSessionPool(read_timeout=queue_timeout + timeout + REMOTE_TIMEOUT_MARGIN,
+                                         max_retries=0)
+
+    def check(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Check the grammar of a text.
+
+        Returns:
+            List[Dict]: Grammar issues with their suggestions
+
+        Raises:
+            GrammarServiceBusy: If the queue stays full for queue_timeout seconds
+            GrammarServiceTimeout: If the check does not finish within timeout seconds
+            RuntimeError: If LanguageTool could not be started
+        """
+        if self.server_url:
+            return self._check_remote(text)
+
+        self._ensure_workers()
+        future = Future()
+        try:
+            self._queue.put((text, future), timeout=self.queue_timeout)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise GrammarServiceBusy("The grammar checker is busy; please try again in a moment.")
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Drop the check if no worker has started it yet, so nobody runs it for nothing
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise GrammarServiceTimeout(f"The grammar check did not finish within {self.timeout:g} seconds.")
+
+    def _check_remote(self, text: str) -> List[Dict[str, Any]]:
+        import requests
+
+        try:
+            response = self._http.post(f"{self.server_url}/check", json={"text": text})
+        except requests.Timeout:
+            raise GrammarServiceTimeout(f"The grammar service did not answer within {self.timeout:g} seconds.")
+        if response.status_code == 503:
+            raise GrammarServiceBusy(response.json().get("error", "The grammar checker is busy."))
+        if response.status_code == 504:
+            raise GrammarServiceTimeout(response.json().get("error", "The grammar check timed out."))
+        if response.status_code != 200:
+            raise RuntimeError(response.json().get("error", f"Grammar service returned {response.status_code}"))
+        return response.json()["issues"]
+
+    def _ensure_workers(self):
+        """Start missing workers, unless they recently failed to start"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            if self._start_error is not None:
+                if time.monotonic() - self._failed_at < self.restart_after:
+                    if not self._threads:
+                        raise RuntimeError(f"LanguageTool is unavailable: {self._start_error}")
+                    return
+                self._start_error = None
+            for _ in range(self.workers - len(self._threads)):
+                thread = threading.Thread(target=self._work, name="grammar-worker", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        """Worker loop: own one LanguageTool and serve queued checks until closed"""
+        try:
+            import language_tool_python
+            tool = language_tool_python.LanguageTool(self.language)
+        except Exception as e:
+            logger.warning(f"Failed to initialize language tool: {e}")
+            with self._lock:
+                self._start_error = e
+                self._failed_at = time.monotonic()
+                self._threads = [thread for thread in self._threads if thread is not threading.current_thread()]
+                last_worker = not self._threads
+            if last_worker:
+                self._fail_queued(e)
+            return
+
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                text, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result([match_to_issue(match, text) for match in tool.check(text)])
+                    with self._lock:
+                        self._stats["checks"] += 1
+                except Exception as e:
+                    with self._lock:
+                        self._stats["errors"] += 1
+                    future.set_exception(e)
+        finally:
+            tool.close()
+
+    def _fail_queued(self, error: Exception):
+        """Fail every waiting check once no worker is left to serve it"""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None and item[1].set_running_or_notify_cancel():
+                item[1].set_exception(RuntimeError(f"LanguageTool is unavailable: {error}"))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters, the number of running workers and the queue length"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["workers"] = sum(thread.is_alive() for thread in self._threads)
+        stats["queued"] = self._queue.qsize()
+        stats["mode"] = "remote" if self.server_url else "local"
+        return stats
+
+    def close(self):
+        """Stop the workers and their LanguageTool servers"""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout=10)
+        if self._http:
+            self._http.close()
+
+
+_default_service = None
+_default_service_lock = threading.Lock()
+
+
+def get_grammar_service() -> GrammarService:
+    """
+    Return the process-wide grammar service, configured from the environment.
+
+    GRAMMAR_SERVER_URL points every check at an out-of-process service; otherwise
+    GRAMMAR_WORKERS (default 1) LanguageTool instances run in this process with
+    up to GRAMMAR_QUEUE_SIZE (default 32) checks waiting.
+    """
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = GrammarService(
+                workers=int(os.getenv('GRAMMAR_WORKERS', 1)),
+                max_queue=int(os.getenv('GRAMMAR_QUEUE_SIZE', 32)),
+                server_url=os.getenv('GRAMMAR_SERVER_URL') or None
+            )
+        return _default_service
+
+
+def make_handler(service: GrammarService):
+    """HTTP handler exposing a service: POST /check {"text": ...} and GET /health"""
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self.send_json(200, service.stats())
+            else:
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length)
+            if self.path != "/check":
+                self.send_json(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                text = json.loads(body)["text"]
+            except (ValueError, KeyError, TypeError):
+                self.send_json(400, {"error": "Expected a JSON object with a \"text\""})
+                return
+            try:
+                self.send_json(200, {"issues": service.check(text)})
+            except GrammarServiceBusy as e:
+                self.send_json(503, {"error": str(e)}, headers={"Retry-After": "1"})
+            except GrammarServiceTimeout as e:
+                self.send_json(504, {"error": str(e)})
+            except Exception as e:
+                self.send_json(500, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    """Command-line entry point: serve a grammar service for app replicas on this host"""
+    from http.server import ThreadingHTTPServer
+
+    parser = argparse.ArgumentParser(description="Serve a shared pool of LanguageTool workers over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--language", default="en-US")
+    parser.add_argument("--workers", type=int, default=2, help="LanguageTool instances to run")
+    parser.add_argument("--max-queue", type=int, default=64, help="Checks allowed to wait for a worker")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    service = GrammarService(language=args.language, workers=args.workers, max_queue=args.max_queue)
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    httpd.daemon_threads = True
+    logger.info(f"Grammar service on http://{args.host}:{args.port} ({args.workers} workers); "
+                f"set GRAMMAR_SERVER_URL to this address in each app replica")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes worth retrying: rate limiting and transient server-side failures
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostSessionPool:
+    """
+    Keeps one pooled requests.Session per host and retries transient failures.
+
+    Reusing a session per host keeps TCP/TLS connections alive between searches,
+    every request gets a (connect, read) timeout so a dead socket cannot hang a
+    worker thread, and the connection pool blocks once max_connections_per_host
+    connections to a host are in use.
+    """
+
+    def __init__(self, connect_timeout: float = 3.05, read_timeout: float = 10.0, max_retries: int = 2,
+                 backoff_base: float = 0.5, backoff_max: float = 8.0, max_connections_per_host: int = 4,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the session pool.
+
+        Args:
+            connect_timeout (float): Seconds to wait for a connection to be established
+            read_timeout (float): Seconds to wait between bytes from the server
+            max_retries (int): Retries after the first attempt on 429/5xx or connection errors
+            backoff_base (float): Base delay in seconds for exponential backoff
+            backoff_max (float): Upper bound for a single backoff delay in seconds
+            max_connections_per_host (int): Connection pool size per host
+            headers (Dict[str, str], optional): Default headers for every session
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections_per_host = max_connections_per_host
+        self.headers = headers or {}
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        """Return the pooled session for the host of the given URL"""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                # Retries are handled in request() so that backoff can be jittered
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections_per_host,
+                                      pool_block=True, max_retries=0)
+                session.mount(host, adapter)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the host's pooled session, retrying transient failures.
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Passed through to requests.Session.request; timeout defaults to
+                the pool's (connect, read) timeout
+
+        Returns:
+            requests.Response: The last response received; callers check the status code
+
+        Raises:
+            requests.RequestException: If the final attempt fails to connect or times out
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        session = self.get_session(url)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+
+            delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(delay)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Shorthand for request("GET", ...)"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Shorthand for request("POST", ...)"""
+        return self.request("POST", url, **kwargs)
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, honouring a numeric Retry-After header"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def close(self):
+        """Close every pooled session"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
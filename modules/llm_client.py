@@ -0,0 +1,263 @@
+import asyncio
+import importlib
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+# Backend name -> (SDK module, sync client class, async client class, API key variable).
+# Both SDKs share the OpenAI client interface and error types; "openai" also
+# covers any OpenAI-compatible server (vLLM, Ollama, benchmarks.llm_standin)
+# through LLM_BASE_URL.
+BACKENDS = {
+    "groq": ("groq", "Groq", "AsyncGroq", "GROQ_API_KEY"),
+    "openai": ("openai", "OpenAI", "AsyncOpenAI", "OPENAI_API_KEY")
+}
+
+MISSING_API_KEY_MESSAGE = "LLM API key is missing. Please set GROQ_API_KEY (or LLM_API_KEY) in .env file."
+
+# Status codes worth retrying: rate limiting and transient server-side failures
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class LLMClient:
+    """
+    Shared chat-completion client with pooled connections, retries and a concurrency cap.
+
+    One SDK client (and so one HTTP connection pool) is kept for synchronous calls,
+    and one per event loop for asynchronous calls. Rate limiting (429) and transient
+    server or connection errors are retried with full-jitter exponential backoff,
+    honouring Retry-After. At most max_concurrency requests are in flight at once
+    across all threads, which is the single place to control load on the provider.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 backend: str = "groq", model: str = DEFAULT_MODEL, timeout: float = 60.0,
+                 connect_timeout: float = 5.0, max_retries: int = 3, backoff_base: float = 1.0,
+                 backoff_max: float = 20.0, max_concurrency: int = 8):
+        """
+        Initialize the client; SDK clients are created on first use.
+
+        Args:
+            api_key (str, optional): Provider API key
+            base_url (str, optional): Override the provider endpoint
+            backend (str): SDK to talk through, a key of BACKENDS
+            model (str): Model used when a call does not name one
+            timeout (float): Seconds allowed for a whole request (between chunks when streaming)
+            connect_timeout (float): Seconds allowed to open a connection
+            max_retries (int): Retries after the first attempt on 429/5xx or connection errors
+            backoff_base (float): Base delay in seconds for exponential backoff
+            backoff_max (float): Upper bound for a single backoff delay in seconds
+            max_concurrency (int): Requests allowed in flight at once
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown LLM backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+        self.api_key = api_key
+        self.base_url = base_url
+        self.backend = backend
+        self.model = model
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+
+        module, sync_class, async_class, _ = BACKENDS[backend]
+        self._sdk = importlib.import_module(module)
+        self._sync_class = getattr(self._sdk, sync_class)
+        self._async_class = getattr(self._sdk, async_class)
+        self._client = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # Async SDK clients and semaphores are bound to the event loop that created them
+        self._async_state = weakref.WeakKeyDictionary()
+
+    @property
+    def is_configured(self) -> bool:
+        """Whether an API key is available"""
+        return bool(self.api_key)
+
+    def _sdk_kwargs(self) -> Dict:
+        # Retries are handled here so that they share the concurrency cap and backoff policy
+        kwargs = {"api_key": self.api_key, "timeout": self.timeout, "max_retries": 0}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        return kwargs
+
+    def _sync_client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._sync_class(**self._sdk_kwargs())
+            return self._client
+
+    def _async_client(self):
+        """(client, semaphore) for the running event loop"""
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(loop)
+        if state is None:
+            state = (self._async_class(**self._sdk_kwargs()), asyncio.Semaphore(self.max_concurrency))
+            self._async_state[loop] = state
+        return state
+
+    def _request(self, messages: List[Dict], model: Optional[str], max_tokens: int, temperature: float,
+                 stream: bool, params: Dict) -> Dict:
+        return dict(messages=messages, model=model or self.model, max_tokens=max_tokens, temperature=temperature,
+                    stream=stream, **params)
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Backoff before the next attempt, or None if the error should not be retried"""
+        if attempt >= self.max_retries:
+            return None
+        retry_after = None
+        if isinstance(error, self._sdk.APIStatusError):
+            if error.status_code not in RETRY_STATUS_CODES:
+                return None
+            retry_after = error.response.headers.get("retry-after")
+        elif not isinstance(error, self._sdk.APIConnectionError):
+            return None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def chat(self, messages: List[Dict], model: Optional[str] = None, max_tokens: int = 1024,
+             temperature: float = 0.7, **params) -> str:
+        """
+        Run one chat completion and return its text.
+
+        Args:
+            messages (List[Dict]): Chat messages
+            model (str, optional): Model name (default: the client's model)
+            max_tokens (int): Completion token limit
+            temperature (float): Sampling temperature
+            **params: Further completion parameters (top_p, ...)
+
+        Returns:
+            str: The stripped completion text
+        """
+        request = self._request(messages, model, max_tokens, temperature, False, params)
+        with self._slots:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    completion = self._sync_client().chat.completions.create(**request)
+                    return (completion.choices[0].message.content or "").strip()
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    logger.info("LLM request failed (%s), retrying in %.1fs", e, delay)
+                    time.sleep(delay)
+
+    def stream_chat(self, messages: List[Dict], model: Optional[str] = None, max_tokens: int = 1024,
+                    temperature: float = 0.7, **params) -> Iterator[str]:
+        """
+        Run one chat completion, yielding text as it arrives.
+
+        Failures are retried only until the first piece of text has been yielded;
+        the concurrency slot is held until the stream is exhausted or closed.
+
+        Yields:
+            str: Successive pieces of the completion
+        """
+        request = self._request(messages, model, max_tokens, temperature, True, params)
+        with self._slots:
+            for attempt in range(self.max_retries + 1):
+                started = False
+                try:
+                    for chunk in self._sync_client().chat.completions.create(**request):
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            started = True
+                            yield chunk.choices[0].delta.content
+                    return
+                except Exception as e:
+                    delay = None if started else self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    logger.info("LLM stream failed (%s), retrying in %.1fs", e, delay)
+                    time.sleep(delay)
+
+    async def achat(self, messages: List[Dict], model: Optional[str] = None, max_tokens: int = 1024,
+                    temperature: float = 0.7, **params) -> str:
+        """Asynchronous chat(); shares the retry policy and concurrency cap per event loop"""
+        request = self._request(messages, model, max_tokens, temperature, False, params)
+        client, slots = self._async_client()
+        async with slots:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    completion = await client.chat.completions.create(**request)
+                    return (completion.choices[0].message.content or "").strip()
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    logger.info("LLM request failed (%s), retrying in %.1fs", e, delay)
+                    await asyncio.sleep(delay)
+
+    async def astream_chat(self, messages: List[Dict], model: Optional[str] = None, max_tokens: int = 1024,
+                           temperature: float = 0.7, **params) -> AsyncIterator[str]:
+        """Asynchronous stream_chat()"""
+        request = self._request(messages, model, max_tokens, temperature, True, params)
+        client, slots = self._async_client()
+        async with slots:
+            for attempt in range(self.max_retries + 1):
+                started = False
+                try:
+                    async for chunk in await client.chat.completions.create(**request):
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            started = True
+                            yield chunk.choices[0].delta.content
+                    return
+                except Exception as e:
+                    delay = None if started else self._retry_delay(e, attempt)
+                    if delay is None:
+                        raise
+                    logger.info("LLM stream failed (%s), retrying in %.1fs", e, delay)
+                    await asyncio.sleep(delay)
+
+    def close(self):
+        """Close the synchronous client's connection pool"""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Return the process-wide LLM client, configured from the environment.
+
+    LLM_BACKEND picks the SDK ("groq" by default, or "openai" for any
+    OpenAI-compatible server), LLM_BASE_URL and LLM_MODEL override its endpoint
+    and model, and LLM_API_KEY its key (falling back to GROQ_API_KEY or
+    OPENAI_API_KEY). LLM_MAX_CONCURRENCY (default 8) and LLM_TIMEOUT (seconds,
+    default 60) tune load and patience.
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            backend = os.getenv('LLM_BACKEND', 'groq').lower()
+            key_variable = BACKENDS[backend][3] if backend in BACKENDS else None
+            _default_client = LLMClient(
+                api_key=os.getenv('LLM_API_KEY') or (key_variable and os.getenv(key_variable)),
+                base_url=os.getenv('LLM_BASE_URL') or None,
+                backend=backend,
+                model=os.getenv('LLM_MODEL') or DEFAULT_MODEL,
+                timeout=float(os.getenv('LLM_TIMEOUT', 60)),
+                max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+            )
+        return _default_client
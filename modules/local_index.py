@@ -0,0 +1,435 @@
+"""
+Offline full-text index over bulk arXiv metadata dumps.
+
+Build an index once from the Kaggle arXiv JSON snapshot (one JSON object per line)
+or from OAI-PMH XML harvests in the arXiv metadata format, optionally gzipped:
+
+    python -m modules.local_index build arxiv-metadata-oai-snapshot.json --out data/arxiv_index
+    python -m modules.local_index search data/arxiv_index "graph neural networks" --limit 5
+
+The index directory holds fixed-width binary tables that are memory-mapped at query
+time, so opening it is instant and lookups only touch the pages they need:
+
+    meta.json      format version and document count
+    docs.jsonl     one compact JSON record per document
+    docs.idx       uint64 byte offsets into docs.jsonl (num_docs + 1 entries)
+    terms.bin      sorted, concatenated UTF-8 terms
+    lexicon.idx    per term: term offset, term length, postings offset, postings count
+    postings.bin   uint32 document ids, ascending within each term
+"""
+import argparse
+import bisect
+import gzip
+import heapq
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from array import array
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from modules.ranking import tokenize
+
+INDEX_FORMAT_VERSION = 1
+LOCAL_INDEX_SOURCE = "arXiv (offline)"
+
+# term offset, term length, postings offset (in ids), postings count
+_LEXICON_ENTRY = struct.Struct("<QIQI")
+_RUN_HEADER = struct.Struct("<HI")
+
+_OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+_ARXIV_NS = "{http://arxiv.org/OAI/arXiv/}"
+
+
+def category_terms(categories: Iterable[str]) -> List[str]:
+    """Index terms for arXiv categories, at both archive ("cs") and full ("cs.lg") level"""
+    terms = set()
+    for category in categories:
+        category = category.lower()
+        terms.add(f"cat:{category}")
+        terms.add(f"cat:{category.split('.')[0]}")
+    return sorted(terms)
+
+
+def _open_dump(path: str):
+    """Open a possibly gzipped dump file in binary mode"""
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _published_from_versions(versions: List[Dict], fallback: str) -> str:
+    """ISO date of the first version in a Kaggle snapshot record"""
+    try:
+        return parsedate_to_datetime(versions[0]["created"]).date().isoformat()
+    except (IndexError, KeyError, TypeError, ValueError):
+        return fallback or ""
+
+
+def iter_json_dump(path: str) -> Iterator[Dict]:
+    """Stream records from a JSON-lines arXiv metadata snapshot"""
+    with _open_dump(path) as dump:
+        for line in dump:
+            line = line.strip()
+            if not line:
+                continue
+            raw = json.loads(line)
+            if raw.get("authors_parsed"):
+                authors = [" ".join(part for part in (name[1], name[0]) if part).strip()
+                           for name in raw["authors_parsed"]]
+            else:
+                authors = [name.strip() for name in (raw.get("authors") or "").split(",") if name.strip()]
+            yield {
+                "id": raw.get("id", ""),
+                "title": " ".join((raw.get("title") or "").split()),
+                "authors": authors,
+                "summary": " ".join((raw.get("abstract") or "").split()),
+                "published": _published_from_versions(raw.get("versions") or [], raw.get("update_date")),
+                "categories": (raw.get("categories") or "").split()
+            }
+
+
+def iter_oai_dump(path: str) -> Iterator[Dict]:
+    """Stream records from an OAI-PMH harvest in the arXiv metadata format"""
+    with _open_dump(path) as dump:
+        root = None
+        for event, element in ET.iterparse(dump, events=("start", "end")):
+            if root is None:
+                root = element
+                continue
+            if event != "end" or element.tag != f"{_OAI_NS}record":
+                continue
+
+            metadata = element.find(f"{_OAI_NS}metadata/{_ARXIV_NS}arXiv")
+            if metadata is not None:
+                def text(tag):
+                    child = metadata.find(f"{_ARXIV_NS}{tag}")
+                    return " ".join(child.text.split()) if child is not None and child.text else ""
+
+                authors = []
+                for author in metadata.findall(f"{_ARXIV_NS}authors/{_ARXIV_NS}author"):
+                    parts = [author.findtext(f"{_ARXIV_NS}forenames") or "",
+                             author.findtext(f"{_ARXIV_NS}keyname") or ""]
+                    authors.append(" ".join(part.strip() for part in parts if part.strip()))
+                yield {
+                    "id": text("id"),
+                    "title": text("title"),
+                    "authors": authors,
+                    "summary": text("abstract"),
+                    "published": text("created"),
+                    "categories": text("categories").split()
+                }
+            root.clear()
+
+
+def iter_dump(path: str) -> Iterator[Dict]:
+    """Stream records from a dump, choosing the parser from the file name"""
+    name = path[:-3] if path.endswith(".gz") else path
+    return iter_oai_dump(path) if name.endswith(".xml") else iter_json_dump(path)
+
+
+def _write_run(segment: Dict[str, array], path: str):
+    """Write one in-memory postings segment to disk, sorted by term"""
+    with open(path, "wb") as run:
+        for term in sorted(segment):
+            encoded = term.encode("utf-8")
+            ids = segment[term]
+            run.write(_RUN_HEADER.pack(len(encoded), len(ids)))
+            run.write(encoded)
+            ids.tofile(run)
+
+
+def _read_run(path: str, run_number: int) -> Iterator:
+    """Yield (term, run number, ids) from a run file in term order"""
+    with open(path, "rb") as run:
+        while True:
+            header = run.read(_RUN_HEADER.size)
+            if not header:
+                return
+            term_length, count = _RUN_HEADER.unpack(header)
+            term = run.read(term_length).decode("utf-8")
+            ids = array("I")
+            ids.fromfile(run, count)
+            yield term, run_number, ids
+
+
+def build_index(dump_paths: List[str], output_dir: str, segment_postings: int = 5_000_000,
+                progress_every: int = 100_000) -> int:
+    """
+    Build a local index from one or more metadata dumps.
+
+    Records are streamed from the dumps; postings are accumulated in memory until
+    segment_postings ids have been collected, spilled to sorted run files and
+    finally k-way merged, so memory stays bounded for dumps of any size.
+
+    Args:
+        dump_paths (List[str]): JSON-lines or OAI-PMH XML dumps, optionally gzipped
+        output_dir (str): Directory to write the index to (created if missing)
+        segment_postings (int): Postings held in memory before spilling a run
+        progress_every (int): Print progress every this many documents (0 to disable)
+
+    Returns:
+        int: Number of indexed documents
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="runs-", dir=output_dir)
+    run_paths = []
+    segment = {}
+    segment_size = 0
+    num_docs = 0
+
+    try:
+        with open(os.path.join(output_dir, "docs.jsonl"), "wb") as docs, \
+                open(os.path.join(output_dir, "docs.idx"), "wb") as offsets:
+            position = 0
+            for path in dump_paths:
+                for record in iter_dump(path):
+                    line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+                    array("Q", [position]).tofile(offsets)
+                    docs.write(line)
+                    position += len(line)
+
+                    terms = set(tokenize(f"{record['title']} {record['summary']}"))
+                    terms.update(category_terms(record["categories"]))
+                    for term in terms:
+                        postings = segment.get(term)
+                        if postings is None:
+                            postings = segment[term] = array("I")
+                        postings.append(num_docs)
+                    segment_size += len(terms)
+                    num_docs += 1
+
+                    if segment_size >= segment_postings:
+                        run_paths.append(os.path.join(work_dir, f"run{len(run_paths)}.bin"))
+                        _write_run(segment, run_paths[-1])
+                        segment, segment_size = {}, 0
+                    if progress_every and num_docs % progress_every == 0:
+                        print(f"Indexed {num_docs} documents", file=sys.stderr)
+            array("Q", [position]).tofile(offsets)
+
+        if segment:
+            run_paths.append(os.path.join(work_dir, f"run{len(run_paths)}.bin"))
+            _write_run(segment, run_paths[-1])
+            segment = {}
+
+        # Runs hold increasing doc ids, so merging equal terms in run order keeps postings sorted
+        runs = [_read_run(path, number) for number, path in enumerate(run_paths)]
+        with open(os.path.join(output_dir, "terms.bin"), "wb") as terms_file, \
+                open(os.path.join(output_dir, "lexicon.idx"), "wb") as lexicon, \
+                open(os.path.join(output_dir, "postings.bin"), "wb") as postings_file:
+            term_offset = 0
+            postings_offset = 0
+            current_term, current_count = None, 0
+
+            def flush():
+                nonlocal term_offset, postings_offset
+                encoded = current_term.encode("utf-8")
+                terms_file.write(encoded)
+                lexicon.write(_LEXICON_ENTRY.pack(term_offset, len(encoded), postings_offset, current_count))
+                term_offset += len(encoded)
+                postings_offset += current_count
+
+            for term, _, ids in heapq.merge(*runs, key=lambda item: (item[0], item[1])):
+                if term != current_term:
+                    if current_term is not None:
+                        flush()
+                    current_term, current_count = term, 0
+                ids.tofile(postings_file)
+                current_count += len(ids)
+            if current_term is not None:
+                flush()
+
+        with open(os.path.join(output_dir, "meta.json"), "w") as meta:
+            json.dump({"version": INDEX_FORMAT_VERSION, "num_docs": num_docs, "byteorder": sys.byteorder}, meta)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return num_docs
+
+
+class LocalPublicationIndex:
+    """
+    Read-only, memory-mapped view of an index built by build_index.
+    """
+
+    def __init__(self, index_dir: str):
+        """
+        Open an index directory.
+
+        Args:
+            index_dir (str): Directory written by build_index
+        """
+        with open(os.path.join(index_dir, "meta.json")) as meta_file:
+            meta = json.load(meta_file)
+        if meta.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported local index version: {meta.get('version')}")
+        if meta.get("byteorder") != sys.byteorder:
+            raise ValueError("Local index was built on a machine with a different byte order")
+
+        self.index_dir = index_dir
+        self.num_docs = meta["num_docs"]
+        self._files = []
+        self._docs = self._map("docs.jsonl")
+        self._doc_offsets = memoryview(self._map("docs.idx")).cast("Q")
+        self._terms = self._map("terms.bin")
+        self._lexicon = self._map("lexicon.idx")
+        self._postings = memoryview(self._map("postings.bin")).cast("I")
+        self.num_terms = len(self._lexicon) // _LEXICON_ENTRY.size
+
+    def _map(self, name: str):
+        """Memory-map a file of the index read-only (empty files map to b"")"""
+        handle = open(os.path.join(self.index_dir, name), "rb")
+        self._files.append(handle)
+        if os.fstat(handle.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _term_at(self, position: int):
+        """Lexicon entry (term bytes, postings offset, count) at a position"""
+        term_offset, term_length, postings_offset, count = _LEXICON_ENTRY.unpack_from(
+            self._lexicon, position * _LEXICON_ENTRY.size)
+        return self._terms[term_offset:term_offset + term_length], postings_offset, count
+
+    def postings(self, term: str):
+        """Ascending document ids containing the term, as a zero-copy memoryview"""
+        target = term.encode("utf-8")
+        low, high = 0, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_at(middle)[0] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.num_terms:
+            found, offset, count = self._term_at(low)
+            if found == target:
+                return self._postings[offset:offset + count]
+        return self._postings[0:0]
+
+    def document(self, doc_id: int) -> Dict:
+        """Load one stored record"""
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        return json.loads(self._docs[start:end])
+
+    def search(self, query: str, limit: int = 10, categories: Optional[List[str]] = None,
+               max_candidates: int = 5000) -> List[Dict]:
+        """
+        Find documents matching the query.
+
+        Documents containing every query term come first; if there are fewer than
+        limit of them, documents containing any query term fill the remaining slots,
+        those matching the most terms first. Newer documents (higher ids in arXiv
+        dumps) win ties.
+
+        Args:
+            query (str): Free-text query
+            limit (int): Maximum number of results
+            categories (List[str], optional): Restrict to these arXiv categories or archives
+            max_candidates (int): Cap on postings scanned from each term, newest first
+
+        Returns:
+            List[Dict]: Results in the same format as the live sources
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        lists = sorted((self.postings(term) for term in terms), key=len)
+        lists = [ids for ids in lists if len(ids)]
+        if not lists:
+            return []
+
+        filters = []
+        if categories:
+            filters = [self.postings(term) for term in category_terms(categories)]
+            filters = [ids for ids in filters if len(ids)]
+            if not filters:
+                return []
+
+        def contains(ids, doc_id):
+            position = bisect.bisect_left(ids, doc_id)
+            return position < len(ids) and ids[position] == doc_id
+
+        def allowed(doc_id):
+            return not filters or any(contains(ids, doc_id) for ids in filters)
+
+        # A document containing every term must appear in the rarest list, and ties go to
+        # newer documents, so scanning that list newest-first can stop at the first
+        # `limit` full matches
+        full_matches = []
+        for doc_id in reversed(lists[0][-max_candidates:]):
+            if allowed(doc_id) and all(contains(other, doc_id) for other in lists[1:]):
+                full_matches.append(doc_id)
+                if len(full_matches) >= limit:
+                    break
+
+        ranked = full_matches
+        if len(ranked) < limit and len(lists) > 1:
+            # Partial matches may miss the rarest term, so they come from every term's postings
+            seen = set(full_matches)
+            partial_matches = []
+            for ids in lists:
+                for doc_id in reversed(ids[-max_candidates:]):
+                    if doc_id in seen:
+                        continue
+                    seen.add(doc_id)
+                    if allowed(doc_id):
+                        matched = sum(contains(other, doc_id) for other in lists)
+                        partial_matches.append((matched, doc_id))
+            partial_matches.sort(reverse=True)
+            ranked += [doc_id for _, doc_id in partial_matches]
+
+        results = []
+        for doc_id in ranked[:limit]:
+            record = self.document(doc_id)
+            results.append({
+                "title": record["title"],
+                "authors": record["authors"],
+                "summary": record["summary"],
+                "link": f"http://arxiv.org/abs/{record['id']}",
+                "published": record["published"],
+                "source": LOCAL_INDEX_SOURCE
+            })
+        return results
+
+    def close(self):
+        """Release the memory maps and file handles"""
+        for view in (self._doc_offsets, self._postings):
+            view.release()
+        for mapped in (self._docs, self._terms, self._lexicon):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for handle in self._files:
+            handle.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point: build or query a local index"""
+    parser = argparse.ArgumentParser(description="Build and query an offline arXiv metadata index")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    build = subcommands.add_parser("build", help="Index one or more arXiv metadata dumps")
+    build.add_argument("dumps", nargs="+", help="JSON-lines snapshot or OAI-PMH XML files (.gz allowed)")
+    build.add_argument("--out", required=True, help="Output index directory")
+    build.add_argument("--segment-postings", type=int, default=5_000_000,
+                       help="Postings kept in memory before spilling a sorted run")
+
+    search = subcommands.add_parser("search", help="Query an existing index")
+    search.add_argument("index_dir")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=10)
+    search.add_argument("--category", action="append", help="Restrict to an arXiv category (repeatable)")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        count = build_index(args.dumps, args.out, segment_postings=args.segment_postings)
+        print(f"Indexed {count} documents into {args.out}")
+    else:
+        index = LocalPublicationIndex(args.index_dir)
+        for result in index.search(args.query, args.limit, args.category):
+            print(json.dumps(result, ensure_ascii=False))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,936 @@
-import requests
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import json
+import os
 import re
-from datetime import datetime
-from bs4 import BeautifulSoup
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from functools import lru_cache, partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from bs4 import BeautifulSoup, SoupStrainer
+
+from modules.dedup import collapse_duplicates
+from modules.http_client import HostSessionPool
+from modules.local_index import LOCAL_INDEX_SOURCE, LocalPublicationIndex
+from modules.ranking import BM25FRanker
+from modules.resilience import SourceUnavailable, get_circuit_breaker, get_rate_limiter
+
+# Default per-source deadlines in seconds, measured from the start of a search
+DEFAULT_SOURCE_TIMEOUTS = {
+    "arXiv": 10.0,
+    "Google Scholar": 6.0,
+    "PubMed": 8.0,
+    LOCAL_INDEX_SOURCE: 2.0
+}
+
+# Request budgets shared by every search in the process: (requests per second, burst)
+SOURCE_RATE_LIMITS = {
+    "arXiv": (1 / 3, 3),  # arXiv asks clients for at most one request every three seconds
+    "Google Scholar": (0.2, 2),
+    # Each PubMed search makes an esearch and at least one efetch call, against NCBI's
+    # 3 requests/s without an API key (10/s with one, see NCBI_API_KEY)
+    "PubMed": (1.5, 2)
+}
+
+# Map general domains to arXiv categories
+ARXIV_DOMAIN_CATEGORIES = {
+    "Computer Science": ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.NE"],
+    "Physics": ["physics"],
+    "Mathematics": ["math"],
+    "Biology": ["q-bio"],
+    "Economics": ["econ"],
+    "Statistics": ["stat"],
+    "Electrical Engineering": ["eess"],
+    "Medicine": ["q-bio.QM", "stat.ML", "cs.AI"],  # Include relevant AI categories for medical papers
+    "Machine Learning": ["cs.LG", "stat.ML"],
+    "Artificial Intelligence": ["cs.AI", "cs.LG", "cs.CL", "cs.CV"],
+    "Data Science": ["cs.DB", "stat.ML", "cs.LG"],
+    "Robotics": ["cs.RO", "cs.AI"],
+    "Natural Language Processing": ["cs.CL", "cs.AI"]
+}
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+
+
+def _element_text(element, tag: str) -> str:
+    """Stripped text of a child element, or an empty string if it is missing"""
+    child = element.find(tag)
+    return child.text.strip() if child is not None and child.text else ""
+
+
+def parse_arxiv_feed(stream) -> Iterator[Dict]:
+    """
+    Incrementally parse an arXiv Atom feed from a file-like object.
+    
+    Each <entry> is converted to a result dict as soon as its closing tag has been
+    read, after which the element is cleared from the tree, so memory stays bounded
+    by a single entry regardless of the feed size.
+    
+    Args:
+        stream: Binary file-like object with the Atom XML (e.g. response.raw)
+        
+    Yields:
+        Dict: One publication per feed entry
+    """
+    root = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+            continue
+        if event != "end" or element.tag != f"{ATOM_NS}entry":
+            continue
+        
+        yield {
+            "title": _element_text(element, f"{ATOM_NS}title"),
+            "authors": [_element_text(author, f"{ATOM_NS}name")
+                        for author in element.findall(f"{ATOM_NS}author")],
+            "summary": _element_text(element, f"{ATOM_NS}summary"),
+            "link": _element_text(element, f"{ATOM_NS}id"),
+            "published": _element_text(element, f"{ATOM_NS}published"),
+            "source": "arXiv"
+        }
+        # Release the converted entry (and anything before it) from the partial tree
+        root.clear()
+
+
+PUBMED_MONTHS = {name: f"{number:02d}" for number, name in enumerate(
+    ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1)}
+
+
+def _inner_text(element) -> str:
+    """Text of an element including inline markup such as <i> or <sup>, whitespace-collapsed"""
+    return " ".join("".join(element.itertext()).split()) if element is not None else ""
+
+
+def _pubmed_date(article) -> str:
+    """
+    Best publication date of a PubMed <Article> as YYYY-MM-DD (or shorter when unknown).
+    
+    The electronic publication date is preferred since it is always complete;
+    otherwise the journal issue date is used, falling back to the leading year
+    of a free-text MedlineDate such as "2019 Nov-Dec".
+    """
+    date = article.find("ArticleDate")
+    if date is None:
+        date = article.find("Journal/JournalIssue/PubDate")
+    if date is None:
+        return ""
+    year = date.findtext("Year")
+    if not year:
+        medline_date = date.findtext("MedlineDate") or ""
+        return medline_date[:4] if medline_date[:4].isdigit() else ""
+    month = date.findtext("Month") or ""
+    month = PUBMED_MONTHS.get(month[:3].title(), month.zfill(2) if month.isdigit() else "")
+    day = date.findtext("Day") or ""
+    if not month:
+        return year
+    return f"{year}-{month}-{day.zfill(2)}" if day.isdigit() else f"{year}-{month}"
+
+
+def parse_pubmed_efetch(stream) -> Iterator[Dict]:
+    """
+    Incrementally parse an E-utilities efetch response (db=pubmed, retmode=xml).
+    
+    Like parse_arxiv_feed, each <PubmedArticle> is converted and then cleared from
+    the tree as soon as it has been read.
+    
+    Args:
+        stream: Binary file-like object with the PubmedArticleSet XML
+        
+    Yields:
+        Dict: One publication per article
+    """
+    root = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+            continue
+        if event != "end" or element.tag != "PubmedArticle":
+            continue
+        
+        citation = element.find("MedlineCitation")
+        article = citation.find("Article") if citation is not None else None
+        if article is not None:
+            pmid = citation.findtext("PMID", "").strip()
+            authors = []
+            for author in article.iterfind("AuthorList/Author"):
+                name = " ".join(part for part in (author.findtext("ForeName"), author.findtext("LastName")) if part)
+                name = name or author.findtext("CollectiveName") or ""
+                if name:
+                    authors.append(name.strip())
+            # Structured abstracts come as several labelled AbstractText sections
+            sections = []
+            for section in article.iterfind("Abstract/AbstractText"):
+                text = _inner_text(section)
+                label = section.get("Label")
+                sections.append(f"{label.title()}: {text}" if label else text)
+            yield {
+                "title": _inner_text(article.find("ArticleTitle")),
+                "authors": authors,
+                "summary": " ".join(sections),
+                "link": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
+                "published": _pubmed_date(article),
+                "source": "PubMed"
+            }
+        root.clear()
+
+
+# lxml.html parses in C without a Python object per node; BeautifulSoup is the fallback
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+# Without lxml, only Google Scholar result containers are turned into tree nodes. While
+# straining, class is matched against the raw attribute string, hence the pattern
+SCHOLAR_RESULT_STRAINER = SoupStrainer("div", class_=re.compile(r"\bgs_or\b"))
+
+# Outermost result containers (they can nest, e.g. grouped versions)
+SCHOLAR_RESULT_XPATH = ('//div[contains(concat(" ", normalize-space(@class), " "), " gs_or ")]'
+                        '[not(ancestor::div[contains(concat(" ", normalize-space(@class), " "), " gs_or ")])]')
+
+# CSS class -> field it holds inside a Scholar result
+SCHOLAR_FIELD_CLASSES = {"gs_rt": "title", "gs_a": "byline", "gs_rs": "summary", "gs_age": "age"}
+
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+def _scholar_fields(elements, classes_of) -> Dict:
+    """First element of each field class, found in a single walk over a result's elements"""
+    fields = {}
+    for element in elements:
+        for css_class in classes_of(element):
+            field = SCHOLAR_FIELD_CLASSES.get(css_class)
+            if field and field not in fields:
+                fields[field] = element
+        if len(fields) == len(SCHOLAR_FIELD_CLASSES):
+            break
+    return fields
+
+
+def _scholar_record(title: str, link: Optional[str], byline: str, summary: str, age: str) -> Dict:
+    """
+    Build a publication dict from the text of a Scholar result's fields.
+    
+    The byline ("A Author, B Author - Journal, 2021 - site") gives the author list
+    and the publication year.
+    """
+    authors = [name.strip(" …") for name in byline.split(" - ")[0].split(",") if name.strip(" …")]
+    year = YEAR_PATTERN.search(byline)
+    return {
+        "title": title or "No title",
+        "authors": authors or ["No authors"],
+        "summary": summary,
+        "link": link,
+        "published": year.group() if year else age or "No date",
+        "source": "Google Scholar"
+    }
+
+
+def parse_google_scholar_html(html: str, use_lxml: bool = True) -> List[Dict]:
+    """
+    Extract results from a Google Scholar result page.
+    
+    With lxml installed the page is parsed by lxml.html and result containers are
+    selected by XPath; otherwise BeautifulSoup builds nodes for result containers
+    only. Either way each result's fields are collected in one pass.
+    
+    Args:
+        html (str): Result page markup
+        use_lxml (bool): Set to False to use the BeautifulSoup path even if lxml is installed
+        
+    Returns:
+        List[Dict]: Publications in page order
+    """
+    results = []
+    if use_lxml and lxml is not None:
+        if not html.strip():
+            return results
+        def text(element):
+            return " ".join(element.text_content().split()) if element is not None else ""
+        for result in lxml.html.fromstring(html).xpath(SCHOLAR_RESULT_XPATH):
+            fields = _scholar_fields(result.iter("h3", "div", "span"),
+                                     lambda element: (element.get("class") or "").split())
+            title = fields.get("title")
+            anchor = title.find(".//a") if title is not None else None
+            results.append(_scholar_record(text(anchor if anchor is not None else title),
+                                           anchor.get("href") if anchor is not None else None,
+                                           text(fields.get("byline")), text(fields.get("summary")),
+                                           text(fields.get("age"))))
+        return results
+    
+    def text(element):
+        return element.get_text(" ", strip=True) if element is not None else ""
+    soup = BeautifulSoup(html, "html.parser", parse_only=SCHOLAR_RESULT_STRAINER)
+    for result in soup.find_all("div", class_="gs_or", recursive=False):
+        fields = _scholar_fields(result.find_all(("h3", "div", "span")), lambda element: element.get("class") or ())
+        title = fields.get("title")
+        anchor = title.a if title is not None else None
+        results.append(_scholar_record(text(anchor or title), anchor.get("href") if anchor is not None else None,
+                                       text(fields.get("byline")), text(fields.get("summary")),
+                                       text(fields.get("age"))))
+    return results
+
+
+# Keywords that signal a query already targets a domain
+DOMAIN_KEYWORDS = {
+    "Medicine": ("medical", "healthcare", "clinical", "patient"),
+    "Computer Science": ("computing", "algorithm", "software", "system"),
+    "Artificial Intelligence": ("ai", "machine learning", "deep learning", "neural"),
+    "Machine Learning": ("ml", "deep learning", "neural network", "algorithm"),
+    "Data Science": ("data", "analytics", "mining", "statistical"),
+    "Robotics": ("robot", "automation", "control", "mechanical"),
+    "Natural Language Processing": ("nlp", "language", "text", "linguistic")
+}
+
+
+def bounded_levenshtein(str1: str, str2: str, max_distance: int) -> int:
+    """
+    Levenshtein distance that gives up once it must exceed max_distance.
+    
+    Returns:
+        int: The exact distance if it is at most max_distance, otherwise max_distance + 1
+    """
+    if len(str1) < len(str2):
+        str1, str2 = str2, str1
+    
+    # The length difference alone is a lower bound on the distance
+    if len(str1) - len(str2) > max_distance:
+        return max_distance + 1
+    if len(str2) == 0:
+        return len(str1)
+    
+    previous_row = list(range(len(str2) + 1))
+    current_row = [0] * (len(str2) + 1)
+    for i, c1 in enumerate(str1):
+        current_row[0] = i + 1
+        row_minimum = current_row[0]
+        for j, c2 in enumerate(str2):
+            cost = previous_row[j] + (c1 != c2)
+            if previous_row[j + 1] + 1 < cost:
+                cost = previous_row[j + 1] + 1
+            if current_row[j] + 1 < cost:
+                cost = current_row[j] + 1
+            current_row[j + 1] = cost
+            if cost < row_minimum:
+                row_minimum = cost
+        # Row minima never decrease, so the final distance is already out of bounds
+        if row_minimum > max_distance:
+            return max_distance + 1
+        previous_row, current_row = current_row, previous_row
+    
+    return min(previous_row[-1], max_distance + 1)
+
+
+@lru_cache(maxsize=65536)
+def string_similarity(str1: str, str2: str, min_similarity: float = 0.0) -> float:
+    """
+    Normalized Levenshtein similarity in [0, 1], memoized per pair.
+    
+    Pairs that cannot reach min_similarity are cut short and reported as 0.0.
+    """
+    if len(str1) == 0 or len(str2) == 0:
+        return 0.0
+    
+    max_length = max(len(str1), len(str2))
+    max_distance = int((1 - min_similarity) * max_length)
+    distance = bounded_levenshtein(str1, str2, max_distance)
+    if distance > max_distance:
+        return 0.0
+    return 1 - (distance / max_length)
+
+
+@lru_cache(maxsize=16384)
+def similar_keywords(term: str, keywords: tuple, threshold: float) -> frozenset:
+    """
+    Batch mode: score one term against a whole keyword table at once.
+    
+    Returns:
+        frozenset: Keywords whose similarity with the term is strictly above threshold
+    """
+    return frozenset(
+        keyword for keyword in keywords
+        if string_similarity(keyword, term, threshold) > threshold
+    )
+
+
+# How long raw results from each source stay fresh in the search cache, in seconds
+DEFAULT_CACHE_TTLS = {
+    "arXiv": 12 * 3600,
+    "Google Scholar": 3600,
+    "PubMed": 6 * 3600
+}
+
+# Truncated results (see PartialResults) are only reused for a few minutes
+PARTIAL_RESULTS_TTL = 300
+
+DEFAULT_CACHE_PATH = os.path.join(os.getcwd(), '.cache', 'publication_search.sqlite3')
+
+
+class SearchResultCache:
+    """
+    Two-tier cache of raw per-source search results.
+    
+    Entries are keyed on (source, preprocessed query, domain, limit). Lookups hit a
+    process-wide in-memory LRU first and fall back to an on-disk SQLite table, so
+    results survive restarts and are shared by every Streamlit session in the process.
+    """
+    
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, max_memory_entries: int = 512,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            path (str, optional): SQLite file for the persistent tier, or None for memory only
+            max_memory_entries (int): Capacity of the in-memory LRU tier
+            ttls (Dict[str, float], optional): Per-source TTLs in seconds, overriding DEFAULT_CACHE_TTLS
+            default_ttl (float): TTL for sources without an explicit entry
+        """
+        self.max_memory_entries = max_memory_entries
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        
+        self._db = None
+        if path:
+            try:
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache ("
+                    "key TEXT PRIMARY KEY, source TEXT, expires_at REAL, payload TEXT)"
+                )
+                self._db.execute("DELETE FROM search_cache WHERE expires_at < ?", (time.time(),))
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Search cache disabled on disk: {e}")
+                self._db = None
+    
+    @staticmethod
+    def make_key(source: str, processed_query: str, domain: str, limit: int) -> str:
+        """Build the cache key for one source's results"""
+        return json.dumps([source, processed_query, domain, limit])
+    
+    def get(self, source: str, processed_query: str, domain: str, limit: int) -> Optional[List[Dict]]:
+        """Return cached results for a source, or None on a miss or expired entry"""
+        key = self.make_key(source, processed_query, domain, limit)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, results = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return results
+                del self._memory[key]
+            
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM search_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[0] > now:
+                    results = json.loads(row[1])
+                    self._remember(key, row[0], results)
+                    self._stats["disk_hits"] += 1
+                    return results
+            
+            self._stats["misses"] += 1
+            return None
+    
+    def put(self, source: str, processed_query: str, domain: str, limit: int, results: List[Dict],
+            ttl: Optional[float] = None):
+        """Store results for a source using the given TTL, by default that source's TTL"""
+        key = self.make_key(source, processed_query, domain, limit)
+        expires_at = time.time() + (ttl if ttl is not None else self.ttls.get(source, self.default_ttl))
+        with self._lock:
+            self._remember(key, expires_at, results)
+            self._stats["stores"] += 1
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO search_cache (key, source, expires_at, payload) VALUES (?, ?, ?, ?)",
+                        (key, source, expires_at, json.dumps(results))
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing search cache: {e}")
+    
+    def _remember(self, key: str, expires_at: float, results: List[Dict]):
+        """Insert into the memory tier, evicting the least recently used entries (lock held)"""
+        self._memory[key] = (expires_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM search_cache")
+                self._db.commit()
+    
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the overall hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> SearchResultCache:
+    """Return the process-wide search cache, creating it on first use"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SearchResultCache(os.getenv('SEARCH_CACHE_PATH', DEFAULT_CACHE_PATH))
+        return _default_cache
+
+
+class PartialResults(list):
+    """
+    Raw results of a source that stopped before it had everything it was asked for.
+
+    They are still shown, but only cached for PARTIAL_RESULTS_TTL so a repeated
+    search soon asks the source again for the full set.
+    """
+
+
+class SearchResults(list):
+    """
+    Ranked publications plus the status of each source that was queried.
+
+    Behaves exactly like the plain list returned previously, so existing callers
+    keep working; the extra attributes tell the UI which sources contributed.
+    """
+
+    def __init__(self, publications=(), completed_sources=None, timed_out_sources=None, failed_sources=None,
+                 pending_sources=None, is_final=True):
+        super().__init__(publications)
+        self.completed_sources = completed_sources or []
+        self.timed_out_sources = timed_out_sources or []
+        self.failed_sources = failed_sources or {}
+        # Sources still running when a partial result set was produced
+        self.pending_sources = pending_sources or []
+        self.is_final = is_final
+
 
 class PublicationSearcher:
     """
     Handles searching for academic publications across various domains using different APIs.
     """
     
-    def __init__(self):
-        """Initialize the publication searcher with API endpoints"""
+    def __init__(self, source_timeouts: Optional[Dict[str, float]] = None, max_workers: int = 6,
+                 cache: Optional[SearchResultCache] = None, use_cache: bool = True,
+                 connect_timeout: float = 3.05, read_timeout: float = 10.0, max_retries: int = 2,
+                 max_connections_per_host: int = 4, arxiv_page_size: int = 100,
+                 arxiv_page_delay: float = 3.0, pubmed_batch_size: int = 200,
+                 ranker: Optional[BM25FRanker] = None,
+                 local_index_path: Optional[str] = None, local_index_replaces_arxiv: bool = False,
+                 rate_limits: Optional[Dict[str, Optional[tuple]]] = None,
+                 breaker_failure_threshold: int = 3, breaker_cooldown: float = 60.0):
+        """
+        Initialize the publication searcher with API endpoints.
+        
+        Args:
+            source_timeouts (Dict[str, float], optional): Per-source deadline in seconds,
+                overriding DEFAULT_SOURCE_TIMEOUTS for the given source names
+            max_workers (int): Size of the thread pool used to query sources concurrently
+            cache (SearchResultCache, optional): Result cache; defaults to the process-wide cache
+            use_cache (bool): Set to False to always query the sources directly
+            connect_timeout (float): Seconds allowed to open a connection to a source
+            read_timeout (float): Seconds allowed between bytes received from a source
+            max_retries (int): Retries with jittered backoff on 429/5xx and connection errors
+            max_connections_per_host (int): Pooled keep-alive connections per source host
+            arxiv_page_size (int): Entries requested per arXiv API call when paging
+            arxiv_page_delay (float): Pause in seconds between consecutive arXiv pages
+            pubmed_batch_size (int): PubMed IDs fetched per E-utilities efetch call
+            ranker (BM25FRanker, optional): Ranking engine for merged results
+            local_index_path (str, optional): Directory of an offline index built with
+                modules.local_index; defaults to the LOCAL_INDEX_PATH environment variable
+            local_index_replaces_arxiv (bool): Query the offline index instead of the arXiv API
+            rate_limits (Dict[str, tuple], optional): Per-source (requests per second, burst)
+                overriding SOURCE_RATE_LIMITS; None disables limiting for that source.
+                Budgets are shared by every searcher in the process, so the first
+                searcher to use a source fixes its rate
+            breaker_failure_threshold (int): Consecutive failures after which a source is
+                skipped until its cool-down has passed
+            breaker_cooldown (float): Seconds a failing source is skipped for
+        """
         # Base URLs for different academic APIs
         self.arxiv_api = "http://export.arxiv.org/api/query"
         self.core_api = "https://core.ac.uk/api/v3"
+        self.scholar_url = "https://scholar.google.com/scholar"
+        self.pubmed_eutils_url = os.getenv('PUBMED_EUTILS_URL', "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/")
+        self.ncbi_api_key = os.getenv('NCBI_API_KEY')
+        self.ncbi_email = os.getenv('NCBI_EMAIL')
+        self.pubmed_batch_size = pubmed_batch_size
+        self.arxiv_page_size = arxiv_page_size
+        self.arxiv_page_delay = arxiv_page_delay
+        self.ranker = ranker or BM25FRanker()
+        
+        self.local_index = None
+        self.local_index_replaces_arxiv = local_index_replaces_arxiv
+        local_index_path = local_index_path or os.getenv('LOCAL_INDEX_PATH')
+        if local_index_path:
+            try:
+                self.local_index = LocalPublicationIndex(local_index_path)
+            except (OSError, ValueError) as e:
+                print(f"Local publication index unavailable: {e}")
+        
+        # Keep-alive sessions per host, shared by every source query of this searcher
+        self.http = HostSessionPool(
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            max_retries=max_retries,
+            max_connections_per_host=max_connections_per_host,
+            headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+        )
+        
+        self.source_timeouts = dict(DEFAULT_SOURCE_TIMEOUTS)
+        if source_timeouts:
+            self.source_timeouts.update(source_timeouts)
+        
+        # Sources keep running in this pool after their deadline has passed, so it is
+        # shared across searches instead of being torn down (and joined) every time
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="publication-search")
+        
+        self.cache = (cache or get_default_cache()) if use_cache else None
+        
+        self.rate_limits = dict(SOURCE_RATE_LIMITS)
+        if self.ncbi_api_key:
+            self.rate_limits["PubMed"] = (5.0, 5)
+        if rate_limits:
+            self.rate_limits.update(rate_limits)
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_cooldown = breaker_cooldown
+        
+    def close(self):
+        """Stop the worker pool (fetches past their deadline are not waited for) and close connections"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.http.close()
+    
+    def _get_sources(self) -> Dict:
+        """Map each source name to a callable taking (query, domain, limit)"""
+        sources = {}
+        if self.local_index is not None:
+            sources[LOCAL_INDEX_SOURCE] = self._search_local_index
+        if self.local_index is None or not self.local_index_replaces_arxiv:
+            sources["arXiv"] = self._search_arxiv
+        sources["Google Scholar"] = lambda query, domain, limit: self._search_google_scholar(query, limit)
+        sources["PubMed"] = lambda query, domain, limit: self._search_pubmed(query, limit)
+        return sources
+        
+    def _circuit_breaker(self, name: str):
+        """Process-wide circuit breaker for a source"""
+        return get_circuit_breaker(name, self.breaker_failure_threshold, self.breaker_cooldown)
+    
+    def get_source_health(self) -> Dict[str, Dict]:
+        """
+        Report the circuit breaker state and remaining request budget of each source.
+        
+        Returns:
+            Dict[str, Dict]: Source name -> {"state", "consecutive_failures", "retry_in",
+            "last_error", "tokens"}; tokens is None for sources without a rate limit
+        """
+        health = {}
+        for name in self._get_sources():
+            health[name] = self._circuit_breaker(name).snapshot()
+            rate_limit = self.rate_limits.get(name)
+            health[name]["tokens"] = get_rate_limiter(name, *rate_limit).available if rate_limit else None
+        return health
+    
+    def _guarded_fetch(self, name: str, fetch, query: str, domain: str, limit: int, deadline: float,
+                       acquire_token: bool = True) -> List[Dict]:
+        """
+        Run one source fetch within its shared rate limit and report the outcome to its breaker.
+        
+        Waits for a request token until the source's deadline at most, so a saturated
+        source is skipped instead of queueing requests it would be blocked for.
+        Pass acquire_token=False when the caller has already taken the token.
+        """
+        breaker = self._circuit_breaker(name)
+        rate_limit = self.rate_limits.get(name)
+        if rate_limit and acquire_token:
+            bucket = get_rate_limiter(name, *rate_limit)
+            if not bucket.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                breaker.release()
+                raise SourceUnavailable(f"rate limit reached for {name}")
+        try:
+            results = fetch(query, domain, limit)
+        except Exception as e:
+            breaker.record_failure(str(e))
+            raise
+        breaker.record_success()
+        return results
         
     def search_publications(self, query: str, domain: str, limit: int = 10) -> List[Dict]:
         """
         Search for publications based on query and domain across multiple sources.
         
+        All sources are queried concurrently. Each source has its own deadline (see
+        source_timeouts); results from sources that miss it are dropped and the source
+        is listed in the returned SearchResults.timed_out_sources.
+        
         Args:
             query (str): Search query
             domain (str): Academic domain (e.g., "Computer Science", "Medicine")
             limit (int): Maximum number of results to return
             
         Returns:
-            List[Dict]: List of publications with their details
+            List[Dict]: List of publications with their details (a SearchResults instance)
         """
         try:
-            # Preprocess query and domain for better search
-            processed_query = self._preprocess_query(query, domain)
+            results = SearchResults()
+            # Only the final ranking is needed, so skip the partial re-ranks
+            for results in self.iter_search_publications(query, domain, limit, partial=False):
+                pass
+            return results
+            
+        except Exception as e:
+            print(f"Error searching publications: {e}")
+            return SearchResults()
+    
+    def iter_search_publications(self, query: str, domain: str, limit: int = 10,
+                                 partial: bool = True) -> Iterator[SearchResults]:
+        """
+        Search like search_publications, yielding ranked partial results as sources finish.
+        
+        Every time a source completes while others are still running, everything
+        received so far is re-ranked and yielded with is_final=False. Once every source
+        has completed, failed or missed its deadline, the final ranking is yielded
+        with is_final=True, so the last item equals what search_publications returns.
+        
+        Args:
+            query (str): Search query
+            domain (str): Academic domain (e.g., "Computer Science", "Medicine")
+            limit (int): Maximum number of results per yielded list
+            partial (bool): Set to False to rank once and yield only the final results
             
-            # Search all sources
-            arxiv_results = self._search_arxiv(processed_query, domain, limit)
-            google_results = self._search_google_scholar(processed_query, limit)
-            pubmed_results = self._search_pubmed(processed_query, limit)
+        Yields:
+            SearchResults: Ranked publications, partial first and final last
+        """
+        # Preprocess query and domain for better search
+        processed_query = self._preprocess_query(query, domain)
+        
+        source_names = list(self._get_sources())
+        results_by_source = {}
+        timed_out = []
+        failed = {}
+        
+        def rank(is_final):
+            return self._rank_source_results(source_names, results_by_source, timed_out, failed,
+                                             query, domain, limit, is_final)
+        
+        for name, status, payload in self._iter_source_results(processed_query, domain, limit, query):
+            if status == "completed":
+                results_by_source[name] = payload
+            elif status == "timed_out":
+                timed_out.append(name)
+            else:
+                # Failed and skipped sources are both reported with their reason
+                failed[name] = payload
             
-            # Combine and format results
-            all_results = arxiv_results + google_results + pubmed_results
-            publications = self._filter_and_rank_results(all_results, query, domain)
+            finished = len(results_by_source) + len(timed_out) + len(failed)
+            if partial and status == "completed" and finished < len(source_names):
+                yield rank(is_final=False)
+        
+        yield rank(is_final=True)
+    
+    def search_batch(self, requests: Iterable[Dict], concurrency: int = 4,
+                     default_domain: str = "", default_limit: int = 10) -> Iterator[Tuple[int, Dict, SearchResults]]:
+        """
+        Run many searches, yielding each one's final results as soon as it is ready.
+        
+        Requests whose preprocessed query, domain and limit are identical share a
+        single fetch from the sources; each is still ranked against its own query.
+        At most `concurrency` distinct fetches run at once, each fanning out to every
+        source, so the searcher's max_workers should be about concurrency times the
+        number of sources to keep per-source deadlines from running out in the queue.
+        Unlike interactive searches, a batch waits for each source's shared rate
+        limit instead of skipping the source, and a source's deadline only starts
+        once it has its request token.
+        
+        Args:
+            requests (Iterable[Dict]): Dicts with "query" and optional "domain" and "limit"
+            concurrency (int): Maximum number of distinct searches in flight
+            default_domain (str): Domain for requests that do not name one
+            default_limit (int): Result limit for requests that do not give one
             
-            return publications[:limit]
+        Yields:
+            Tuple[int, Dict, SearchResults]: (request position, request, final results),
+            in completion order
+        """
+        groups = OrderedDict()
+        for index, request in enumerate(requests):
+            domain = request.get("domain") or default_domain
+            limit = int(request.get("limit") or default_limit)
+            key = (self._preprocess_query(request["query"], domain), domain, limit)
+            groups.setdefault(key, []).append((index, request))
+        
+        def fetch(key):
+            processed_query, domain, limit = key
+            original_query = groups[key][0][1]["query"]
+            results_by_source, timed_out, failed = {}, [], {}
+            for name, status, payload in self._iter_source_results(processed_query, domain, limit, original_query,
+                                                                   wait_for_rate_limit=True):
+                if status == "completed":
+                    results_by_source[name] = payload
+                elif status == "timed_out":
+                    timed_out.append(name)
+                else:
+                    failed[name] = payload
+            return results_by_source, timed_out, failed
+        
+        source_names = list(self._get_sources())
+        keys = iter(groups)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="publication-batch") as pool:
+            # Keep a bounded window of fetches in flight rather than queueing the whole batch
+            in_flight = {pool.submit(fetch, key): key for key in islice(keys, concurrency)}
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = in_flight.pop(future)
+                    for next_key in islice(keys, 1):
+                        in_flight[pool.submit(fetch, next_key)] = next_key
+                    
+                    try:
+                        results_by_source, timed_out, failed = future.result()
+                    except Exception as e:
+                        print(f"Error searching publications: {e}")
+                        results_by_source, timed_out, failed = {}, [], {name: str(e) for name in source_names}
+                    _, domain, limit = key
+                    for index, request in groups[key]:
+                        yield index, request, self._rank_source_results(
+                            source_names, results_by_source, timed_out, failed,
+                            request["query"], domain, limit, is_final=True)
+    
+    def _rank_source_results(self, source_names: List[str], results_by_source: Dict[str, List[Dict]],
+                             timed_out: List[str], failed: Dict[str, str], query: str, domain: str,
+                             limit: int, is_final: bool) -> SearchResults:
+        """Merge the results received so far in source order and rank them"""
+        # Merging in source order keeps ranking ties deterministic
+        completed = [name for name in source_names if name in results_by_source]
+        all_results = [result for name in completed for result in results_by_source[name]]
+        pending = [name for name in source_names
+                   if name not in results_by_source and name not in failed and name not in timed_out]
+        publications = self._filter_and_rank_results(all_results, query, domain, limit)
+        return SearchResults(publications, completed, list(timed_out), dict(failed), pending, is_final)
+    
+    def _iter_source_results(self, query: str, domain: str, limit: int,
+                             original_query: Optional[str] = None, wait_for_rate_limit: bool = False) -> Iterator:
+        """
+        Run every source concurrently and report each one as soon as it settles.
+        
+        Every live source is started before anything is reported, so time the caller
+        spends on early reports does not count against their deadlines. Cached and
+        skipped sources are reported first, then live sources in completion order.
+        The offline index is searched with original_query, when given, rather than
+        the preprocessed query, whose appended domain words it would also match.
+        
+        Sources whose circuit breaker is open are reported as "skipped" without
+        being queried. So are sources whose rate limit has no token left before their
+        deadline, unless wait_for_rate_limit is set: then the caller's thread waits
+        for each source's token before starting it, and its deadline counts from then.
+        
+        Yields:
+            Tuple[str, str, Any]: (source name, status, payload) where status is
+            "completed" (payload: raw results), "failed" or "skipped" (payload: error
+            message) or "timed_out" (payload: None)
+        """
+        start = time.monotonic()
+        pending = {}
+        settled = []
+        for name, fetch in self._get_sources().items():
+            # The offline index answers faster than a cache lookup would
+            if self.cache is not None and name != LOCAL_INDEX_SOURCE:
+                cached = self.cache.get(name, query, domain, limit)
+                if cached is not None:
+                    settled.append((name, "completed", cached))
+                    continue
+            breaker = self._circuit_breaker(name)
+            if not breaker.allow():
+                settled.append((name, "skipped", f"{name} is failing, retrying in {breaker.retry_in():.0f}s"))
+                continue
+            source_start = start
+            rate_limit = self.rate_limits.get(name)
+            if wait_for_rate_limit and rate_limit:
+                get_rate_limiter(name, *rate_limit).acquire()
+                source_start = time.monotonic()
+            deadline = source_start + self.source_timeouts.get(name, max(DEFAULT_SOURCE_TIMEOUTS.values()))
+            if name == "arXiv":
+                # Paging stops before the deadline so the pages already parsed are kept
+                fetch = partial(fetch, deadline=deadline)
+            source_query = original_query if name == LOCAL_INDEX_SOURCE and original_query else query
+            future = self._executor.submit(self._guarded_fetch, name, fetch, source_query, domain, limit, deadline,
+                                           not wait_for_rate_limit)
+            pending[future] = (name, deadline)
+        yield from settled
+        
+        while pending:
+            # Wake up on the next completion or the nearest deadline, whichever comes first
+            next_deadline = min(deadline for _, deadline in pending.values())
+            done, _ = wait(pending, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
             
-        except Exception as e:
-            print(f"Error searching publications: {e}")
-            return []
+            for future in done:
+                name, _ = pending.pop(future)
+                try:
+                    results = future.result()
+                except SourceUnavailable as e:
+                    yield name, "skipped", str(e)
+                    continue
+                except Exception as e:
+                    print(f"Error searching {name}: {e}")
+                    yield name, "failed", str(e)
+                    continue
+                # Empty result lists are not cached so a transient empty page is not pinned
+                if self.cache is not None and results and name != LOCAL_INDEX_SOURCE:
+                    ttl = PARTIAL_RESULTS_TTL if isinstance(results, PartialResults) else None
+                    self.cache.put(name, query, domain, limit, results, ttl)
+                yield name, "completed", results
+            
+            now = time.monotonic()
+            for future, (name, deadline) in list(pending.items()):
+                if now >= deadline:
+                    # Leave the worker to finish in the background; its result is discarded.
+                    # A fetch cancelled before it started never reports to its breaker,
+                    # so hand back the half-open trial it was admitted with
+                    if future.cancel():
+                        self._circuit_breaker(name).release()
+                    del pending[future]
+                    yield name, "timed_out", None
     
     def _preprocess_query(self, query: str, domain: str) -> str:
         """Preprocess query for better search results"""
         # Convert to lowercase and remove extra spaces
         query = query.lower().strip()
         
-        # Add domain-specific keywords if not present
-        domain_keywords = {
-            "Medicine": ["medical", "healthcare", "clinical", "patient"],
-            "Computer Science": ["computing", "algorithm", "software", "system"],
-            "Artificial Intelligence": ["ai", "machine learning", "deep learning", "neural"],
-            "Machine Learning": ["ml", "deep learning", "neural network", "algorithm"],
-            "Data Science": ["data", "analytics", "mining", "statistical"],
-            "Robotics": ["robot", "automation", "control", "mechanical"],
-            "Natural Language Processing": ["nlp", "language", "text", "linguistic"]
-        }
-        
         # Add domain-specific keywords if they're relevant but not present
-        if domain in domain_keywords:
-            keywords = domain_keywords[domain]
-            query_terms = query.split()
+        if domain in DOMAIN_KEYWORDS:
+            keywords = DOMAIN_KEYWORDS[domain]
+            # Long pasted abstracts repeat words; each distinct term is scored once
+            query_terms = list(dict.fromkeys(query.split()))
+            matched = set()
+            for term in query_terms:
+                matched |= similar_keywords(term, keywords, 0.8)
             for keyword in keywords:
-                if any(self._calculate_similarity(keyword, term) > 0.8 for term in query_terms):
+                if keyword in matched:
                     continue
                 if not any(keyword in term for term in query_terms):
                     if domain.lower() not in query.lower():
@@ -84,203 +946,201 @@ class PublicationSearcher:
     
     def _calculate_similarity(self, str1: str, str2: str) -> float:
         """Calculate string similarity using Levenshtein distance"""
-        if len(str1) == 0 or len(str2) == 0:
-            return 0.0
-        
-        distance = self._levenshtein_distance(str1, str2)
-        max_length = max(len(str1), len(str2))
-        return 1 - (distance / max_length)
+        return string_similarity(str1, str2)
     
     def _levenshtein_distance(self, str1: str, str2: str) -> int:
         """Calculate Levenshtein distance between two strings"""
-        if len(str1) < len(str2):
-            return self._levenshtein_distance(str2, str1)
-        
-        if len(str2) == 0:
-            return len(str1)
-        
-        previous_row = range(len(str2) + 1)
-        for i, c1 in enumerate(str1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(str2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
-    
-    def _filter_and_rank_results(self, results: List[Dict], original_query: str, domain: str) -> List[Dict]:
-        """Filter and rank results based on relevance"""
-        scored_results = []
-        query_terms = set(original_query.lower().split())
-        domain_terms = set(domain.lower().split())
-        
-        for result in results:
-            score = 0
-            title_lower = result['title'].lower()
-            abstract_lower = result.get('summary', '').lower()
-            
-            # Score based on title match
-            for term in query_terms:
-                if term in title_lower:
-                    score += 5  # Higher weight for title matches
-                if term in abstract_lower:
-                    score += 2  # Lower weight for abstract matches
-            
-            # Score based on domain relevance
-            for term in domain_terms:
-                if term in title_lower:
-                    score += 3
-                if term in abstract_lower:
-                    score += 1
-            
-            # Score based on recency
-            try:
-                pub_date = datetime.strptime(result.get('published', '')[:10], '%Y-%m-%d')
-                days_old = (datetime.now() - pub_date).days
-                recency_score = max(0, 1 - (days_old / 365))  # Higher score for newer papers
-                score += recency_score
-            except:
-                score += 0  # Default score if date parsing fails
+        return bounded_levenshtein(str1, str2, max(len(str1), len(str2)))
+    
+    def _filter_and_rank_results(self, results: List[Dict], original_query: str, domain: str,
+                                 limit: Optional[int] = None) -> List[Dict]:
+        """
+        Filter and rank results based on relevance.
+        
+        Copies of the same paper from different sources are collapsed first (see
+        modules.dedup), so each paper takes a single slot. Scores come from the BM25F
+        ranker (title and abstract fields, domain terms and a recency boost); the
+        per-component breakdown is kept under "score_components". With a limit, only
+        the best `limit` results are selected and converted.
+        """
+        results = collapse_duplicates(results)
+        
+        publications = []
+        for index, components in self.ranker.rank(results, original_query, domain, top_k=limit):
+            # Only include if it's relevant enough
+            if components["total"] <= 0:
+                continue
             
-            # Create publication object with score
-            pub = {
+            result = results[index]
+            publications.append({
                 "title": result.get("title", ""),
                 "authors": result.get("authors", []),
                 "summary": result.get("summary", ""),
                 "link": result.get("link", ""),
                 "published": result.get("published", ""),
                 "source": result.get("source", ""),
+                "sources": result.get("sources", []),
+                "links": result.get("links", []),
                 "domain": domain,
-                "score": score
-            }
-            
-            # Only include if it's relevant enough
-            if score > 0:
-                scored_results.append((score, pub))
+                "score": components["total"],
+                "score_components": components
+            })
         
-        # Sort by score
-        scored_results.sort(key=lambda x: x[0], reverse=True)
-        
-        # Return only the publication objects, without scores
-        return [result for score, result in scored_results]
+        return publications
 
-    def _search_arxiv(self, query: str, domain: str, limit: int) -> List[Dict]:
-        """Search arXiv for publications with improved query handling"""
+    def _search_arxiv(self, query: str, domain: str, limit: int, deadline: Optional[float] = None) -> List[Dict]:
+        """
+        Search arXiv for publications with improved query handling.
+        
+        Errors propagate so the source's circuit breaker sees them; if a later page
+        fails or paging stops at the deadline, the entries already received are
+        returned as PartialResults.
+        """
+        results = []
+        pages = self._iter_arxiv(query, domain, limit, deadline)
         try:
-            # Map general domains to arXiv categories
-            domain_mapping = {
-                "Computer Science": ["cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.NE"],
-                "Physics": ["physics"],
-                "Mathematics": ["math"],
-                "Biology": ["q-bio"],
-                "Economics": ["econ"],
-                "Statistics": ["stat"],
-                "Electrical Engineering": ["eess"],
-                "Medicine": ["q-bio.QM", "stat.ML", "cs.AI"],  # Include relevant AI categories for medical papers
-                "Machine Learning": ["cs.LG", "stat.ML"],
-                "Artificial Intelligence": ["cs.AI", "cs.LG", "cs.CL", "cs.CV"],
-                "Data Science": ["cs.DB", "stat.ML", "cs.LG"],
-                "Robotics": ["cs.RO", "cs.AI"],
-                "Natural Language Processing": ["cs.CL", "cs.AI"]
-            }
-            
-            # Get arXiv categories
-            arxiv_categories = domain_mapping.get(domain, ["all"])
-            
-            # Build advanced search query
-            search_query = f'all:({query})'
-            if arxiv_categories != ["all"]:
-                category_query = " OR ".join(f"cat:{cat}" for cat in arxiv_categories)
-                search_query = f"{search_query} AND ({category_query})"
-            
+            while True:
+                results.append(next(pages))
+        except StopIteration as finished:
+            complete = bool(finished.value)
+        except Exception as e:
+            if not results:
+                raise
+            print(f"Error paging arXiv results: {e}")
+            complete = False
+        return results if complete else PartialResults(results)
+    
+    def _build_arxiv_query(self, query: str, domain: str) -> str:
+        """Build the arXiv search_query, restricted to the domain's categories"""
+        # Get arXiv categories
+        arxiv_categories = ARXIV_DOMAIN_CATEGORIES.get(domain, ["all"])
+        
+        # Build advanced search query
+        search_query = f'all:({query})'
+        if arxiv_categories != ["all"]:
+            category_query = " OR ".join(f"cat:{cat}" for cat in arxiv_categories)
+            search_query = f"{search_query} AND ({category_query})"
+        return search_query
+    
+    def _iter_arxiv(self, query: str, domain: str, limit: int, deadline: Optional[float] = None) -> Iterator[Dict]:
+        """
+        Yield arXiv results page by page, parsing each response as it streams in.
+        
+        Pages of at most arxiv_page_size entries are requested with increasing
+        start offsets until limit results have been yielded or arXiv runs out.
+        Every page after the first takes a token from the shared arXiv rate limit
+        (the first is charged by the caller). With a monotonic deadline, no further
+        page is requested once the pause and another page like the last one would
+        not finish before it, so the results received so far are not lost.
+        
+        Returns True once limit results have been yielded or arXiv has run out, and
+        False if paging stopped early.
+        """
+        search_query = self._build_arxiv_query(query, domain)
+        rate_limit = self.rate_limits.get("arXiv")
+        bucket = get_rate_limiter("arXiv", *rate_limit) if rate_limit else None
+        
+        start = 0
+        while start < limit:
+            page_started = time.monotonic()
+            page_size = min(self.arxiv_page_size, limit - start)
             params = {
                 "search_query": search_query,
-                "start": 0,
-                "max_results": limit,
+                "start": start,
+                "max_results": page_size,
                 "sortBy": "relevance",
                 "sortOrder": "descending"
             }
             
-            response = requests.get(self.arxiv_api, params=params)
-            
-            if response.status_code == 200:
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.text)
-                
-                results = []
-                for entry in root.findall('{http://www.w3.org/2005/Atom}entry'):
-                    result = {
-                        "title": entry.find('{http://www.w3.org/2005/Atom}title').text.strip(),
-                        "authors": [author.find('{http://www.w3.org/2005/Atom}name').text 
-                                  for author in entry.findall('{http://www.w3.org/2005/Atom}author')],
-                        "summary": entry.find('{http://www.w3.org/2005/Atom}summary').text.strip(),
-                        "link": entry.find('{http://www.w3.org/2005/Atom}id').text.strip(),
-                        "published": entry.find('{http://www.w3.org/2005/Atom}published').text.strip(),
-                        "source": "arXiv"
-                    }
-                    results.append(result)
+            response = self.http.get(self.arxiv_api, params=params, stream=True)
+            try:
+                response.raise_for_status()
                 
-                return results
-            
-            return []
+                # Let urllib3 undo any gzip transfer encoding while we read the raw stream
+                response.raw.decode_content = True
+                received = 0
+                for result in parse_arxiv_feed(response.raw):
+                    received += 1
+                    yield result
+                    if received >= page_size:
+                        break
+            finally:
+                response.close()
             
-        except Exception as e:
-            print(f"Error searching arXiv: {e}")
-            return []
+            if received < page_size:
+                return True
+            start += received
+            if start >= limit:
+                return True
+            if deadline is not None:
+                page_seconds = time.monotonic() - page_started
+                if time.monotonic() + self.arxiv_page_delay + page_seconds >= deadline:
+                    return False
+            # arXiv asks API clients to pause between consecutive calls
+            time.sleep(self.arxiv_page_delay)
+            if bucket and not bucket.acquire(
+                    timeout=None if deadline is None else max(0.0, deadline - time.monotonic())):
+                return False
+        return True
+
+    def _search_local_index(self, query: str, domain: str, limit: int) -> List[Dict]:
+        """Search the offline arXiv metadata index, restricted to the domain's categories"""
+        categories = ARXIV_DOMAIN_CATEGORIES.get(domain)
+        return self.local_index.search(query, limit, categories)
 
     def _search_google_scholar(self, query: str, limit: int) -> List[Dict]:
         """Search Google Scholar for publications"""
-        url = f"https://scholar.google.com/scholar?q={query}&hl=en&as_sdt=0%2C5"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
-        results = []
-        for result in soup.find_all('div', class_='gs_r gs_or gs_scl'):
-            title = result.find('h3', class_='gs_rt')
-            link = title.find('a')['href'] if title else None
-            title_text = title.text.strip() if title else "No title"
-            authors = result.find('div', class_='gs_a').text.strip() if result.find('div', class_='gs_a') else "No authors"
-            published = result.find('span', class_='gs_age').text.strip() if result.find('span', class_='gs_age') else "No date"
-            result_dict = {
-                "title": title_text,
-                "authors": [authors],
-                "summary": "",
-                "link": link,
-                "published": published,
-                "source": "Google Scholar"
-            }
-            results.append(result_dict)
-        return results[:limit]
+        params = {"q": query, "hl": "en", "as_sdt": "0,5"}
+        response = self.http.get(self.scholar_url, params=params)
+        response.raise_for_status()
+        # A blocked client gets a CAPTCHA page with status 200 instead of results
+        if 'id="gs_captcha_f"' in response.text or "/sorry/" in response.url:
+            raise RuntimeError("Google Scholar is asking for a CAPTCHA")
+        return self._parse_google_scholar_html(response.text)[:limit]
+
+    def _parse_google_scholar_html(self, html: str) -> List[Dict]:
+        """Extract results from a Google Scholar result page"""
+        return parse_google_scholar_html(html)
+
+    def _eutils_params(self, **params) -> Dict:
+        """Add the identification NCBI asks E-utilities clients to send"""
+        params["tool"] = "ai-academic-paper-generator"
+        if self.ncbi_email:
+            params["email"] = self.ncbi_email
+        if self.ncbi_api_key:
+            params["api_key"] = self.ncbi_api_key
+        return params
 
     def _search_pubmed(self, query: str, limit: int) -> List[Dict]:
-        """Search PubMed for publications"""
-        url = f"https://pubmed.ncbi.nlm.nih.gov/?term={query}&size=200"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers)
-        soup = BeautifulSoup(response.text, 'html.parser')
+        """
+        Search PubMed through the NCBI E-utilities.
+        
+        One esearch call returns the most relevant PubMed IDs, then their abstracts
+        and metadata are fetched with efetch in batches of pubmed_batch_size IDs and
+        parsed while the XML streams in.
+        """
+        response = self.http.get(self.pubmed_eutils_url + "esearch.fcgi", params=self._eutils_params(
+            db="pubmed", term=query, retmax=limit, sort="relevance", retmode="json"))
+        response.raise_for_status()
+        ids = response.json().get("esearchresult", {}).get("idlist", [])[:limit]
+        
         results = []
-        for result in soup.find_all('div', class_='full-text-links'):
-            title = result.find('a', class_='article-title')
-            link = title['href'] if title else None
-            title_text = title.text.strip() if title else "No title"
-            authors = result.find('span', class_='authors-list-item').text.strip() if result.find('span', class_='authors-list-item') else "No authors"
-            published = result.find('span', class_='citation-part').text.strip() if result.find('span', class_='citation-part') else "No date"
-            result_dict = {
-                "title": title_text,
-                "authors": [authors],
-                "summary": "",
-                "link": link,
-                "published": published,
-                "source": "PubMed"
-            }
-            results.append(result_dict)
+        for start in range(0, len(ids), self.pubmed_batch_size):
+            if len(results) >= limit:
+                break
+            batch = ids[start:start + self.pubmed_batch_size]
+            # POST keeps long ID lists out of the URL
+            response = self.http.post(self.pubmed_eutils_url + "efetch.fcgi", data=self._eutils_params(
+                db="pubmed", id=",".join(batch), retmode="xml"), stream=True)
+            try:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                for result in parse_pubmed_efetch(response.raw):
+                    results.append(result)
+                    if len(results) >= limit:
+                        break
+            finally:
+                response.close()
         return results[:limit]
 
     def get_domain_suggestions(self) -> List[str]:
@@ -300,3 +1160,23 @@ class PublicationSearcher:
             "Robotics",
             "Natural Language Processing"
         ]
+
+
+_default_searcher = None
+_default_searcher_lock = threading.Lock()
+
+
+def get_publication_searcher() -> PublicationSearcher:
+    """
+    Return the process-wide searcher, creating it on first use.
+    
+    Sharing one searcher makes its worker pool and pooled connections limits for
+    the whole process rather than for each session. PUBLICATION_SEARCH_WORKERS
+    (default 16) sets the pool size, which bounds the source fetches running at
+    once across all sessions.
+    """
+    global _default_searcher
+    with _default_searcher_lock:
+        if _default_searcher is None:
+            _default_searcher = PublicationSearcher(max_workers=int(os.getenv('PUBLICATION_SEARCH_WORKERS', 16)))
+        return _default_searcher
@@ -0,0 +1,166 @@
+import threading
+import time
+from typing import Dict, Optional
+
+
+class SourceUnavailable(Exception):
+    """Raised when a backend is skipped by its rate limiter or circuit breaker"""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`; each request
+    takes one token, waiting for a refill if necessary.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            capacity (float): Maximum tokens, i.e. the allowed burst
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting at most `timeout` seconds for it.
+
+        Returns:
+            bool: True if a token was taken, False if none would be available in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class CircuitBreaker:
+    """
+    Skips a failing backend for a cool-down window.
+
+    Closed: requests flow and consecutive failures are counted. After
+    `failure_threshold` failures the breaker opens and rejects requests for
+    `cooldown` seconds. Then it is half-open: one trial request is let through,
+    closing the breaker on success or re-opening it on failure.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 60.0):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker
+            cooldown (float): Seconds to reject requests once open
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self._failures += 1
+            self._last_error = error
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release(self):
+        """Give back a half-open trial that was never sent (e.g. rate limited)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a trial request through"""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self.cooldown - (time.monotonic() - self._opened_at))
+
+    def snapshot(self) -> Dict:
+        """Current state for display"""
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in": retry_in,
+                "last_error": self._last_error
+            }
+
+
+# Process-wide registries, so every session and searcher shares one budget per backend
+_rate_limiters = {}
+_circuit_breakers = {}
+_registry_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, rate: float, capacity: float) -> TokenBucket:
+    """Return the shared token bucket for a backend, creating it on first use"""
+    with _registry_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = TokenBucket(rate, capacity)
+        return _rate_limiters[name]
+
+
+def get_circuit_breaker(name: str, failure_threshold: int = 3, cooldown: float = 60.0) -> CircuitBreaker:
+    """Return the shared circuit breaker for a backend, creating it on first use"""
+    with _registry_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(failure_threshold, cooldown)
+        return _circuit_breakers[name]
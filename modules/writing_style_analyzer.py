@@ -1,36 +1,85 @@
-import nltk
-import language_tool_python
-import textstat
-from typing import Dict, List, Tuple, Any
+import threading
+from typing import Dict, List, Optional, Tuple, Any
 import re
-from nltk.tokenize import sent_tokenize, word_tokenize
-from nltk.corpus import wordnet
 import logging
+from modules.grammar_service import GrammarService, GrammarServiceBusy, GrammarServiceTimeout, get_grammar_service
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
-# Download NLTK resources at module level (runs only once when imported)
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('averaged_perceptron_tagger', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except Exception as e:
-    logging.warning(f"Failed to download NLTK resources: {e}")
+# NLTK resources used by the analyzer -> their path in the NLTK data directories.
+# sent_tokenize needs punkt_tab on NLTK 3.8.2+ and punkt before that.
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "wordnet": "corpora/wordnet"
+}
+TOKENIZER_RESOURCES = ("punkt", "punkt_tab")
+
+_checked_resources = set()
+_resource_lock = threading.Lock()
+
+
+def ensure_nltk_resources(*names: str):
+    """
+    Make NLTK resources available, downloading only those missing from the local data path.
+
+    Each resource is checked once per process; failures are logged and left for
+    the NLTK call that needs the resource to report.
+
+    Args:
+        *names (str): Keys of NLTK_RESOURCES
+    """
+    import nltk
+
+    with _resource_lock:
+        for name in names:
+            if name in _checked_resources:
+                continue
+            _checked_resources.add(name)
+            try:
+                nltk.data.find(NLTK_RESOURCES[name])
+            except LookupError:
+                try:
+                    nltk.download(name, quiet=True)
+                except Exception as e:
+                    logging.warning(f"Failed to download NLTK resource {name}: {e}")
+
+
+def sent_tokenize(text: str) -> List[str]:
+    """NLTK sentence tokenizer, loading its data on first use"""
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+
+    ensure_nltk_resources(*TOKENIZER_RESOURCES)
+    return nltk_sent_tokenize(text)
+
+
+def word_tokenize(text: str) -> List[str]:
+    """NLTK word tokenizer, loading its data on first use"""
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+
+    ensure_nltk_resources(*TOKENIZER_RESOURCES)
+    return nltk_word_tokenize(text)
+
 
 class AcademicWritingStyleAnalyzer:
     """
     Analyzes academic writing style and provides suggestions for improvement.
+
+    Construction is cheap: NLTK data and textstat are loaded by the first analysis
+    that needs them, and grammar checks go to the process-wide grammar service, so
+    sessions share its LanguageTool workers instead of starting their own.
     """
     
-    def __init__(self):
-        """Initialize the analyzer with necessary tools and resources."""
-        # Initialize language tool
-        try:
-            self.language_tool = language_tool_python.LanguageTool('en-US')
-        except Exception as e:
-            logging.warning(f"Failed to initialize language tool: {e}")
-            self.language_tool = None
+    def __init__(self, grammar_service: Optional[GrammarService] = None):
+        """
+        Initialize the analyzer; heavy tools are created on first use.
+        
+        Args:
+            grammar_service (GrammarService, optional): Grammar checker to use
+                (default: the shared one from get_grammar_service())
+        """
+        self._grammar_service = grammar_service
         
         # Common academic word replacements
         self.academic_synonyms = {
@@ -44,6 +93,12 @@ class AcademicWritingStyleAnalyzer:
             "look at": ["examine", "investigate", "analyze", "evaluate"]
         }
 
+    @property
+    def grammar_service(self) -> GrammarService:
+        if self._grammar_service is None:
+            self._grammar_service = get_grammar_service()
+        return self._grammar_service
+
     def _get_academic_synonyms(self, word: str) -> List[str]:
         """
         Get academic synonyms for a given word.
@@ -60,6 +115,9 @@ class AcademicWritingStyleAnalyzer:
             return self.academic_synonyms[word]
         
         # Get additional synonyms from WordNet
+        from nltk.corpus import wordnet
+
+        ensure_nltk_resources("wordnet")
         synonyms = set()
         for syn in wordnet.synsets(word):
             for lemma in syn.lemmas():
@@ -78,6 +136,8 @@ class AcademicWritingStyleAnalyzer:
         Returns:
             Dict[str, float]: Dictionary containing readability scores
         """
+        import textstat
+
         try:
             return {
                 "flesch_reading_ease": textstat.flesch_reading_ease(text),
@@ -99,28 +159,15 @@ class AcademicWritingStyleAnalyzer:
         
         Returns:
             List[Dict]: List of grammar issues with their suggestions
+        
+        Raises:
+            GrammarServiceBusy: If the shared grammar checker is saturated
+            GrammarServiceTimeout: If the check did not finish in time
         """
-        if not self.language_tool:
-            return []
-            
         try:
-            matches = self.language_tool.check(text)
-            issues = []
-            
-            for match in matches:
-                issue = {
-                    'message': match.message,
-                    'context': match.context,
-                    'offset': match.offset,
-                    'length': match.errorLength,
-                    'category': match.category,
-                    'incorrect': text[match.offset:match.offset + match.errorLength],
-                    'suggestions': match.replacements[:3] if match.replacements else []
-                }
-                issues.append(issue)
-                
-            return issues
-            
+            return self.grammar_service.check(text)
+        except (GrammarServiceBusy, GrammarServiceTimeout):
+            raise
         except Exception as e:
             logging.error(f"Error checking grammar: {e}")
             return []
@@ -153,6 +200,8 @@ class AcademicWritingStyleAnalyzer:
         Returns:
             Dict[str, float]: Average sentence length and complexity score.
         """
+        import textstat
+
         sentences = sent_tokenize(text)
         total_length = sum(len(word_tokenize(sentence)) for sentence in sentences)
         average_length = total_length / len(sentences) if sentences else 0
@@ -258,9 +307,3 @@ class AcademicWritingStyleAnalyzer:
             logging.warning(f"An error occurred during analysis: {e}")
             return {'error': str(e)}
 
-
-# Example usage
-analyzer = AcademicWritingStyleAnalyzer()
-text = "This is a simple text to analyze. It contains several sentences and aims to demonstrate the functionality of the Academic Writing Style Analyzer."
-analysis_results = analyzer.analyze_text(text)
-print(analysis_results)
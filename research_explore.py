@@ -1,19 +1,14 @@
-import os
 import logging
 import streamlit as st
-import torch
-from sklearn.metrics.pairwise import cosine_similarity
 import PyPDF2
 import docx
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from modules.llm_client import MISSING_API_KEY_MESSAGE, get_llm_client
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Retrieve the Groq API key
-GROQ_API_KEY = os.getenv('GROQ_API_KEY')
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
@@ -43,41 +38,37 @@ def extract_text_from_pdf(uploaded_file):
 def split_document_into_chunks(document_text):
     return [chunk.strip() for chunk in document_text.split('\n') if chunk.strip()]  
 
-# Function to perform semantic search using Groq API with llama-3.3-70b-versatile model
+# Function to perform semantic search through the configured LLM backend (Groq llama-3.3-70b-versatile by default)
 def semantic_search_llama(query, document_chunks, max_results=3):
-    api_url = 'https://api.groq.com/openai/v1/chat/completions'  # Corrected endpoint for Groq API
-    headers = {
-        'Authorization': f'Bearer {GROQ_API_KEY}',
-        'Content-Type': 'application/json'
-    }
-    
-    results = []
+    client = get_llm_client()
+    if not client.is_configured:
+        st.error(MISSING_API_KEY_MESSAGE)
+        return []
     
-    for chunk in document_chunks:
-        data = {
-            'model': 'llama-3.3-70b-versatile',  # Specify the model
-            'messages': [
+    def ask(chunk):
+        return client.chat(
+            messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
                 {"role": "user", "content": f"{query} in context: {chunk}"}
             ],
-            'temperature': 0.5,
-            'max_tokens': 100,
-            'top_p': 1.0,
-            'frequency_penalty': 0,
-            'presence_penalty': 0
-        }
-        
-        response = requests.post(api_url, headers=headers, json=data)
-        
-        if response.status_code == 200:
-            response_json = response.json()
-            result_text = response_json['choices'][0]['message']['content'].strip()
-            results.append(result_text)
-            if len(results) >= max_results:
+            temperature=0.5,
+            max_tokens=100,
+            top_p=1.0,
+            frequency_penalty=0,
+            presence_penalty=0
+        )
+    
+    # Only the first max_results chunks are ever answered, so ask about them all at
+    # once; the shared client caps how many requests actually run concurrently
+    results = []
+    with ThreadPoolExecutor(max_workers=max(1, max_results)) as pool:
+        futures = [pool.submit(ask, chunk) for chunk in document_chunks[:max_results]]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                st.error(f"Error in API call: {e}")
                 break
-        else:
-            st.error(f"Error in API call: {response.status_code} - {response.text}")
-            break
     
     return results
 
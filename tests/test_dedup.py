@@ -0,0 +1,49 @@
+import unittest
+
+from modules.dedup import collapse_duplicates
+
+TITLE = "Graph Neural Networks for Molecular Property Prediction"
+# Title-shingle Jaccard similarity with TITLE is about 0.87: near-duplicate, but below 0.9
+REWORDED = "Graph neural networks for molecular property prediction tasks"
+
+
+def paper(title, source, published="", authors=()):
+    return {"title": title, "source": source, "link": f"https://{source.lower()}.example/paper",
+            "published": published, "authors": list(authors), "summary": ""}
+
+
+class CollapseDuplicatesTest(unittest.TestCase):
+    def test_exact_titles_merge_whatever_the_metadata(self):
+        merged = collapse_duplicates([paper(TITLE, "arXiv", "2021-03-01", ["A Smith"]),
+                                      paper(TITLE.upper() + ".", "PubMed", "2023", ["B Jones"])])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0]["sources"], ["arXiv", "PubMed"])
+        self.assertEqual(len(merged[0]["links"]), 2)
+
+    def test_near_duplicate_with_the_same_year_merges(self):
+        merged = collapse_duplicates([paper(TITLE, "arXiv", "2021-03-01"),
+                                      paper(REWORDED, "PubMed", "2021")])
+        self.assertEqual(len(merged), 1)
+
+    def test_near_duplicate_with_a_shared_author_merges(self):
+        merged = collapse_duplicates([paper(TITLE, "arXiv", "2020", ["Alice Smith", "Bo Chen"]),
+                                      paper(REWORDED, "PubMed", "2021", ["A Smith"])])
+        self.assertEqual(len(merged), 1)
+
+    def test_different_year_and_no_shared_author_stays_apart(self):
+        merged = collapse_duplicates([paper(TITLE, "arXiv", "2020", ["Alice Smith"]),
+                                      paper(REWORDED, "PubMed", "2022", ["Bo Chen"])])
+        self.assertEqual(len(merged), 2)
+
+    def test_nothing_to_compare_needs_the_unconfirmed_threshold(self):
+        results = [paper(TITLE, "arXiv"), paper(REWORDED, "PubMed")]
+        self.assertEqual(len(collapse_duplicates(results)), 2)
+        self.assertEqual(len(collapse_duplicates(results, unconfirmed_threshold=0.8)), 1)
+
+    def test_untitled_results_are_never_merged(self):
+        merged = collapse_duplicates([paper("No title", "Google Scholar"), paper("", "Google Scholar")])
+        self.assertEqual(len(merged), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
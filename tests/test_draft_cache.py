@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from modules.draft_cache import DraftCache
+
+SETTINGS = ("v1", "model", 1000, 0.7)
+
+
+class DraftCacheLookupTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = DraftCache(":memory:")
+        self.cache.put("Machine learning for early detection of diabetic retinopathy", *SETTINGS, "retina draft")
+
+    def test_exact_key_ignores_case_and_spacing(self):
+        cached = self.cache.get("  machine learning for early   detection of diabetic retinopathy", *SETTINGS)
+        self.assertEqual(cached.draft, "retina draft")
+        self.assertTrue(cached.exact)
+
+    def test_exact_key_keeps_punctuation(self):
+        self.cache.put("C++", *SETTINGS, "cpp draft")
+        self.assertIsNone(self.cache.get("C#", *SETTINGS))
+        self.assertEqual(self.cache.get("c++", *SETTINGS).draft, "cpp draft")
+
+    def test_settings_are_part_of_the_key(self):
+        self.assertIsNone(self.cache.get("Machine learning for early detection of diabetic retinopathy",
+                                         "v2", "model", 1000, 0.7))
+
+    def test_reworded_topics_are_opt_in(self):
+        reworded = "Machine learning for the early detection of diabetic retinopathy"
+        self.assertIsNone(self.cache.get(reworded, *SETTINGS))
+        cached = self.cache.get(reworded, *SETTINGS, near_duplicates=True)
+        self.assertEqual(cached.draft, "retina draft")
+        self.assertFalse(cached.exact)
+
+    def test_word_order_counts(self):
+        reordered = "retinopathy diabetic of detection early for learning machine"
+        self.assertIsNone(self.cache.get(reordered, *SETTINGS, near_duplicates=True))
+
+
+class DraftCacheFailureTest(unittest.TestCase):
+    def test_unwritable_path_falls_back_to_memory(self):
+        with tempfile.NamedTemporaryFile() as blocker:
+            # A directory cannot be created where a file already is
+            cache = DraftCache(os.path.join(blocker.name, "drafts.sqlite3"))
+        cache.put("Topic", *SETTINGS, "draft")
+        self.assertEqual(cache.get("Topic", *SETTINGS).draft, "draft")
+
+    def test_database_errors_count_as_misses(self):
+        cache = DraftCache(":memory:")
+        cache._db.close()
+        with self.assertLogs("modules.draft_cache", level="ERROR"):
+            self.assertIsNone(cache.get("Topic", *SETTINGS, near_duplicates=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import unittest
+import zipfile
+from concurrent.futures import Future
+
+import docx
+import fitz
+
+from modules.export_handler import _render_export, build_docx, build_pdf, export_zip, iter_blocks
+
+
+def pdf_text(data: bytes) -> str:
+    with fitz.open(stream=data, filetype="pdf") as document:
+        return "\n".join(page.get_text() for page in document)
+
+
+class IterBlocksTest(unittest.TestCase):
+    def test_numbered_section_names_are_headings(self):
+        blocks = list(iter_blocks("1. Title: A Study\n2. Abstract\n3. Introduction:\n2.1 Methodology"))
+        self.assertEqual(blocks, [
+            ("heading", 2, "1. Title: A Study"),
+            ("heading", 2, "2. Abstract"),
+            ("heading", 2, "3. Introduction"),
+            ("heading", 3, "2.1 Methodology"),
+        ])
+
+    def test_other_numbered_lines_are_list_items(self):
+        blocks = list(iter_blocks("1. Participants were recruited\n2. Data Collection"))
+        self.assertEqual(blocks, [
+            ("numbered", 0, "1. Participants were recruited"),
+            ("numbered", 0, "2. Data Collection"),
+        ])
+
+
+class BuildPdfTest(unittest.TestCase):
+    def test_numbered_line_without_text_keeps_the_rest_of_the_draft(self):
+        draft = "## Results\n\n2. **\n3. ****\n- **\n4. Participants were recruited\n\nClosing paragraph."
+        text = pdf_text(build_pdf(draft))
+        self.assertNotIn("Error generating draft content", text)
+        self.assertIn("Participants were recruited", text)
+        self.assertIn("Closing paragraph.", text)
+
+    def test_numbered_items_keep_their_numbers(self):
+        text = pdf_text(build_pdf("1. First finding\n2. Second finding"))
+        self.assertIn("1.", text)
+        self.assertIn("Second finding", text)
+
+
+class BuildDocxTest(unittest.TestCase):
+    def test_numbered_items_are_list_paragraphs(self):
+        document = docx.Document(io.BytesIO(build_docx("1. Introduction\n1. Participants were recruited")))
+        styles = [(paragraph.style.name, paragraph.text) for paragraph in document.paragraphs]
+        self.assertEqual(styles, [("Heading 2", "1. Introduction"),
+                                  ("List Paragraph", "1. Participants were recruited")])
+
+
+class InlinePool:
+    """Pool stand-in that renders in this process and notes how many jobs were submitted before the first result was read"""
+
+    def __init__(self, max_workers):
+        self._max_workers = max_workers
+        self.submitted = 0
+        self.window = None
+
+    def submit(self, function, *args):
+        self.submitted += 1
+        future = Future()
+        future.set_result(function(*args))
+        result = future.result
+
+        def read():
+            if self.window is None:
+                self.window = self.submitted
+            return result()
+
+        future.result = read
+        return future
+
+
+class ExportZipTest(unittest.TestCase):
+    def test_every_draft_is_written(self):
+        archive = io.BytesIO()
+        drafts = [(f"Topic {index}", f"Draft {index}") for index in range(5)]
+        self.assertEqual(export_zip(drafts, archive, ("TXT",), pool=InlinePool(2)), 5)
+        with zipfile.ZipFile(archive) as written:
+            self.assertEqual(len(written.namelist()), 5)
+
+    def test_window_follows_the_pool_size(self):
+        drafts = [(f"Topic {index}", f"Draft {index}") for index in range(20)]
+        for workers in (1, 3):
+            pool = InlinePool(workers)
+            export_zip(drafts, io.BytesIO(), ("TXT",), pool=pool)
+            self.assertEqual(pool.window, 2 * workers)
+
+
+if __name__ == "__main__":
+    unittest.main()
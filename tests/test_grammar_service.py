@@ -0,0 +1,78 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from modules.grammar_service import GrammarService, GrammarServiceBusy, GrammarServiceTimeout
+
+
+class StubServer:
+    """Grammar server stand-in answering every check with a fixed status"""
+
+    def __init__(self, status: int, error: str):
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                server.requests += 1
+                body = json.dumps({"error": error}).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        self.url = "http://127.0.0.1:%d" % self._httpd.server_address[1]
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class LocalTimeoutTest(unittest.TestCase):
+    def test_timed_out_check_is_cancelled_and_raised(self):
+        service = GrammarService(timeout=0.05)
+        service._ensure_workers = lambda: None  # no worker ever picks the check up
+
+        with self.assertRaises(GrammarServiceTimeout):
+            service.check("Some text.")
+
+        _, future = service._queue.get_nowait()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(service.stats()["timeouts"], 1)
+
+
+class RemoteStatusTest(unittest.TestCase):
+    def check_once(self, status, error):
+        server = StubServer(status, error)
+        self.addCleanup(server.stop)
+        service = GrammarService(server_url=server.url, timeout=5.0)
+        self.addCleanup(service.close)
+        return server, service
+
+    def test_gateway_timeout_is_mapped_without_retrying(self):
+        server, service = self.check_once(504, "timed out")
+        with self.assertRaises(GrammarServiceTimeout):
+            service.check("Some text.")
+        self.assertEqual(server.requests, 1)
+
+    def test_busy_is_mapped_without_retrying(self):
+        server, service = self.check_once(503, "busy")
+        with self.assertRaises(GrammarServiceBusy):
+            service.check("Some text.")
+        self.assertEqual(server.requests, 1)
+
+    def test_client_waits_longer_than_the_service(self):
+        _, service = self.check_once(504, "timed out")
+        self.assertGreater(service._http.timeout[1], service.timeout + service.queue_timeout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from benchmarks.fixture_server import FixtureServer, load_fixture, point_searcher_at
+from modules import resilience
+from modules.publication_search import (PARTIAL_RESULTS_TTL, PartialResults, PublicationSearcher,
+                                        SearchResultCache, get_publication_searcher, parse_pubmed_efetch)
+
+
+class StubSearcher(PublicationSearcher):
+    """Searcher whose sources are in-process stubs instead of web APIs"""
+
+    def __init__(self, sources, **kwargs):
+        kwargs.setdefault("use_cache", False)
+        super().__init__(local_index_path="", **kwargs)
+        self.stub_sources = sources
+
+    def _get_sources(self):
+        return dict(self.stub_sources)
+
+
+class SearchResultCacheTest(unittest.TestCase):
+    def test_entries_expire_after_their_source_ttl(self):
+        cache = SearchResultCache(path=None, ttls={"Fast": 10}, default_ttl=100)
+        with mock.patch("modules.publication_search.time.time", return_value=1000.0):
+            cache.put("Fast", "query", "", 10, [{"title": "fast"}])
+            cache.put("Other", "query", "", 10, [{"title": "other"}])
+        with mock.patch("modules.publication_search.time.time", return_value=1011.0):
+            self.assertIsNone(cache.get("Fast", "query", "", 10))
+            self.assertEqual(cache.get("Other", "query", "", 10), [{"title": "other"}])
+        with mock.patch("modules.publication_search.time.time", return_value=1101.0):
+            self.assertIsNone(cache.get("Other", "query", "", 10))
+
+    def test_memory_tier_evicts_the_least_recently_used(self):
+        cache = SearchResultCache(path=None, max_memory_entries=2)
+        cache.put("A", "query", "", 10, [])
+        cache.put("B", "query", "", 10, [])
+        self.assertEqual(cache.get("A", "query", "", 10), [])
+        cache.put("C", "query", "", 10, [])
+
+        self.assertIsNone(cache.get("B", "query", "", 10))
+        self.assertEqual(cache.get("A", "query", "", 10), [])
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+
+    def test_disk_tier_outlives_eviction_and_restarts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            cache = SearchResultCache(path=path, max_memory_entries=1)
+            cache.put("A", "query", "", 10, [{"title": "a"}])
+            cache.put("B", "query", "", 10, [{"title": "b"}])
+            self.assertEqual(cache.get("A", "query", "", 10), [{"title": "a"}])
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+            restarted = SearchResultCache(path=path)
+            self.assertEqual(restarted.get("B", "query", "", 10), [{"title": "b"}])
+            cache._db.close()
+            restarted._db.close()
+
+    def test_expired_disk_entries_are_dropped_on_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite3")
+            cache = SearchResultCache(path=path)
+            cache.put("A", "query", "", 10, [], ttl=-1)
+            cache._db.close()
+
+            restarted = SearchResultCache(path=path)
+            self.assertEqual(restarted._db.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0], 0)
+            restarted._db.close()
+
+
+class CancelledTrialTest(unittest.TestCase):
+    def setUp(self):
+        for name in ("Slow", "Flaky"):
+            resilience._circuit_breakers.pop(name, None)
+        self.release_slow = threading.Event()
+
+    def tearDown(self):
+        self.release_slow.set()
+
+    def slow(self, query, domain, limit):
+        self.release_slow.wait(5)
+        return []
+
+    def test_half_open_trial_is_released_when_queued_fetch_is_cancelled(self):
+        searcher = StubSearcher({"Slow": self.slow, "Flaky": lambda query, domain, limit: []},
+                                source_timeouts={"Slow": 5.0, "Flaky": 0.1}, max_workers=1,
+                                breaker_failure_threshold=1, breaker_cooldown=0.0)
+        breaker = searcher._circuit_breaker("Flaky")
+        breaker.record_failure("boom")
+
+        # The only worker is busy with Slow, so Flaky's trial is cancelled before it runs
+        statuses = {}
+        for name, status, _ in searcher._iter_source_results("query", "", 10):
+            statuses[name] = status
+            if name == "Flaky":
+                break
+        self.assertEqual(statuses["Flaky"], "timed_out")
+
+        self.assertEqual(breaker.snapshot()["state"], resilience.CircuitBreaker.HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+
+class BatchSearchTest(unittest.TestCase):
+    def setUp(self):
+        resilience._rate_limiters.pop("Metered", None)
+        resilience._circuit_breakers.pop("Metered", None)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def metered(self, query, domain, limit):
+        with self.lock:
+            self.calls.append(query)
+        return [stub_paper(f"{query} survey")]
+
+    def test_batch_waits_for_rate_tokens_and_shares_identical_fetches(self):
+        searcher = StubSearcher({"Metered": self.metered}, source_timeouts={"Metered": 0.1},
+                                rate_limits={"Metered": (4.0, 1)}, max_workers=4)
+        self.addCleanup(searcher.close)
+        queries = ["graph", "tree", "cycle", "graph"]
+
+        started = time.monotonic()
+        answers = {index: results for index, _, results in searcher.search_batch({"query": query} for query in queries)}
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(sorted(answers), [0, 1, 2, 3])
+        for results in answers.values():
+            self.assertEqual(results.completed_sources, ["Metered"])
+            self.assertEqual(len(results), 1)
+        self.assertEqual(len(self.calls), 3)
+        # One token up front, then a refill every 0.25 s, longer than the source's deadline
+        self.assertGreaterEqual(elapsed, 0.45)
+
+
+def stub_paper(title):
+    return {"title": title, "authors": [], "summary": title, "link": "", "published": "", "source": "Stub"}
+
+
+class ProgressiveSearchTest(unittest.TestCase):
+    def test_live_sources_start_before_cached_results_are_reported(self):
+        started = threading.Event()
+
+        def live(query, domain, limit):
+            started.set()
+            return [stub_paper("Live graph paper")]
+
+        cache = SearchResultCache(path=None)
+        cache.put("Cached", "graph", "", 10, [stub_paper("Cached graph paper")])
+        searcher = StubSearcher({"Cached": lambda query, domain, limit: [], "Live": live}, cache=cache,
+                                use_cache=True)
+
+        reports = searcher._iter_source_results("graph", "", 10)
+        self.assertEqual(next(reports)[:2], ("Cached", "completed"))
+        # The caller has not resumed the generator, yet the live fetch is already running
+        self.assertTrue(started.wait(2))
+        self.assertEqual([name for name, _, _ in reports], ["Live"])
+
+    def test_search_publications_ranks_once(self):
+        searcher = StubSearcher({name: (lambda title: lambda query, domain, limit: [stub_paper(title)])(name)
+                                 for name in ("First graph", "Second graph", "Third graph")})
+        calls = []
+        rank = searcher.ranker.rank
+        searcher.ranker.rank = lambda *args, **kwargs: calls.append(args) or rank(*args, **kwargs)
+
+        results = searcher.search_publications("graph", "", 10)
+        self.assertEqual(len(results), 3)
+        self.assertEqual(len(calls), 1)
+
+        calls.clear()
+        partials = list(searcher.iter_search_publications("graph", "", 10))
+        self.assertTrue(partials[-1].is_final)
+        self.assertEqual(len(calls), len(partials))
+
+
+class ArxivPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FixtureServer().start()
+        self.addCleanup(self.server.stop)
+        self.cache = SearchResultCache(path=None)
+        self.searcher = PublicationSearcher(cache=self.cache, local_index_path="", arxiv_page_size=2,
+                                            arxiv_page_delay=0.2, rate_limits={"arXiv": None})
+        point_searcher_at(self.searcher, self.server)
+
+    def test_complete_fetch_is_a_plain_list(self):
+        results = self.searcher._search_arxiv("graph", "", 4)
+        self.assertEqual(len(results), 4)
+        self.assertNotIsInstance(results, PartialResults)
+
+    def test_paging_stopped_by_the_deadline_is_partial(self):
+        results = self.searcher._search_arxiv("graph", "", 20, deadline=time.monotonic() + 0.5)
+        self.assertIsInstance(results, PartialResults)
+        self.assertTrue(0 < len(results) < 20)
+
+    def test_partial_results_are_cached_briefly(self):
+        self.searcher.source_timeouts["arXiv"] = 0.5
+        self.searcher._get_sources = lambda: {"arXiv": self.searcher._search_arxiv}
+        reports = list(self.searcher._iter_source_results("graph", "", 20))
+        self.assertEqual(reports[0][1], "completed")
+
+        key = self.cache.make_key("arXiv", "graph", "", 20)
+        expires_at, cached = self.cache._memory[key]
+        self.assertEqual(len(cached), len(reports[0][2]))
+        self.assertLessEqual(expires_at, time.time() + PARTIAL_RESULTS_TTL)
+
+
+PUBMED_ARTICLES = b"""<?xml version="1.0" ?>
+<PubmedArticleSet>
+<PubmedArticle><MedlineCitation><PMID Version="1">111</PMID><Article>
+<Journal><JournalIssue><PubDate><Year>2019</Year><Month>Mar</Month></PubDate></JournalIssue></Journal>
+<ArticleTitle>Effects of <i>E. coli</i> on   growth</ArticleTitle>
+<Abstract><AbstractText Label="BACKGROUND">Why.</AbstractText><AbstractText Label="RESULTS">What.</AbstractText></Abstract>
+<AuthorList><Author><LastName>Smith</LastName><ForeName>Alice</ForeName></Author>
+<Author><CollectiveName>Trial Group</CollectiveName></Author></AuthorList>
+<ArticleDate DateType="Electronic"><Year>2018</Year><Month>12</Month><Day>3</Day></ArticleDate>
+</Article></MedlineCitation></PubmedArticle>
+<PubmedArticle><MedlineCitation><PMID Version="1">222</PMID><Article>
+<Journal><JournalIssue><PubDate><MedlineDate>2017 Nov-Dec</MedlineDate></PubDate></JournalIssue></Journal>
+<ArticleTitle>Seasonal trends</ArticleTitle>
+</Article></MedlineCitation></PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class PubmedTest(unittest.TestCase):
+    def test_efetch_articles_are_parsed(self):
+        first, second = parse_pubmed_efetch(io.BytesIO(PUBMED_ARTICLES))
+        self.assertEqual(first["title"], "Effects of E. coli on growth")
+        self.assertEqual(first["authors"], ["Alice Smith", "Trial Group"])
+        self.assertEqual(first["summary"], "Background: Why. Results: What.")
+        self.assertEqual(first["link"], "https://pubmed.ncbi.nlm.nih.gov/111/")
+        # The electronic date wins over the journal issue date
+        self.assertEqual(first["published"], "2018-12-03")
+        self.assertEqual(second["published"], "2017")
+        self.assertEqual((second["authors"], second["summary"]), ([], ""))
+
+    def test_search_keeps_the_esearch_order_and_limit(self):
+        server = FixtureServer().start()
+        self.addCleanup(server.stop)
+        searcher = PublicationSearcher(use_cache=False, local_index_path="", pubmed_batch_size=20,
+                                       rate_limits={"PubMed": None})
+        self.addCleanup(searcher.close)
+        point_searcher_at(searcher, server)
+
+        results = searcher._search_pubmed("deep learning", 30)
+        ids = json.loads(load_fixture("pubmed_esearch.json"))["esearchresult"]["idlist"]
+        self.assertEqual(len(results), 30)
+        self.assertEqual(results[0]["link"], f"https://pubmed.ncbi.nlm.nih.gov/{ids[0]}/")
+        self.assertTrue(all(result["source"] == "PubMed" for result in results))
+        # The fixture answers every efetch with all its articles, so the first batch fills the limit
+        self.assertEqual(server.request_count, 2)
+
+
+class SharedSearcherTest(unittest.TestCase):
+    def test_sessions_share_one_searcher(self):
+        self.assertIs(get_publication_searcher(), get_publication_searcher())
+
+    def test_close_stops_the_worker_pool(self):
+        searcher = StubSearcher({})
+        searcher.close()
+        with self.assertRaises(RuntimeError):
+            searcher._executor.submit(time.sleep, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from datetime import date
+
+from modules.ranking import BM25FRanker, get_token_cache, relevance_label
+
+
+def paper(title, summary="", published="", source="arXiv"):
+    return {"title": title, "summary": summary, "published": published, "source": source}
+
+
+class RelevanceLabelTest(unittest.TestCase):
+    def test_labels_are_relative_to_the_best_result(self):
+        self.assertEqual(relevance_label(1.7, 1.75), "High")
+        self.assertEqual(relevance_label(0.9, 1.75), "Medium")
+        self.assertEqual(relevance_label(0.5, 1.75), "Low")
+
+    def test_small_scores_can_still_be_high(self):
+        self.assertEqual(relevance_label(0.4, 0.45), "High")
+
+    def test_results_without_a_query_match_are_low(self):
+        self.assertEqual(relevance_label(0.0, 2.0), "Low")
+        self.assertEqual(relevance_label(0.0, 0.0), "Low")
+
+
+class BM25FRankerTest(unittest.TestCase):
+    def test_title_matches_rank_above_unrelated_results(self):
+        documents = [paper("Soil erosion in river basins"),
+                     paper("Graph neural networks", "We study graph neural networks."),
+                     paper("Neural networks for images")]
+        ranked = BM25FRanker(recency_weight=0.0).rank(documents, "graph neural networks")
+        self.assertEqual([doc_id for doc_id, _ in ranked], [1, 2, 0])
+
+    def test_ties_keep_document_order(self):
+        documents = [paper("Protein folding"), paper("Other topic"), paper("Protein folding"),
+                     paper("Protein folding")]
+        ranker = BM25FRanker(recency_weight=0.0)
+        self.assertEqual([doc_id for doc_id, _ in ranker.rank(documents, "protein folding")], [0, 2, 3, 1])
+        self.assertEqual([doc_id for doc_id, _ in ranker.rank(documents, "protein folding", top_k=2)], [0, 2])
+
+    def test_recency_breaks_relevance_ties(self):
+        documents = [paper("Protein folding", published="2020-01-01"),
+                     paper("Protein folding", published="2024-05-01")]
+        ranked = BM25FRanker().rank(documents, "protein folding", today=date(2024, 6, 1))
+        self.assertEqual(ranked[0][0], 1)
+
+    def test_cached_token_counts_give_the_same_ranking(self):
+        documents = [paper("Graph neural networks", "graph methods for molecules"),
+                     paper("Molecule property prediction", "neural networks on graphs")]
+        cached = BM25FRanker().rank(documents, "graph neural networks", today=date(2024, 1, 1))
+        fresh = BM25FRanker(use_token_cache=False).rank(documents, "graph neural networks",
+                                                         today=date(2024, 1, 1))
+        self.assertEqual(cached, fresh)
+
+    def test_rankers_share_one_token_cache(self):
+        self.assertIs(BM25FRanker().token_cache, BM25FRanker().token_cache)
+        self.assertIs(BM25FRanker().token_cache, get_token_cache())
+
+
+if __name__ == "__main__":
+    unittest.main()
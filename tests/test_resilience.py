@@ -0,0 +1,75 @@
+import time
+import unittest
+
+from modules import resilience
+from modules.resilience import CircuitBreaker, TokenBucket, get_circuit_breaker, get_rate_limiter
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_refill(self):
+        bucket = TokenBucket(rate=20.0, capacity=2)
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertTrue(bucket.acquire(timeout=0))
+        self.assertFalse(bucket.acquire(timeout=0))
+
+        started = time.monotonic()
+        self.assertTrue(bucket.acquire(timeout=1.0))
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_gives_up_when_no_token_arrives_in_time(self):
+        bucket = TokenBucket(rate=1.0, capacity=1)
+        bucket.acquire()
+        started = time.monotonic()
+        self.assertFalse(bucket.acquire(timeout=0.2))
+        # A refill a second away is known to miss the timeout, so there is no point sleeping
+        self.assertLess(time.monotonic() - started, 0.1)
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60.0)
+        breaker.record_failure("boom")
+        breaker.record_success()
+        breaker.record_failure("boom")
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure("boom again")
+        self.assertFalse(breaker.allow())
+        snapshot = breaker.snapshot()
+        self.assertEqual(snapshot["state"], CircuitBreaker.OPEN)
+        self.assertEqual(snapshot["last_error"], "boom again")
+        self.assertGreater(snapshot["retry_in"], 0)
+
+    def test_half_open_allows_one_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=0.0)
+        breaker.record_failure("boom")
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.release()
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.snapshot()["state"], CircuitBreaker.CLOSED)
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=3, cooldown=0.05)
+        for _ in range(3):
+            breaker.record_failure("boom")
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure("still down")
+        self.assertFalse(breaker.allow())
+
+
+class RegistryTest(unittest.TestCase):
+    def tearDown(self):
+        resilience._rate_limiters.pop("Registry", None)
+        resilience._circuit_breakers.pop("Registry", None)
+
+    def test_backends_share_one_limiter_and_breaker(self):
+        self.assertIs(get_rate_limiter("Registry", 1.0, 1), get_rate_limiter("Registry", 5.0, 5))
+        self.assertIs(get_circuit_breaker("Registry"), get_circuit_breaker("Registry", failure_threshold=9))
+
+
+if __name__ == "__main__":
+    unittest.main()